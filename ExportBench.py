@@ -0,0 +1,605 @@
+"""
+Benchmark of the export orchestration against a simulated Maya.
+
+The export core only talks to Maya through ``maya.cmds``, ``maya.mel.eval`` and
+``maya.OpenMaya.MGlobal``. This script installs a small in-memory stand-in for those modules,
+generates a synthetic scene (characters with export groups, joints, meshes, blend shapes,
+animated controls, cameras) and runs the real ``ExportCore`` against it, counting every command
+round-trip and timing each stage. Every simulated command costs a fixed latency so round-trip
+regressions show up in the timings too.
+
+Run it with plain Python, not mayapy:
+
+    python ExportBench.py --characters 20 --joints 150 --cameras 2
+    python ExportBench.py --write-baseline ExportBench_baseline.json
+    python ExportBench.py --baseline ExportBench_baseline.json
+
+With ``--baseline`` the run fails (exit code 1) when a scenario makes more Maya calls than the
+baseline allows or gets slower than ``--time-factor`` times the baseline.
+"""
+import os
+import sys
+import json
+import time
+import types
+import shutil
+import string
+import fnmatch
+import logging
+import argparse
+import tempfile
+import itertools
+from collections import Counter
+from dataclasses import dataclass, asdict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_US = 20
+DEFAULT_CALL_TOLERANCE = 0.0
+DEFAULT_TIME_FACTOR = 2.0
+# Timing differences below this are noise, whatever the factor says
+MIN_TIME_REGRESSION = 0.05
+# Importing the tool must stay below this, whatever the baseline says
+IMPORT_BUDGET_SECONDS = 0.25
+# Modules only the tool's window may load
+UI_MODULES = ("PySide2", "shiboken2", "maya.OpenMayaUI", "ExportToolUI")
+
+
+@dataclass
+class SceneSpec:
+    """
+    Size of a synthetic scene.
+
+    Attributes:
+        characters (int): Distinct characters.
+        copies (int): Referenced copies (namespaces) per character.
+        joints (int): Joints per rig.
+        meshes (int): Meshes per rig, all driven by one blend shape.
+        controls (int): Animated controls per rig that aren't exported.
+        cameras (int): Shot cameras.
+        frames (int): Length of the shot.
+    """
+    characters: int = 10
+    copies: int = 2
+    joints: int = 100
+    meshes: int = 4
+    controls: int = 150
+    cameras: int = 2
+    frames: int = 100
+
+    def character_names(self):
+        # Letters only: a trailing number would be read as a copy number by namespace_matches
+        names = []
+        for length in itertools.count(1):
+            for letters in itertools.product(string.ascii_uppercase, repeat=length):
+                names.append("char" + "".join(letters))
+                if len(names) == self.characters:
+                    return names
+
+    def namespaces(self, character):
+        return [character] + [f"{character}{copy}" for copy in range(1, self.copies)]
+
+    def camera_names(self):
+        return [f"shotCam{chr(ord('A') + idx)}" for idx in range(self.cameras)]
+
+
+class FakeScene(object):
+    """
+    In-memory DAG with just enough structure for the export core's queries.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.nodes = {}      # long name -> node type
+        self.parents = {}    # long name -> parent long name
+        self.curves = {}     # long name -> [animCurve names]
+        self.short_names = {}
+        self.counter = itertools.count(1)
+        self.build()
+
+    def add(self, long_name, node_type, curves=0):
+        self.nodes[long_name] = node_type
+        parent = long_name.rpartition("|")[0]
+        if parent:
+            self.parents[long_name] = parent
+        short_name = long_name.rpartition("|")[2]
+        self.short_names[short_name] = long_name
+        if curves:
+            self.curves[long_name] = [f"{short_name}_anim{idx}" for idx in range(curves)]
+            for idx, curve in enumerate(self.curves[long_name]):
+                self.nodes[curve] = "animCurveTA" if idx % 2 else "animCurveTL"
+                self.short_names[curve] = curve
+        return long_name
+
+    def build(self):
+        spec = self.spec
+        for character in spec.character_names():
+            for ns in spec.namespaces(character):
+                rig = self.add(f"|{ns}:Rig", "transform")
+                export_grp = self.add(f"{rig}|{ns}:ExportGrp", "transform")
+                deformation = self.add(f"{export_grp}|{ns}:DeformationSystem", "transform")
+                for joint in range(spec.joints):
+                    self.add(f"{deformation}|{ns}:joint{joint}", "joint", curves=3)
+                geometry = self.add(f"{export_grp}|{ns}:Geometry", "transform")
+                for mesh in range(spec.meshes):
+                    transform = self.add(f"{geometry}|{ns}:geo{mesh}", "transform")
+                    self.add(f"{transform}|{ns}:geo{mesh}Shape", "mesh")
+                self.add(f"{ns}:blendShape1", "blendShape")
+                abc_grp = self.add(f"{rig}|{ns}:ABCExport", "transform")
+                self.add(f"{abc_grp}|{ns}:abcGeo", "transform")
+                controls = self.add(f"{rig}|{ns}:Controls", "transform")
+                for control in range(spec.controls):
+                    self.add(f"{controls}|{ns}:ctrl{control}", "transform", curves=6)
+        for camera in spec.camera_names():
+            self.add(f"|{camera}", "transform", curves=6)
+            self.add(f"|{camera}|{camera}Shape", "camera", curves=1)
+
+    def resolve(self, name):
+        """
+        Returns:
+            str: Long name of a node given by short or long name, or None.
+        """
+        name = name.split(".")[0]
+        if name in self.nodes:
+            return name
+        return self.short_names.get(name)
+
+    def create(self, node_type, name=None, parent=None):
+        name = name or node_type
+        if name in self.short_names:
+            name = f"{name}{next(self.counter)}"
+        return self.add(f"{parent or ''}|{name}", node_type).rpartition("|")[2]
+
+    def delete(self, name):
+        long_name = self.resolve(name)
+        if long_name is None:
+            return
+        for node in [node for node in self.nodes if node == long_name or node.startswith(long_name + "|")]:
+            del self.nodes[node]
+            self.parents.pop(node, None)
+            self.curves.pop(node, None)
+            self.short_names.pop(node.rpartition("|")[2], None)
+
+    def children(self, long_name, recursive=False):
+        prefix = long_name + "|"
+        return [
+            node for node in self.nodes
+            if node.startswith(prefix) and (recursive or "|" not in node[len(prefix):])
+        ]
+
+
+def as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def counted(command):
+    """
+    Decorator for simulated commands: counts the call and charges the latency.
+    """
+
+    def decorator(func):
+        def wrapper(self, *args, **kwargs):
+            self.record(command)
+            return func(self, *args, **kwargs)
+        wrapper.__name__ = command
+        return wrapper
+
+    return decorator
+
+
+class FakeCmds(types.ModuleType):
+    """
+    Stand-in for ``maya.cmds``. Every command call is counted and costs ``latency`` seconds.
+    Commands the export core uses but whose result doesn't matter here return None.
+    """
+
+    def __init__(self, scene, latency):
+        super(FakeCmds, self).__init__("maya.cmds")
+        self.scene = scene
+        self.latency = latency
+        self.calls = Counter()
+        self.undo_enabled = True
+
+    def record(self, command):
+        self.calls[command] += 1
+        if self.latency:
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+
+    def __getattr__(self, command):
+        if command.startswith("__"):
+            raise AttributeError(command)
+
+        def generic_command(*args, **kwargs):
+            self.record(command)
+        return generic_command
+
+    @counted("ls")
+    def ls(self, *patterns, **kwargs):
+        long_names = kwargs.get("long") or kwargs.get("l")
+        node_type = kwargs.get("type")
+        recursive = kwargs.get("recursive")
+        names = [name for pattern in patterns for name in as_list(pattern)]
+        result = []
+        if names:
+            for name in names:
+                if any(char in name for char in "*?"):
+                    for long_name in self.scene.nodes:
+                        short_name = long_name.rpartition("|")[2]
+                        if fnmatch.fnmatchcase(short_name, name):
+                            result.append(long_name)
+                    continue
+                for long_name in self.scene.nodes:
+                    short_name = long_name.rpartition("|")[2]
+                    if long_name == name or short_name == name or (
+                            recursive and short_name.rpartition(":")[2] == name):
+                        result.append(long_name)
+        else:
+            result = list(self.scene.nodes)
+        if node_type:
+            result = [node for node in result if self.scene.nodes.get(node) in as_list(node_type)]
+        if not long_names:
+            result = [node.rpartition("|")[2] for node in result]
+        return result
+
+    @counted("objExists")
+    def objExists(self, name):
+        return self.scene.resolve(name) is not None
+
+    @counted("listRelatives")
+    def listRelatives(self, nodes=None, **kwargs):
+        result = []
+        node_type = kwargs.get("type")
+        for node in as_list(nodes):
+            long_name = self.scene.resolve(node)
+            if long_name is None:
+                continue
+            children = self.scene.children(long_name, recursive=kwargs.get("allDescendents"))
+            if kwargs.get("shapes"):
+                children = [child for child in children if self.scene.nodes[child] in ("mesh", "camera")]
+            if node_type:
+                children = [child for child in children if self.scene.nodes[child] == node_type]
+            result += children
+        if not kwargs.get("fullPath"):
+            result = [node.rpartition("|")[2] for node in result]
+        return result or None
+
+    @counted("listConnections")
+    def listConnections(self, nodes=None, **kwargs):
+        if kwargs.get("type") != "animCurve":
+            return []
+        curves = []
+        for node in as_list(nodes):
+            long_name = self.scene.resolve(node)
+            curves += self.scene.curves.get(long_name, [])
+        return curves
+
+    @counted("listHistory")
+    def listHistory(self, nodes=None, **kwargs):
+        namespaces = {node.rpartition("|")[2].rpartition(":")[0] for node in as_list(nodes)}
+        return [f"{ns}:blendShape1" for ns in sorted(namespaces) if ns]
+
+    @counted("listAttr")
+    def listAttr(self, plug, **kwargs):
+        return [f"weight[{idx}]" for idx in range(self.scene.spec.meshes)]
+
+    @counted("keyframe")
+    def keyframe(self, curves=None, **kwargs):
+        if not kwargs.get("query"):
+            return None
+        count = len(as_list(curves)) * self.scene.spec.frames
+        if kwargs.get("keyframeCount"):
+            return count
+        return [1.0, 0.5] * count
+
+    @counted("keyTangent")
+    def keyTangent(self, curves=None, **kwargs):
+        count = len(as_list(curves)) * self.scene.spec.frames
+        return [0.0] * (count * 2)
+
+    @counted("xform")
+    def xform(self, node=None, **kwargs):
+        return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+    @counted("referenceQuery")
+    def referenceQuery(self, node, **kwargs):
+        if kwargs.get("isNodeReferenced"):
+            return ":" in node
+        if kwargs.get("filename"):
+            return "/bench/rigs/rig.ma"
+        if kwargs.get("namespace"):
+            return ":" + node.rpartition("|")[2].rpartition(":")[0]
+        return None
+
+    @counted("playbackOptions")
+    def playbackOptions(self, **kwargs):
+        if kwargs.get("min"):
+            return 1.0
+        return float(self.scene.spec.frames)
+
+    @counted("currentUnit")
+    def currentUnit(self, **kwargs):
+        return "film"
+
+    @counted("undoInfo")
+    def undoInfo(self, **kwargs):
+        if kwargs.get("query"):
+            return self.undo_enabled
+        if "state" in kwargs:
+            self.undo_enabled = kwargs["state"]
+        return None
+
+    @counted("file")
+    def file(self, *args, **kwargs):
+        if kwargs.get("query") and kwargs.get("sceneName"):
+            return "/bench/scenes/bench_shot.ma"
+        return None
+
+    @counted("about")
+    def about(self, **kwargs):
+        return "bench"
+
+    @counted("camera")
+    def camera(self, **kwargs):
+        transform = self.scene.create("transform", "camera")
+        shape = self.scene.create("camera", f"{transform}Shape", parent=f"|{transform}")
+        return [transform, shape]
+
+    @counted("createNode")
+    def createNode(self, node_type, name=None, **kwargs):
+        return self.scene.create(node_type, name)
+
+    @counted("delete")
+    def delete(self, nodes=None, **kwargs):
+        if kwargs.get("staticChannels"):
+            return
+        for node in as_list(nodes):
+            self.scene.delete(node)
+
+    @counted("AbcExport")
+    def AbcExport(self, j=None, **kwargs):
+        for job in as_list(j):
+            write_dummy_file(job.rpartition("-file ")[2].strip())
+
+
+class FakeMel(types.ModuleType):
+    """
+    Stand-in for ``maya.mel``; ``FBXExport -f`` writes a small file so sizes and caching work.
+    """
+
+    def __init__(self, cmds):
+        super(FakeMel, self).__init__("maya.mel")
+        self.cmds = cmds
+
+    def eval(self, command):
+        self.cmds.record("mel.eval")
+        if command.startswith("FBXExport -f"):
+            write_dummy_file(command.split('"')[1])
+        return None
+
+
+class FakeGlobal(object):
+    @staticmethod
+    def displayError(message):
+        pass
+
+    displayWarning = displayInfo = displayError
+
+
+def write_dummy_file(path):
+    with open(path, "wb") as dummy_file:
+        dummy_file.write(b"\0" * 1024)
+
+
+def install_fake_maya(scene, latency):
+    """
+    Puts the simulated ``maya`` package into ``sys.modules`` and (re)imports the export core on
+    top of it.
+
+    Returns:
+        FakeCmds: The simulated ``maya.cmds``.
+    """
+    if "maya" in sys.modules and not getattr(sys.modules["maya"], "is_bench_fake", False):
+        raise RuntimeError("A real Maya is loaded; run the benchmark with plain Python.")
+
+    cmds = FakeCmds(scene, latency)
+    mel = FakeMel(cmds)
+    open_maya = types.ModuleType("maya.OpenMaya")
+    open_maya.MGlobal = FakeGlobal
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+    maya.is_bench_fake = True
+    maya.cmds, maya.mel, maya.OpenMaya = cmds, mel, open_maya
+    # The API camera sampling isn't simulated; the benchmark exports cameras through the bake path
+    api = types.ModuleType("maya.api")
+    api.OpenMaya = types.ModuleType("maya.api.OpenMaya")
+    api.OpenMayaAnim = types.ModuleType("maya.api.OpenMayaAnim")
+    maya.api = api
+    sys.modules.update({"maya": maya, "maya.cmds": cmds, "maya.mel": mel, "maya.OpenMaya": open_maya,
+                        "maya.api": api, "maya.api.OpenMaya": api.OpenMaya,
+                        "maya.api.OpenMayaAnim": api.OpenMayaAnim})
+    sys.modules.pop("ExportCore", None)
+    sys.modules.pop("ExportCamera", None)
+    return cmds
+
+
+def measure(cmds, func):
+    """
+    Runs a scenario and records its Maya round-trips and wall-clock time.
+
+    Returns:
+        dict: {"calls": total calls, "seconds": duration, "commands": {command: calls}}.
+    """
+    cmds.calls.clear()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    return {"calls": sum(cmds.calls.values()), "seconds": round(seconds, 4), "commands": dict(cmds.calls)}
+
+
+def measure_import(cmds, module_names=("ExportTool", "ExportCore")):
+    """
+    Imports the tool and the export core from scratch, as headless tooling would, and checks that this has no side
+    effects: no Maya commands, no UI modules and no change to the logging configuration.
+
+    Returns:
+        dict: ``measure`` results plus "problems", a list of the side effects found.
+    """
+    for name in [name for name in sys.modules if name.startswith("Export") and name != "ExportBench"]:
+        sys.modules.pop(name)
+
+    problems = []
+    basic_config = logging.basicConfig
+
+    def record_basic_config(**kwargs):
+        problems.append("logging.basicConfig called at import")
+
+    def import_tool():
+        for module_name in module_names:
+            try:
+                __import__(module_name)
+            except ImportError as e:
+                problems.append(f"import of {module_name} failed: {e}")
+
+    logging.basicConfig = record_basic_config
+    try:
+        result = measure(cmds, import_tool)
+    finally:
+        logging.basicConfig = basic_config
+
+    problems += [f"{name} imported" for name in UI_MODULES if name in sys.modules]
+    if result["calls"]:
+        problems.append(f"{result['calls']} Maya commands run at import")
+    if result["seconds"] > IMPORT_BUDGET_SECONDS:
+        problems.append(f"import took {result['seconds']:.3f}s, budget {IMPORT_BUDGET_SECONDS}s")
+    result["problems"] = problems
+    return result
+
+
+def run_benchmark(spec, latency_us=DEFAULT_LATENCY_US):
+    """
+    Runs every scenario on a fresh synthetic scene.
+
+    Args:
+        spec (SceneSpec): Scene size.
+        latency_us (float): Simulated cost of one Maya command in microseconds.
+
+    Returns:
+        dict: Results per scenario, plus the scene spec.
+    """
+    scene = FakeScene(spec)
+    cmds = install_fake_maya(scene, latency_us / 1e6)
+    import_result = measure_import(cmds)
+    import ExportCore
+
+    characters = spec.character_names()
+    export_root = tempfile.mkdtemp(prefix="export_bench_")
+    try:
+        settings = ExportCore.ExportSettings(
+            file_path=export_root, shot_name="bench", character_names=characters,
+            camera_names=spec.camera_names(), abc_names=characters, write_manifest=False, sample_cameras=False,
+            # The simulated exporters write placeholder bytes, not FBX or Alembic files
+            verify_outputs=False,
+        )
+        job = ExportCore.ExportJob(settings)
+        results = {"import": import_result}
+
+        def discovery():
+            job.asset_index = None
+            export_dir = settings.export_dir
+            job.plan_fbx_assets(export_dir, settings.shot_name)
+            job.plan_abc_assets(export_dir, settings.shot_name)
+        os.makedirs(settings.export_dir)
+        results["discovery"] = measure(cmds, discovery)
+
+        def option_setup():
+            ExportCore.FbxOptionProfile.reset_session()
+            for idx in range(len(characters) * spec.copies):
+                preset = settings.fbx_camera_preset if idx < spec.cameras else settings.fbx_preset
+                ExportCore.FbxOptionProfile.from_preset(preset, settings.fbx_version, True, 1, spec.frames).apply()
+        results["option_setup"] = measure(cmds, option_setup)
+
+        ExportCore.FbxOptionProfile.reset_session()
+        results["export_all"] = measure(cmds, lambda: ExportCore.ExportJob(settings).run("all"))
+        results["export_all_cached"] = measure(cmds, lambda: ExportCore.ExportJob(settings).run("all"))
+
+        assets = len(characters) * spec.copies * 2 + spec.cameras
+        results["export_all"]["calls_per_asset"] = round(results["export_all"]["calls"] / assets, 2)
+        return {"scene": asdict(spec), "latency_us": latency_us, "scenarios": results}
+    finally:
+        shutil.rmtree(export_root, ignore_errors=True)
+
+
+def compare(results, baseline, call_tolerance=DEFAULT_CALL_TOLERANCE, time_factor=DEFAULT_TIME_FACTOR):
+    """
+    Checks results against a baseline run of the same scene.
+
+    Returns:
+        list: Human readable regressions, empty if there are none.
+    """
+    if baseline.get("scene") != results["scene"] or baseline.get("latency_us") != results["latency_us"]:
+        return ["Baseline was recorded for a different scene size or latency; re-record it."]
+
+    regressions = []
+    for name, result in results["scenarios"].items():
+        regressions += [f"{name}: {problem}" for problem in result.get("problems", [])]
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        allowed_calls = reference["calls"] * (1 + call_tolerance)
+        if result["calls"] > allowed_calls:
+            added = Counter(result["commands"])
+            added.subtract(reference["commands"])
+            worst = ", ".join(f"{command} +{count}" for command, count in added.most_common(5) if count > 0)
+            regressions.append(f"{name}: {result['calls']} Maya calls, baseline {reference['calls']} ({worst})")
+        allowed_seconds = max(reference["seconds"] * time_factor, reference["seconds"] + MIN_TIME_REGRESSION)
+        if result["seconds"] > allowed_seconds:
+            regressions.append(f"{name}: {result['seconds']:.3f}s, baseline {reference['seconds']:.3f}s")
+    return regressions
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    defaults = SceneSpec()
+    parser = argparse.ArgumentParser(description="Benchmark the export core against a simulated Maya.")
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name}", type=int, default=value, help=f"Scene size (default: {value}).")
+    parser.add_argument("--latency-us", type=float, default=DEFAULT_LATENCY_US,
+                        help=f"Simulated cost of one Maya command (default: {DEFAULT_LATENCY_US}).")
+    parser.add_argument("--baseline", help="Fail if the results regress against this baseline JSON.")
+    parser.add_argument("--write-baseline", help="Write the results as a new baseline JSON.")
+    parser.add_argument("--call-tolerance", type=float, default=DEFAULT_CALL_TOLERANCE,
+                        help="Allowed relative increase of Maya calls (default: 0).")
+    parser.add_argument("--time-factor", type=float, default=DEFAULT_TIME_FACTOR,
+                        help=f"Allowed slowdown factor (default: {DEFAULT_TIME_FACTOR}).")
+    args = parser.parse_args(argv)
+
+    spec = SceneSpec(**{name: getattr(args, name) for name in asdict(defaults)})
+    results = run_benchmark(spec, args.latency_us)
+
+    for name, result in results["scenarios"].items():
+        print(f"{name:<20} {result['calls']:>8} calls {result['seconds']:>9.3f}s")
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.write_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.call_tolerance, args.time_factor)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
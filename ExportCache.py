@@ -0,0 +1,156 @@
+"""
+On-disk cache of export inputs, so re-publishing a shot only rewrites the assets that changed.
+
+Each output file is recorded with a hash of everything that went into it (animation curves, rig
+file, frame range, export options). The cache lives next to the files in the shot's export
+directory; Maya-side gathering of the inputs is done by ``ExportCore.ExportJob``.
+"""
+import os
+import json
+import time
+import array
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_NAME = ".export_cache.json"
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def hash_floats(values):
+    """
+    Hashes a long list of numbers (key times, values, tangents) without formatting them.
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha256(array.array("d", values or []).tobytes()).hexdigest()
+
+
+def compute_key(inputs):
+    """
+    Hashes an asset's export inputs.
+
+    Args:
+        inputs (dict): JSON-serialisable description of everything the output depends on.
+
+    Returns:
+        str: Hex digest.
+    """
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExportCache(object):
+    """
+    Cache metadata for one shot export directory.
+
+    Entries are keyed by output file name and evicted when unused for ``max_age_days``, when their
+    file has disappeared, or (least recently used first) beyond ``max_entries``. Several exports
+    may share a directory at once (the FBX and Alembic halves of a shot on different workers), so
+    saving merges this process' changes into what is on disk.
+    """
+
+    def __init__(self, export_dir, max_entries=DEFAULT_MAX_ENTRIES, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.export_dir = export_dir
+        self.path = os.path.join(export_dir, CACHE_FILE_NAME).replace(os.sep, '/')
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.entries = self.load()
+        # Names this process stored, used or invalidated, written over the on-disk entries on save
+        self.changed = set()
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path) as cache_file:
+                data = json.load(cache_file)
+        except (IOError, OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export cache {self.path}: {e}")
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def is_fresh(self, output_path, key):
+        """
+        Checks whether an output file was written from the same inputs and is still on disk.
+
+        Args:
+            output_path (str): The asset's output file.
+            key (str): Hash of the asset's current inputs.
+
+        Returns:
+            bool: True if the file can be kept as it is.
+        """
+        entry = self.entries.get(os.path.basename(output_path))
+        if not entry or entry.get("key") != key:
+            return False
+        try:
+            if os.path.getsize(output_path) != entry.get("size"):
+                return False
+        except OSError:
+            return False
+        entry["used"] = time.time()
+        self.changed.add(os.path.basename(output_path))
+        return True
+
+    def store(self, output_path, key):
+        """
+        Records a freshly written output file.
+        """
+        try:
+            size = os.path.getsize(output_path)
+        except OSError:
+            logger.warning(f"Not caching {output_path}: file wasn't written")
+            return
+        now = time.time()
+        self.entries[os.path.basename(output_path)] = {"key": key, "size": size, "written": now, "used": now}
+        self.changed.add(os.path.basename(output_path))
+
+    def invalidate(self, output_path):
+        self.entries.pop(os.path.basename(output_path), None)
+        self.changed.add(os.path.basename(output_path))
+
+    def evict(self):
+        """
+        Applies the age and size limits.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        before = len(self.entries)
+        oldest_allowed = time.time() - self.max_age_days * 24 * 3600
+        self.entries = {
+            name: entry for name, entry in self.entries.items()
+            if entry.get("used", 0) >= oldest_allowed and os.path.isfile(os.path.join(self.export_dir, name))
+        }
+        if len(self.entries) > self.max_entries:
+            newest = sorted(self.entries.items(), key=lambda item: item[1].get("used", 0), reverse=True)
+            self.entries = dict(newest[:self.max_entries])
+        return before - len(self.entries)
+
+    def save(self):
+        """
+        Merges this process' changes into the entries on disk, evicts stale entries and writes the
+        metadata atomically.
+        """
+        entries = self.load()
+        for name in self.changed:
+            if name in self.entries:
+                entries[name] = self.entries[name]
+            else:
+                entries.pop(name, None)
+        self.entries = entries
+        self.evict()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as cache_file:
+                json.dump({"version": CACHE_VERSION, "entries": self.entries}, cache_file, indent=1)
+            os.replace(temp_path, self.path)
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to save export cache {self.path}: {e}")
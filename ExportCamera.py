@@ -0,0 +1,347 @@
+"""
+Camera export through the OpenMaya 2.0 API.
+
+Instead of driving an export camera with a multMatrix/decomposeMatrix network and baking it with
+two DG simulation passes, the source camera's world matrix and lens attributes are read for every
+frame with a time context, the matrices are decomposed in one go (vectorised with NumPy when it
+is available) and the results are written onto the export camera with one ``addKeys`` call per
+channel.
+
+The same samples can also be written as a compact per-frame table in Unreal's axis convention,
+which ``UnrealCameraImport.py`` keys onto a CineCameraActor in a Level Sequence.
+"""
+import math
+import logging
+from dataclasses import dataclass, field
+
+import maya.cmds as cm
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+
+logger = logging.getLogger(__name__)
+
+# Camera shape attributes copied to the export camera, keyed when they change over the shot
+CAMERA_LENS_ATTRIBUTES = (
+    "focalLength",
+    "horizontalFilmAperture",
+    "verticalFilmAperture",
+    "nearClipPlane",
+    "farClipPlane",
+    "focusDistance",
+    "fStop",
+)
+
+TRANSFORM_CHANNELS = ("translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ")
+
+# NumPy is slow to import, so it is only loaded the first time matrices are decomposed
+_numpy = None
+
+
+def _load_numpy():
+    """
+    Returns:
+        module: numpy, or None when it isn't installed.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+@dataclass
+class CameraSamples:
+    """
+    Per-frame data of one camera.
+
+    Attributes:
+        frames (list): Sampled frames.
+        matrices (list): World matrix per frame, 16 floats row by row (Maya's row-vector layout).
+        lens (dict): {lens attribute: [value per frame]}, in internal units.
+    """
+    frames: list = field(default_factory=list)
+    matrices: list = field(default_factory=list)
+    lens: dict = field(default_factory=dict)
+
+
+def _dependency_node(name):
+    selection = om2.MSelectionList()
+    selection.add(name)
+    return selection.getDependNode(0)
+
+
+def sample_camera(camera, min_time, max_time):
+    """
+    Reads a camera's world matrix and lens attributes on every frame of a range.
+
+    Args:
+        camera (str): Camera transform.
+        min_time (int): First frame.
+        max_time (int): Last frame.
+
+    Returns:
+        CameraSamples: The samples.
+    """
+    shapes = cm.listRelatives(camera, shapes=True, type="camera", fullPath=True) or []
+    if not shapes:
+        raise RuntimeError(f"{camera} has no camera shape")
+
+    transform_fn = om2.MFnDependencyNode(_dependency_node(camera))
+    shape_fn = om2.MFnDependencyNode(_dependency_node(shapes[0]))
+    matrix_plug = transform_fn.findPlug("worldMatrix", False).elementByLogicalIndex(0)
+    lens_plugs = {attribute: shape_fn.findPlug(attribute, False) for attribute in CAMERA_LENS_ATTRIBUTES}
+
+    samples = CameraSamples(lens={attribute: [] for attribute in CAMERA_LENS_ATTRIBUTES})
+    unit = om2.MTime.uiUnit()
+    for frame in range(min_time, max_time + 1):
+        context = om2.MDGContext(om2.MTime(frame, unit))
+        previous = context.makeCurrent()
+        try:
+            matrix = om2.MFnMatrixData(matrix_plug.asMObject()).matrix()
+            samples.matrices.append([matrix.getElement(row, column) for row in range(4) for column in range(4)])
+            for attribute, plug in lens_plugs.items():
+                samples.lens[attribute].append(plug.asDouble())
+        finally:
+            previous.makeCurrent()
+        samples.frames.append(frame)
+    return samples
+
+
+def _unwrap(angles):
+    """
+    Removes 360 degree jumps between consecutive angles (radians), like ``numpy.unwrap``.
+    """
+    result = []
+    offset = 0.0
+    previous = None
+    for angle in angles:
+        if previous is not None:
+            delta = angle - previous
+            if delta > math.pi:
+                offset -= 2 * math.pi
+            elif delta < -math.pi:
+                offset += 2 * math.pi
+        previous = angle
+        result.append(angle + offset)
+    return result
+
+
+def decompose_matrices(matrices):
+    """
+    Splits world matrices into translation and XYZ euler rotation, ignoring scale and shear.
+    Rotations are unwrapped so the curves stay continuous.
+
+    Args:
+        matrices (list): 16 floats per matrix, see ``CameraSamples.matrices``.
+
+    Returns:
+        tuple: ([tx], [ty], [tz]), ([rx], [ry], [rz]) lists; translation in centimetres,
+            rotation in radians.
+    """
+    if not matrices:
+        return ([], [], []), ([], [], [])
+
+    numpy = _load_numpy()
+    if numpy is not None:
+        stack = numpy.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+        axes = stack[:, :3, :3]
+        axes = axes / numpy.linalg.norm(axes, axis=2, keepdims=True)
+        cos_y = numpy.hypot(axes[:, 0, 0], axes[:, 0, 1])
+        gimbal = cos_y < 1e-6
+        rotate_x = numpy.where(gimbal, numpy.arctan2(-axes[:, 2, 1], axes[:, 1, 1]),
+                               numpy.arctan2(axes[:, 1, 2], axes[:, 2, 2]))
+        rotate_y = numpy.arctan2(-axes[:, 0, 2], cos_y)
+        rotate_z = numpy.where(gimbal, 0.0, numpy.arctan2(axes[:, 0, 1], axes[:, 0, 0]))
+        translation = tuple(stack[:, 3, index].tolist() for index in range(3))
+        rotation = tuple(numpy.unwrap(angles).tolist() for angles in (rotate_x, rotate_y, rotate_z))
+        return translation, rotation
+
+    translation = ([], [], [])
+    rotation = ([], [], [])
+    for matrix in matrices:
+        rows = []
+        for row in range(3):
+            axis = matrix[row * 4:row * 4 + 3]
+            length = math.sqrt(sum(value * value for value in axis)) or 1.0
+            rows.append([value / length for value in axis])
+        cos_y = math.hypot(rows[0][0], rows[0][1])
+        if cos_y < 1e-6:
+            rotate_x, rotate_z = math.atan2(-rows[2][1], rows[1][1]), 0.0
+        else:
+            rotate_x, rotate_z = math.atan2(rows[1][2], rows[2][2]), math.atan2(rows[0][1], rows[0][0])
+        rotate_y = math.atan2(-rows[0][2], cos_y)
+        for channel, value in zip(translation, matrix[12:15]):
+            channel.append(value)
+        for channel, value in zip(rotation, (rotate_x, rotate_y, rotate_z)):
+            channel.append(value)
+    return translation, tuple(_unwrap(channel) for channel in rotation)
+
+
+def key_camera(camera, camera_shape, samples, time_offset=0):
+    """
+    Writes sampled animation onto an (unkeyed) export camera.
+
+    The curves are created with one undoable ``setKeyframe`` so undoing an export also removes
+    them, then filled with one ``addKeys`` call each. Lens attributes that don't change are set
+    instead of keyed.
+
+    Args:
+        camera (str): Export camera transform, rotate order XYZ.
+        camera_shape (str): Its camera shape.
+        samples (CameraSamples): Data of the source camera.
+        time_offset (int): Added to every frame, e.g. ``-min_time`` to start the keys at 0.
+
+    Returns:
+        list: The created animCurve nodes.
+    """
+    translation, rotation = decompose_matrices(samples.matrices)
+    channels = [(camera, name, values) for name, values in zip(TRANSFORM_CHANNELS, translation + rotation)]
+    shape_fn = om2.MFnDependencyNode(_dependency_node(camera_shape))
+    for attribute, values in samples.lens.items():
+        if values and max(values) - min(values) > 1e-9:
+            channels.append((camera_shape, attribute, values))
+        elif values:
+            shape_fn.findPlug(attribute, False).setDouble(values[0])
+
+    for node in {node for node, _, _ in channels}:
+        attributes = [attribute for channel_node, attribute, _ in channels if channel_node == node]
+        cm.setKeyframe(node, attribute=attributes, time=samples.frames[0] + time_offset)
+
+    unit = om2.MTime.uiUnit()
+    times = om2.MTimeArray([om2.MTime(frame + time_offset, unit) for frame in samples.frames])
+    curves = []
+    for node, attribute, values in channels:
+        curve_name = (cm.listConnections(f"{node}.{attribute}", source=True, destination=False,
+                                         type="animCurve") or [None])[0]
+        if curve_name is None:
+            raise RuntimeError(f"No curve was created for {node}.{attribute}")
+        curve_fn = oma2.MFnAnimCurve(_dependency_node(curve_name))
+        curve_fn.addKeys(times, om2.MDoubleArray(values), keepExistingKeys=False)
+        curves.append(curve_name)
+    return curves
+
+
+# Maya time units with a fixed rate; others are spelled like "23.976fps"
+MAYA_FRAME_RATES = {"game": 15.0, "film": 24.0, "pal": 25.0, "ntsc": 30.0, "show": 48.0, "palf": 50.0, "ntscf": 60.0}
+
+UNREAL_CAMERA_DATA_VERSION = 1
+INCH_TO_MM = 25.4
+
+
+def scene_frame_rate():
+    """
+    Returns:
+        float: Frames per second of the scene's time unit.
+    """
+    unit = cm.currentUnit(query=True, time=True)
+    if unit in MAYA_FRAME_RATES:
+        return MAYA_FRAME_RATES[unit]
+    if unit.endswith("fps"):
+        return float(unit[:-3])
+    logger.warning(f"Unknown time unit {unit}, assuming 24 fps")
+    return 24.0
+
+
+def maya_to_unreal_vector(vector):
+    """
+    Converts a Maya (Y-up, right-handed) vector to Unreal (Z-up, left-handed); both in centimetres.
+    """
+    return vector[0], vector[2], vector[1]
+
+
+def unreal_rotator(matrix):
+    """
+    Unreal rotation of a Maya camera's world matrix. Maya cameras look down -Z with +Y up; Unreal
+    cameras look down +X with +Z up.
+
+    Args:
+        matrix (list): 16 floats, see ``CameraSamples.matrices``.
+
+    Returns:
+        tuple: (roll, pitch, yaw) in degrees, as in an FRotator.
+    """
+    def unit(vector):
+        length = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / length for value in vector]
+
+    right = maya_to_unreal_vector(unit(matrix[0:3]))
+    up = maya_to_unreal_vector(unit(matrix[4:7]))
+    forward = maya_to_unreal_vector([-value for value in unit(matrix[8:11])])
+
+    pitch = math.atan2(forward[2], math.hypot(forward[0], forward[1]))
+    yaw = math.atan2(forward[1], forward[0])
+    # Y axis of the rotator without roll; roll is the angle of the real right/up around it
+    no_roll_right = (-math.sin(yaw), math.cos(yaw), 0.0)
+    roll = math.atan2(
+        sum(a * b for a, b in zip(up, no_roll_right)), sum(a * b for a, b in zip(right, no_roll_right))
+    )
+    return math.degrees(roll), math.degrees(pitch), math.degrees(yaw)
+
+
+def _column(values, digits):
+    values = [round(value, digits) for value in values]
+    # Constant lens values are stored once
+    if values and all(value == values[0] for value in values):
+        return values[0]
+    return values
+
+
+def frame_rate_fraction(frame_rate):
+    """
+    Splits a frame rate into the numerator and denominator Unreal's ``FrameRate`` takes, keeping
+    NTSC rates exact: 23.976 is 24000/1001, 29.97 is 30000/1001.
+
+    Returns:
+        tuple: (numerator, denominator).
+    """
+    if abs(frame_rate - round(frame_rate)) < 1e-3:
+        return int(round(frame_rate)), 1
+    ntsc_base = round(frame_rate * 1.001)
+    if abs(frame_rate - ntsc_base / 1.001) < 1e-2:
+        return int(ntsc_base) * 1000, 1001
+    return int(round(frame_rate * 1000)), 1000
+
+
+def unreal_camera_data(samples, time_offset=0, frame_rate=24.0):
+    """
+    Converts camera samples to the per-frame table read by ``UnrealCameraImport``.
+
+    Args:
+        samples (CameraSamples): Data of the source camera.
+        time_offset (int): Added to every frame, as for the FBX keys.
+        frame_rate (float): Frames per second.
+
+    Returns:
+        dict: JSON-serialisable camera data. Per-frame columns are lists, or a single value when
+            they don't change.
+    """
+    locations = [
+        [round(value, 4) for value in maya_to_unreal_vector(matrix[12:15])] for matrix in samples.matrices
+    ]
+    rotations = [unreal_rotator(matrix) for matrix in samples.matrices]
+    # Keep the angles continuous for Sequencer's interpolation
+    rotations = list(zip(*[
+        [round(math.degrees(value), 4) for value in _unwrap([math.radians(angle) for angle in channel])]
+        for channel in zip(*rotations)
+    ])) if rotations else []
+
+    lens = samples.lens
+    numerator, denominator = frame_rate_fraction(frame_rate)
+    return {
+        "version": UNREAL_CAMERA_DATA_VERSION,
+        "frame_rate": frame_rate,
+        "frame_rate_numerator": numerator,
+        "frame_rate_denominator": denominator,
+        "first_frame": samples.frames[0] + time_offset if samples.frames else 0,
+        "frame_count": len(samples.frames),
+        "location": locations,
+        "rotation": [list(rotation) for rotation in rotations],
+        "focal_length": _column(lens.get("focalLength", []), 4),
+        "sensor_width": _column([value * INCH_TO_MM for value in lens.get("horizontalFilmAperture", [])], 4),
+        "sensor_height": _column([value * INCH_TO_MM for value in lens.get("verticalFilmAperture", [])], 4),
+        "focus_distance": _column(lens.get("focusDistance", []), 3),
+        "aperture": _column(lens.get("fStop", []), 3),
+    }
@@ -0,0 +1,2080 @@
+"""
+Export core shared by the ExportTool UI and the headless (mayapy) entry point.
+
+Nothing in this module touches Qt. The UI fills in an ``ExportSettings`` from its widgets and
+hands it to an ``ExportJob``; batch tooling builds the same settings from the command line.
+"""
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager, ExitStack
+from dataclasses import dataclass, field
+
+import maya.cmds as cm
+import maya.OpenMaya as oMaya
+from maya.mel import eval
+
+from ExportCache import ExportCache, compute_key, hash_floats
+from ExportCamera import sample_camera, key_camera, scene_frame_rate, unreal_camera_data
+from ExportManifest import ExportManifest
+from ExportJournal import ExportJournal
+from ExportNames import namespace_matches
+from ExportProfiler import Tracer, traced, get_process_memory_mb
+from ExportStaging import StagingUploader, DEFAULT_UPLOAD_WORKERS
+from ExportVerify import OutputVerifier, OutputExpectation
+from ExportPackage import ShotPackager, PACKAGE_FORMATS, package_path, resolve_format
+from ExportSequencer import list_sequencer_shots
+
+logger = logging.getLogger(__name__)
+
+FBX_VERSIONS = {
+    '2016': 'FBX201600',
+    '2014': 'FBX201400',
+    '2013': 'FBX201300',
+    '2017': 'FBX201700',
+    '2018': 'FBX201800',
+    '2019': 'FBX201900'
+}
+
+EXPORT_MODES = ("fbx", "abc", "all")
+
+PROFILE_DIR_NAME = ".export_profiles"
+
+ABC_JOB_FLAGS = "-stripNamespaces -uvWrite -writeFaceSets -wholeFrameGeo -worldSpace -writeUVSets"
+
+# Groups a rig publishes for export; these are the only nodes discovery ever looks at
+FBX_GROUPS = ("ExportGrp", "DeformationSystem", "Geometry")
+# Groups that make a namespace a character instance; Geometry alone (props, nested assets) doesn't
+FBX_CHARACTER_GROUPS = ("ExportGrp", "DeformationSystem")
+ABC_GROUPS = ("ABCExport",)
+ASSET_GROUPS = FBX_GROUPS + ABC_GROUPS
+
+# FBX export options shared by every preset, in the order they are sent to the plug-in
+_FBX_COMMON_OPTIONS = (
+    ("FBXExportSmoothingGroups", "true"),
+    ("FBXExportHardEdges", "false"),
+    ("FBXExportTangents", "false"),
+    ("FBXExportSmoothMesh", "true"),
+    ("FBXExportInstances", "false"),
+    ("FBXExportReferencedAssetsContent", "false"),
+    ("FBXExportUseSceneName", "false"),
+    ("FBXExportQuaternion", "euler"),
+    ("FBXExportShapes", "true"),
+    ("FBXExportSkins", "true"),
+    ("FBXExportConstraints", "false"),
+    ("FBXExportCameras", "true"),
+    ("FBXExportLights", "true"),
+    ("FBXExportEmbeddedTextures", "false"),
+    ("FBXExportInputConnections", "true"),
+    ("FBXExportUpAxis", "y"),
+)
+
+FBX_PRESETS = {
+    "UE skeletal anim": dict(_FBX_COMMON_OPTIONS),
+    "UE camera": dict(
+        _FBX_COMMON_OPTIONS,
+        FBXExportShapes="false",
+        FBXExportSkins="false",
+        FBXExportLights="false",
+    ),
+}
+DEFAULT_CHARACTER_PRESET = "UE skeletal anim"
+DEFAULT_CAMERA_PRESET = "UE camera"
+
+# Options whose MEL command doesn't take the "-v" flag
+_FBX_OPTIONS_WITHOUT_FLAG = ("FBXExportUpAxis",)
+
+
+@contextmanager
+def fast_bake_context(keep_undo=False):
+    """
+    Puts Maya in its fastest state for baking and writing: viewport refresh suspended, parallel
+    evaluation and no undo recording. Everything is restored on exit, also on errors or when a
+    step-wise export is cancelled. Settings Maya refuses to change are skipped with a warning.
+
+    Args:
+        keep_undo (bool): Leave undo recording on, for exports that undo their bake afterwards.
+    """
+    restore_steps = []
+
+    def change(description, apply, restore):
+        try:
+            apply()
+            restore_steps.append((description, restore))
+        except RuntimeError as e:
+            logger.warning(f"Fast bake: couldn't change {description}: {e}")
+
+    change("viewport refresh", lambda: cm.refresh(suspend=True), lambda: cm.refresh(suspend=False))
+
+    try:
+        evaluation_mode = (cm.evaluationManager(query=True, mode=True) or [None])[0]
+    except RuntimeError:
+        evaluation_mode = None
+    if evaluation_mode and evaluation_mode != "parallel":
+        change(
+            "evaluation mode", lambda: cm.evaluationManager(mode="parallel"),
+            lambda: cm.evaluationManager(mode=evaluation_mode)
+        )
+
+    if not keep_undo and cm.undoInfo(query=True, state=True):
+        # Without flush, so the user's undo history survives the export
+        change(
+            "undo recording", lambda: cm.undoInfo(stateWithoutFlush=False),
+            lambda: cm.undoInfo(stateWithoutFlush=True)
+        )
+
+    try:
+        yield
+    finally:
+        for description, restore in reversed(restore_steps):
+            try:
+                restore()
+            except RuntimeError as e:
+                logger.error(f"Fast bake: failed to restore {description}: {e}")
+
+
+class TempNodeRegistry(object):
+    """
+    Nodes an export run creates for itself (export cameras, matrix networks and their curves).
+
+    Every node is registered the moment it exists, so it can be deleted however the run ends: per
+    asset once the asset is written, and whatever is left when the run finishes, fails or is
+    cancelled. Leftovers would otherwise pile up in the scene and the undo queue over a long session.
+    """
+
+    def __init__(self):
+        self.nodes = []
+
+    def register(self, asset, *nodes):
+        """
+        Records nodes created for an asset.
+
+        Args:
+            asset (ExportAsset): The asset the nodes belong to; they are added to its ``temp_nodes``.
+            nodes (str): Node names.
+        """
+        asset.temp_nodes.extend(nodes)
+        self.nodes.extend(nodes)
+
+    def release(self, asset):
+        """
+        Deletes the nodes of one asset.
+        """
+        self.delete(asset.temp_nodes)
+        released = set(asset.temp_nodes)
+        self.nodes = [node for node in self.nodes if node not in released]
+        asset.temp_nodes = []
+
+    def release_all(self):
+        """
+        Deletes every node still registered.
+
+        Returns:
+            int: Number of nodes that still existed.
+        """
+        deleted = self.delete(self.nodes)
+        self.nodes = []
+        return deleted
+
+    @staticmethod
+    def delete(nodes):
+        existing = [node for node in nodes if cm.objExists(node)]
+        if existing:
+            cm.delete(existing)
+        return len(existing)
+
+
+class MemoryCeilingExceeded(RuntimeError):
+    """
+    Raised by ``ExportJob.check_memory`` when the process grows past ``memory_limit_mb``.
+    """
+
+
+class AssetIndex(object):
+    """
+    Namespace -> export group lookup built from a single, name-filtered ``ls``.
+
+    Only nodes named like one of ``ASSET_GROUPS`` are queried, so heavy scenes aren't walked node by
+    node. Build it once per export run and share it between the FBX and Alembic exports.
+    """
+
+    def __init__(self, groups):
+        """
+        Args:
+            groups (dict): {namespace: {group name: long node name}}.
+        """
+        self.groups = groups
+
+    @classmethod
+    @traced("AssetIndex.scan")
+    def scan(cls):
+        """
+        Queries the scene for export groups.
+
+        Returns:
+            AssetIndex: The index of the current scene.
+        """
+        groups = {}
+        for node in cm.ls(list(ASSET_GROUPS), recursive=True, long=True) or []:
+            namespace, _, group = node.rpartition("|")[2].rpartition(":")
+            if not namespace:
+                continue
+            groups.setdefault(namespace, {}).setdefault(group, node)
+
+        logger.info(f"Indexed {len(groups)} asset namespaces")
+        return cls(groups)
+
+    def namespaces_for(self, character, required_groups=ASSET_GROUPS):
+        """
+        Namespaces of a character that contain at least one of the given groups.
+
+        Args:
+            character (str): Character name.
+            required_groups (tuple): Group names to look for.
+
+        Returns:
+            list: Matching namespaces, sorted so file numbering is stable between runs.
+        """
+        return sorted(
+            namespace for namespace, groups in self.groups.items()
+            if namespace_matches(namespace, character) and any(group in groups for group in required_groups)
+        )
+
+    def fbx_selection(self, namespace):
+        """
+        Nodes to select for a character's FBX export: ExportGrp, else DeformationSystem and Geometry.
+
+        Returns:
+            list: Nodes to export, empty if the namespace has neither group.
+        """
+        groups = self.groups.get(namespace, {})
+        if "ExportGrp" in groups:
+            return [groups["ExportGrp"]]
+        if "DeformationSystem" in groups:
+            return [groups[group] for group in ("DeformationSystem", "Geometry") if group in groups]
+        return []
+
+    def abc_root(self, namespace):
+        """
+        Returns:
+            str: Long name of the namespace's ABCExport group, or None.
+        """
+        return self.groups.get(namespace, {}).get("ABCExport")
+
+
+class FbxOptionProfile(object):
+    """
+    A full set of FBX export options, applied differentially.
+
+    The FBX plug-in keeps its export options for the whole Maya session, so the profile remembers
+    what it last sent and only re-issues the options that changed, batched into one MEL call.
+    Exporting several files in a row therefore typically costs one short MEL string for the bake
+    range instead of the full option block per file.
+    """
+
+    # Options last applied in this Maya session: {option: value}
+    _session_state = {}
+
+    def __init__(self, options):
+        """
+        Args:
+            options (dict): {FBX option command: MEL value}, applied in insertion order.
+        """
+        self.options = dict(options)
+
+    @classmethod
+    def from_preset(cls, preset, fbx_version="2019", bake=True, min_time=None, max_time=None):
+        """
+        Builds a profile from a named preset plus the per-file settings.
+
+        Args:
+            preset (str): Key of ``FBX_PRESETS``.
+            fbx_version (str): Key of ``FBX_VERSIONS``.
+            bake (bool): Bake complex animation over the given range.
+            min_time (int): Bake start.
+            max_time (int): Bake end.
+
+        Returns:
+            FbxOptionProfile: The profile.
+        """
+        options = dict(FBX_PRESETS[preset])
+        if bake:
+            options["FBXExportBakeComplexAnimation"] = "true"
+            options["FBXExportBakeComplexStep"] = "1"
+            options["FBXExportBakeComplexStart"] = str(min_time)
+            options["FBXExportBakeComplexEnd"] = str(max_time)
+        else:
+            options["FBXExportBakeComplexAnimation"] = "false"
+        options["FBXExportFileVersion"] = FBX_VERSIONS[fbx_version]
+        return cls(options)
+
+    @classmethod
+    def reset_session(cls):
+        """
+        Forgets the applied state, so the next profile is sent in full. Call this when something
+        else (the FBX export dialog, another tool) may have changed the options.
+        """
+        cls._session_state.clear()
+
+    @staticmethod
+    def option_command(option, value):
+        if option in _FBX_OPTIONS_WITHOUT_FLAG:
+            return f"{option} {value}"
+        return f"{option} -v {value}"
+
+    def changed_options(self):
+        """
+        Returns:
+            list: (option, value) pairs that differ from what the session last received.
+        """
+        return [
+            (option, value) for option, value in self.options.items()
+            if self._session_state.get(option) != value
+        ]
+
+    @traced("FbxOptionProfile.apply")
+    def apply(self):
+        """
+        Sends the changed options to the FBX plug-in.
+
+        Returns:
+            int: Number of options sent.
+        """
+        changed = self.changed_options()
+        if not changed:
+            return 0
+
+        try:
+            eval("; ".join(self.option_command(option, value) for option, value in changed))
+            self._session_state.update(changed)
+        except RuntimeError as e:
+            # Find the offending option(s); everything that works is still applied and remembered
+            logger.warning(f"Batched FBX options failed ({e}), applying them one by one")
+            for option, value in changed:
+                command = self.option_command(option, value)
+                try:
+                    eval(command)
+                    self._session_state[option] = value
+                except RuntimeError as option_error:
+                    logger.error(f"Failed to execute MEL command: {command} - {option_error}")
+                    self._session_state.pop(option, None)
+        return len(changed)
+
+
+@dataclass
+class ExportAsset:
+    """
+    One output file of an export run.
+
+    Attributes:
+        kind (str): "camera", "character" or "abc".
+        name (str): Camera or character name as listed in the settings.
+        source (str): Source camera node or character namespace.
+        output_path (str): File to write.
+        nodes (list): Nodes selected for the export.
+        preset (str): FBX option preset, for FBX assets.
+        proxy (list): Export camera [transform, shape] for camera assets.
+        temp_nodes (list): Nodes created for the export, deleted afterwards.
+        cache_key (str): Hash of the asset's export inputs, see ``ExportJob.asset_cache_inputs``.
+        staged_path (str): Local file the asset is written to before upload, when staging.
+        camera_samples (ExportCamera.CameraSamples): API samples of a camera asset's source camera.
+        frame_range (list): [start, end] of the sequencer shot the asset belongs to, handles
+            included. FBX keys are sliced to this range and re-based to frame 0; Alembic files are
+            written over it in scene time.
+        bake_targets (list): Nodes and attributes baked for the asset by ``bake_assets``.
+        checksum (str): Checksum of the written file, taken while it was verified.
+    """
+    kind: str
+    name: str
+    source: str
+    output_path: str
+    nodes: list = field(default_factory=list)
+    preset: str = None
+    proxy: list = field(default_factory=list)
+    temp_nodes: list = field(default_factory=list)
+    cache_key: str = None
+    staged_path: str = None
+    camera_samples: object = None
+    frame_range: list = None
+    bake_targets: list = field(default_factory=list)
+    checksum: str = None
+
+    @property
+    def write_path(self):
+        """
+        Returns:
+            str: Where the exporter writes the file: the staging copy or the output path.
+        """
+        return self.staged_path or self.output_path
+
+
+@dataclass
+class ExportProgress:
+    """
+    Progress of a step-wise export, see ``ExportJob.iter_steps``.
+
+    Attributes:
+        stage (str): "discover", "bake", "write", "verify" or "upload".
+        message (str): What was just done.
+        done (int): Steps finished so far.
+        total (int): Steps expected; grows as the export discovers its assets.
+        asset (ExportAsset): The asset written in this step, if any.
+    """
+    stage: str
+    message: str
+    done: int
+    total: int
+    asset: ExportAsset = None
+
+
+@dataclass
+class ExportSettings:
+    """
+    Everything an export run needs, independent of where it was entered.
+
+    Attributes:
+        file_path (str): Root directory; files are written to ``<file_path>/<shot_name>``.
+        shot_name (str): Shot name, used as directory name and file prefix.
+        character_names (list): Characters to export to FBX.
+        camera_names (list): Cameras to export to FBX.
+        abc_names (list): Characters to export to Alembic.
+        start_frame (int): Start frame override, None to use the playback range.
+        end_frame (int): End frame override, None to use the playback range.
+        offset (int): Handle frames added on both sides of the range.
+        bake (bool): Bake animation into the FBX files.
+        fbx_version (str): Key of ``FBX_VERSIONS``.
+        fbx_preset (str): Key of ``FBX_PRESETS`` used for characters.
+        fbx_camera_preset (str): Key of ``FBX_PRESETS`` used for cameras.
+        batch_bake (bool): Bake all cameras and characters in one timeline sweep before writing.
+        sample_cameras (bool): Key export cameras from API samples of the source camera instead of
+            baking a matrix network, see ``ExportCamera``.
+        unreal_camera_data (bool): Also write each camera as a per-frame JSON table for
+            ``UnrealCameraImport``, next to its FBX file.
+        restore_scene (bool): Undo the batch bake afterwards; only needed when the scene is kept.
+        use_cache (bool): Skip assets whose inputs haven't changed since they were last written.
+        force_rebuild (bool): Rewrite every asset, refreshing the cache.
+        resume (bool): Keep the files an interrupted earlier run completed, as recorded in the
+            shot's journal (see ``ExportJournal``), and export the rest.
+        resume_since (float): Only resume files completed after this time (seconds since the
+            epoch); also resumes them under ``force_rebuild``. Set by the worker pool when it
+            continues a job on a fresh worker.
+        write_manifest (bool): Write a JSON manifest of the run into the shot export directory.
+        staging_dir (str): Local directory to write files to before copying them to the shot
+            directory in the background. Empty to write to the shot directory directly.
+        upload_workers (int): Copies to the shot directory in flight at once, when staging.
+        verify_outputs (bool): Check the structure, FBX version and frame count of every written
+            file in the background (see ``ExportVerify``) before it is uploaded and published.
+        package (str): Also pack the shot's files into a compressed archive next to the shot
+            directory while exporting: "zip" or "zstd". Empty for no package.
+        fast_bake (bool): Run the export inside ``fast_bake_context``.
+        reduce_keys (bool): After the batch bake, delete static channels and simplify the baked curves.
+        translate_tolerance (float): Simplify tolerance of translate and other linear/unitless curves.
+        rotate_tolerance (float): Simplify tolerance of rotate curves, in degrees.
+        profile (bool): Record a Chrome trace of the run, see ``ExportProfiler``.
+        profile_python (bool): Also capture a cProfile of the run next to the trace.
+        sequencer (bool): Export every Camera Sequencer shot into its own directory, named after the
+            shot, from a single bake of all shot ranges. ``shot_name`` names the run's manifest
+            and package; each shot's camera is exported instead of ``camera_names``.
+        sequencer_shots (list): Only export these sequencer shots; all unmuted shots if empty.
+        flush_undo (bool): Flush Maya's undo queue after each written asset, for long unattended
+            sessions. Never done inside the batch bake's undo chunk.
+        memory_limit_mb (float): Stop the run once the process uses more memory than this, after
+            the asset being written. None for no limit.
+    """
+    file_path: str = ""
+    shot_name: str = ""
+    character_names: list = field(default_factory=list)
+    camera_names: list = field(default_factory=list)
+    abc_names: list = field(default_factory=list)
+    start_frame: int = None
+    end_frame: int = None
+    offset: int = 0
+    bake: bool = True
+    fbx_version: str = "2019"
+    fbx_preset: str = DEFAULT_CHARACTER_PRESET
+    fbx_camera_preset: str = DEFAULT_CAMERA_PRESET
+    batch_bake: bool = True
+    sample_cameras: bool = True
+    unreal_camera_data: bool = False
+    restore_scene: bool = True
+    use_cache: bool = True
+    force_rebuild: bool = False
+    resume: bool = False
+    resume_since: float = None
+    write_manifest: bool = True
+    staging_dir: str = ""
+    upload_workers: int = DEFAULT_UPLOAD_WORKERS
+    verify_outputs: bool = True
+    package: str = ""
+    fast_bake: bool = False
+    reduce_keys: bool = False
+    translate_tolerance: float = 0.01
+    rotate_tolerance: float = 0.05
+    profile: bool = False
+    profile_python: bool = False
+    sequencer: bool = False
+    sequencer_shots: list = field(default_factory=list)
+    flush_undo: bool = False
+    memory_limit_mb: float = None
+
+    @property
+    def export_dir(self):
+        return os.path.join(self.file_path, self.shot_name).replace(os.sep, '/')
+
+    def validate(self):
+        """
+        Checks the settings that cannot be defaulted.
+
+        Returns:
+            list: Human readable problems, empty when the settings are usable.
+        """
+        problems = []
+        if not self.file_path:
+            problems.append("File path cannot be empty.")
+        elif not os.path.isdir(self.file_path):
+            problems.append(f"File path does not exist: {self.file_path}")
+        if not self.shot_name:
+            problems.append("Shot name can't be empty")
+        if self.fbx_version not in FBX_VERSIONS:
+            problems.append(f"Unknown FBX version: {self.fbx_version}")
+        for preset in (self.fbx_preset, self.fbx_camera_preset):
+            if preset not in FBX_PRESETS:
+                problems.append(f"Unknown FBX preset: {preset}")
+        if self.offset < 0:
+            problems.append("Time offset can't be negative.")
+        if self.staging_dir and os.path.normpath(self.staging_dir) == os.path.normpath(self.file_path):
+            problems.append("Staging directory must differ from the file path.")
+        if self.package and self.package not in PACKAGE_FORMATS:
+            problems.append(f"Unknown package format: {self.package}")
+        if self.translate_tolerance < 0 or self.rotate_tolerance < 0:
+            problems.append("Key reduction tolerances can't be negative.")
+        if self.sequencer and not self.batch_bake:
+            problems.append("Sequencer export needs the batch bake.")
+        if self.memory_limit_mb is not None and self.memory_limit_mb <= 0:
+            problems.append("Memory limit must be positive.")
+        return problems
+
+
+class ExportJob(object):
+    """
+    Runs the FBX and Alembic exports for one ``ExportSettings``.
+
+    Errors on a single camera or character are logged and collected in ``failures`` so the rest of
+    the shot still exports; ``run`` reports whether everything went through.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.failures = []
+        self.asset_index = None
+        self.caches = {}
+        self.journals = {}
+        self.cache_hits = []
+        self.steps_done = 0
+        self.steps_total = 0
+        self.manifest = None
+        self.uploader = None
+        self.verifier = None
+        self.frame_rate = None
+        self.packager = None
+        self.temp_nodes = TempNodeRegistry()
+        self.undo_chunk_open = False
+        self.memory_mb = None
+        self.memory_exceeded = False
+
+    def report_error(self, message, error, asset=None):
+        logger.error(f"{message}: {error}")
+        oMaya.MGlobal.displayError(f"{message}: {error}")
+        self.failures.append(f"{message}: {error}")
+        if asset is not None and self.manifest is not None:
+            self.manifest.mark_failed(asset, error)
+        if asset is not None:
+            self.get_journal(os.path.dirname(asset.output_path)).failed(asset, error)
+
+    def record_timing(self, assets, phase, seconds):
+        """
+        Adds time spent in a phase to the manifest, for the run and for each asset involved.
+
+        Args:
+            assets (list): Assets the work was done for; shared work is recorded on each of them.
+            phase (str): "discovery", "bake" or "write".
+            seconds (float): Wall-clock duration.
+        """
+        if self.manifest is None:
+            return
+        self.manifest.phases[phase] += seconds
+        for asset in assets:
+            self.manifest.add_timing(asset, phase, seconds, len(assets))
+
+    @staticmethod
+    def execute_mel_command(command):
+        try:
+            eval(command)
+            # logger.info(f"MEL command executed: {command}")
+        except RuntimeError as e:
+            logger.error(f"Failed to execute MEL command: {command} - {e}")
+
+    def get_time_range(self):
+        """
+        Get the start frame, end frame, and apply any applicable offset.
+
+        Returns:
+            tuple: (start_frame, end_frame) as integers.
+        """
+        min_time = self.settings.start_frame
+        max_time = self.settings.end_frame
+
+        # Fall back to Maya's playback range for anything not overridden
+        if min_time is None:
+            min_time = int(cm.playbackOptions(q=True, min=True))
+        if max_time is None:
+            max_time = int(cm.playbackOptions(q=True, max=True))
+
+        # Apply handles
+        min_time -= self.settings.offset
+        max_time += self.settings.offset
+
+        logger.info(f"Computed Time Range: Start = {min_time}, End = {max_time}")
+        return min_time, max_time
+
+    def get_asset_index(self):
+        """
+        Returns:
+            AssetIndex: The scene's export groups, scanned once per run.
+        """
+        if self.asset_index is None:
+            self.asset_index = AssetIndex.scan()
+        return self.asset_index
+
+    def get_cache(self, export_dir):
+        """
+        Returns:
+            ExportCache: The shot directory's export cache, loaded once per run.
+        """
+        cache = self.caches.get(export_dir)
+        if cache is None:
+            cache = self.caches[export_dir] = ExportCache(export_dir)
+        return cache
+
+    def save_cache(self):
+        for cache in self.caches.values():
+            cache.save()
+
+    def get_journal(self, export_dir):
+        """
+        Returns:
+            ExportJournal: The shot directory's resume journal, opened once per run.
+        """
+        journal = self.journals.get(export_dir)
+        if journal is None:
+            journal = self.journals[export_dir] = ExportJournal(export_dir)
+        return journal
+
+    def close_journals(self):
+        for journal in self.journals.values():
+            journal.close()
+        self.journals = {}
+
+    @staticmethod
+    def asset_driver_nodes(asset):
+        """
+        Nodes whose animation determines an asset's output: the camera with its parents, or every
+        node in the character's namespace.
+
+        Returns:
+            list: Node names.
+        """
+        if asset.kind == "camera":
+            long_name = (cm.ls(asset.source, long=True) or [asset.source])[0]
+            parts = long_name.split("|")
+            nodes = ["|".join(parts[:depth]) for depth in range(2, len(parts) + 1)]
+            return nodes + (cm.listRelatives(long_name, shapes=True, fullPath=True) or [])
+        return cm.ls(f"{asset.source}:*", long=True) or []
+
+    def asset_cache_inputs(self, asset, min_time, max_time):
+        """
+        Gathers everything an asset's output file depends on.
+
+        This covers the animCurves connected to the asset's nodes (keys and tangents), the world
+        matrix of its top nodes at the current frame (catches unkeyed moves), the referenced rig
+        file and its modification time, the frame range and the export options. Animation coming
+        from outside (constraints to other assets, expressions) isn't tracked; use force rebuild
+        when that changes.
+
+        Returns:
+            dict: JSON-serialisable cache inputs.
+        """
+        driver_nodes = self.asset_driver_nodes(asset)
+        curves = sorted(set(
+            cm.listConnections(driver_nodes, source=True, destination=False, type="animCurve") or []
+        )) if driver_nodes else []
+        keys = cm.keyframe(curves, query=True, timeChange=True, valueChange=True) if curves else []
+        tangents = cm.keyTangent(curves, query=True, inAngle=True, outAngle=True) if curves else []
+
+        top_nodes = asset.nodes if asset.kind != "camera" else [asset.source]
+        world_matrices = [cm.xform(node, query=True, worldSpace=True, matrix=True) for node in top_nodes]
+
+        reference_node = top_nodes[0]
+        rig_file = None
+        rig_mtime = None
+        if cm.referenceQuery(reference_node, isNodeReferenced=True):
+            rig_file = cm.referenceQuery(reference_node, filename=True, withoutCopyNumber=True)
+            rig_mtime = os.path.getmtime(rig_file) if os.path.isfile(rig_file) else None
+
+        if asset.kind == "abc":
+            options = self.abc_job_string(asset, min_time, max_time, asset.output_path)
+        else:
+            options = FbxOptionProfile.from_preset(
+                asset.preset, self.settings.fbx_version, self.settings.bake, min_time, max_time
+            ).options
+
+        return {
+            "kind": asset.kind,
+            "source": asset.source,
+            "curves": curves,
+            "keys": hash_floats(keys),
+            "tangents": hash_floats(tangents),
+            "world_matrices": world_matrices,
+            "rig_file": rig_file,
+            "rig_mtime": rig_mtime,
+            "frame_range": [min_time, max_time],
+            "time_unit": cm.currentUnit(query=True, time=True),
+            "options": options,
+            "batch_bake": self.settings.batch_bake,
+            "sample_cameras": self.settings.sample_cameras if asset.kind == "camera" else None,
+            "unreal_camera_data": self.settings.unreal_camera_data if asset.kind == "camera" else None,
+            "key_reduction": [self.settings.translate_tolerance, self.settings.rotate_tolerance]
+            if self.settings.reduce_keys and self.settings.batch_bake else None,
+        }
+
+    @traced("ExportJob.skip_cached_assets")
+    def skip_cached_assets(self, assets, export_dir, min_time, max_time):
+        """
+        Computes each asset's cache key and drops the ones whose file is up to date.
+
+        Args:
+            assets (list): Planned ``ExportAsset``s.
+            export_dir (str): The shot export directory.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+
+        Returns:
+            list: Assets that need exporting.
+        """
+        if not self.settings.use_cache:
+            return assets
+
+        cache = self.get_cache(export_dir)
+        remaining = []
+        for asset in assets:
+            start = time.perf_counter()
+            try:
+                asset.cache_key = compute_key(self.asset_cache_inputs(asset, min_time, max_time))
+            except Exception as e:
+                logger.warning(f"Couldn't hash {asset.kind} {asset.source}, exporting it: {e}")
+                remaining.append(asset)
+                continue
+            finally:
+                self.record_timing([asset], "discovery", time.perf_counter() - start)
+
+            if not self.settings.force_rebuild and cache.is_fresh(asset.output_path, asset.cache_key):
+                logger.info(f"Cache hit, {asset.kind} {asset.source} is unchanged: {asset.output_path}")
+                self.cache_hits.append(asset)
+                if self.manifest is not None:
+                    self.manifest.mark_cached(asset)
+                if self.packager is not None:
+                    self.packager.add(asset.output_path)
+                continue
+            remaining.append(asset)
+        return remaining
+
+    @traced("ExportJob.skip_completed_assets")
+    def skip_completed_assets(self, assets, export_dir):
+        """
+        Journals the assets about to be exported. When resuming, assets an earlier run completed
+        from the same inputs, with their file unchanged since, are kept instead.
+
+        Args:
+            assets (list): Assets left after the cache check.
+            export_dir (str): The shot export directory of the assets.
+
+        Returns:
+            list: Assets that still need exporting.
+        """
+        journal = self.get_journal(export_dir)
+        settings = self.settings
+        resume = settings.resume and (not settings.force_rebuild or settings.resume_since is not None)
+        remaining = []
+        for asset in assets:
+            if resume and journal.is_complete(asset, settings.resume_since):
+                logger.info(f"Resuming, {asset.kind} {asset.source} was completed before: {asset.output_path}")
+                self.cache_hits.append(asset)
+                if asset.cache_key:
+                    self.get_cache(export_dir).store(asset.output_path, asset.cache_key)
+                if self.manifest is not None:
+                    self.manifest.mark_cached(asset)
+                if self.packager is not None:
+                    self.packager.add(asset.output_path)
+                continue
+            journal.planned(asset)
+            remaining.append(asset)
+        return remaining
+
+    def asset_started(self, asset):
+        """
+        Journals that an asset's file is about to be written.
+        """
+        self.get_journal(os.path.dirname(asset.output_path)).started(asset)
+
+    def asset_written(self, asset, frames=None, first_frame=None):
+        """
+        Called once an asset's file has been written successfully. The file is queued for
+        verification when that is on; ``asset_verified`` takes it from there.
+
+        Args:
+            asset (ExportAsset): The written asset.
+            frames (int): Frames the file should hold, None if the exporter picked the range.
+            first_frame (int): First frame the file should start at, for Alembic files.
+        """
+        if self.verifier is not None:
+            expected = OutputExpectation(
+                fbx_version=FBX_VERSIONS[self.settings.fbx_version] if asset.kind != "abc" else None,
+                frames=frames, first_frame=first_frame, frame_rate=self.frame_rate,
+            )
+            # Hashed for the resume journal on the verifier's thread, from the local copy when staging
+            self.verifier.verify(asset.write_path, expected, asset, checksum=True)
+            self.steps_total += 1
+            return
+        self.asset_verified(asset)
+
+    def asset_verified(self, asset):
+        """
+        Called once an asset's file is known to be complete. Staged files are queued for upload and
+        published once they are in the shot directory.
+        """
+        if self.uploader is not None and asset.staged_path:
+            self.uploader.upload(asset.staged_path, asset.output_path, asset)
+            self.steps_total += 1
+            return
+        self.asset_published(asset)
+
+    def asset_published(self, asset):
+        """
+        Called once an asset's file is in place in the shot directory.
+        """
+        if asset.cache_key:
+            self.get_cache(os.path.dirname(asset.output_path)).store(asset.output_path, asset.cache_key)
+        self.get_journal(os.path.dirname(asset.output_path)).completed(asset, asset.checksum)
+        if self.manifest is not None:
+            self.manifest.mark_written(asset)
+        if self.packager is not None:
+            self.packager.add(asset.output_path)
+
+    def stage_assets(self, assets):
+        """
+        Points the assets' writes at the local staging directory, when staging is on.
+        """
+        if self.uploader is None:
+            return
+        for asset in assets:
+            asset.staged_path = self.uploader.staged_path(asset.output_path)
+
+    def verify_steps(self, wait=True):
+        """
+        Takes finished verifications; yields an ``ExportProgress`` for each. Files that fail are
+        reported and neither uploaded nor published.
+
+        Args:
+            wait (bool): Wait for checks still running, otherwise only take the finished ones.
+        """
+        if self.verifier is None:
+            return
+        for asset, problems, checksum in self.verifier.completed(wait):
+            name = os.path.basename(asset.output_path)
+            if problems:
+                self.get_cache(os.path.dirname(asset.output_path)).invalidate(asset.output_path)
+                self.report_error(f"Verification of {asset.kind} '{asset.source}' failed", "; ".join(problems), asset)
+            else:
+                asset.checksum = checksum
+                self.asset_verified(asset)
+            yield self.step_done("verify", f"Verified {name}", asset)
+
+    def upload_steps(self, wait=True):
+        """
+        Publishes finished uploads; yields an ``ExportProgress`` for each.
+
+        Args:
+            wait (bool): Wait for uploads still in flight, otherwise only take the finished ones.
+        """
+        if self.uploader is None:
+            return
+        for asset, error in self.uploader.completed(wait):
+            if error is not None:
+                self.report_error(f"Error uploading {asset.kind} '{asset.source}'", error, asset)
+            else:
+                self.asset_published(asset)
+            yield self.step_done("upload", f"Uploaded {os.path.basename(asset.output_path)}", asset)
+
+    def prepare_export_dir(self):
+        """
+        Validates the settings and creates the shot export directory.
+
+        Returns:
+            str: The export directory, or None if the settings are invalid.
+        """
+        problems = self.settings.validate()
+        if problems:
+            for problem in problems:
+                logger.error(problem)
+            oMaya.MGlobal.displayError(" ".join(problems))
+            self.failures.extend(problems)
+            return None
+
+        export_dir = self.settings.export_dir
+        if not os.path.isdir(export_dir):
+            os.mkdir(export_dir)
+        return export_dir
+
+    @traced("ExportJob.fbx_export_option", args=("path",))
+    def fbx_export_option(self, path, min_time, max_time, preset=None, bake=None):
+        """
+        Applies the FBX options for one file and exports the current selection to it.
+
+        Args:
+            path (str): Output FBX file.
+            min_time (int): Bake start.
+            max_time (int): Bake end.
+            preset (str): Key of ``FBX_PRESETS``, defaults to the character preset.
+            bake (bool): Let the FBX plug-in bake the animation, defaults to the settings' bake.
+        """
+        if bake is None:
+            bake = self.settings.bake
+        profile = FbxOptionProfile.from_preset(
+            preset or self.settings.fbx_preset, self.settings.fbx_version, bake, min_time, max_time
+        )
+        profile.apply()
+
+        # Export!
+        eval('FBXExport -f "{0}" -s'.format(path))
+
+    def plan_run_assets(self, export_dir, plan, options=None):
+        """
+        Plans the run's files, registers them in the manifest and drops the ones that are cached.
+        In a sequencer export every shot is planned into its own directory with its own range.
+
+        Args:
+            export_dir (str): The shot export directory.
+            plan (callable): (export dir, shot name, camera names or None) -> ``ExportAsset`` list.
+            options (str): Options description for the manifest, for assets without an FBX preset.
+
+        Returns:
+            tuple: (planned assets, assets to export, (start, end) range to evaluate).
+        """
+        if not self.settings.sequencer:
+            min_time, max_time = self.get_time_range()
+            start = time.perf_counter()
+            planned = plan(export_dir, self.settings.shot_name, None)
+            self.record_timing([], "discovery", time.perf_counter() - start)
+            if self.manifest is not None:
+                self.manifest.add_assets(planned, min_time, max_time, options)
+            remaining = self.skip_cached_assets(planned, export_dir, min_time, max_time)
+            return planned, self.skip_completed_assets(remaining, export_dir), (min_time, max_time)
+
+        start = time.perf_counter()
+        shots = list_sequencer_shots(self.settings.sequencer_shots)
+        self.record_timing([], "discovery", time.perf_counter() - start)
+        if not shots:
+            raise RuntimeError("No sequencer shots to export")
+
+        planned = []
+        remaining = []
+        ranges = []
+        for shot in shots:
+            shot_dir = os.path.join(self.settings.file_path, shot.name).replace(os.sep, '/')
+            if not os.path.isdir(shot_dir):
+                os.mkdir(shot_dir)
+            min_time, max_time = shot.start - self.settings.offset, shot.end + self.settings.offset
+            ranges.append((min_time, max_time))
+
+            start = time.perf_counter()
+            shot_assets = plan(shot_dir, shot.name, [shot.camera] if shot.camera else [])
+            self.record_timing([], "discovery", time.perf_counter() - start)
+            for asset in shot_assets:
+                asset.frame_range = [min_time, max_time]
+            if self.manifest is not None:
+                self.manifest.add_assets(shot_assets, min_time, max_time, options)
+            planned += shot_assets
+            shot_remaining = self.skip_cached_assets(shot_assets, shot_dir, min_time, max_time)
+            remaining += self.skip_completed_assets(shot_remaining, shot_dir)
+
+        union = (min(start for start, _ in ranges), max(end for _, end in ranges))
+        logger.info(f"{len(shots)} sequencer shots, evaluating frames {union[0]} to {union[1]} once")
+        return planned, remaining, union
+
+    @staticmethod
+    def asset_range(asset, min_time, max_time):
+        """
+        Returns:
+            tuple: The frame range of an asset: its sequencer shot, or the run's range.
+        """
+        return tuple(asset.frame_range) if asset.frame_range else (min_time, max_time)
+
+    @staticmethod
+    @contextmanager
+    def playback_range(start, end):
+        """
+        Sets the playback and animation range while a file is written without the FBX plug-in's
+        bake, which takes its take range from the timeline, and restores the scene's range after.
+        """
+        playback = {flag: cm.playbackOptions(query=True, **{flag: True})
+                    for flag in ("minTime", "maxTime", "animationStartTime", "animationEndTime")}
+        cm.playbackOptions(minTime=start, maxTime=end, animationStartTime=start, animationEndTime=end)
+        try:
+            yield
+        finally:
+            cm.playbackOptions(**playback)
+
+    @contextmanager
+    def shot_slice(self, asset, min_time, max_time):
+        """
+        Cuts a sequencer shot out of the shared bake while its file is written: keys outside the
+        shot are removed and the rest moved to start at frame 0, as the camera bake does. The edit
+        runs in an undo chunk that is undone afterwards, so the next shot starts from the full bake
+        again. Assets without a shot, or that weren't baked here, keep their keys: cameras are
+        keyed from frame 0 already, characters are written over their range in scene time. The
+        playback range is set to the written range in every case (see ``playback_range``).
+
+        Args:
+            asset (ExportAsset): The asset being written.
+            min_time (int): Start of the baked range.
+            max_time (int): End of the baked range.
+
+        Yields:
+            tuple: The (start, end) range to write the asset with.
+        """
+        if not asset.frame_range:
+            # Cameras were shifted to frame 0 by the bake or when keyed from samples
+            start, end = (0, max_time - min_time) if asset.kind == "camera" else (min_time, max_time)
+            with self.playback_range(start, end):
+                yield start, end
+            return
+
+        start, end = asset.frame_range
+        sliced = bool(asset.bake_targets) and asset.camera_samples is None
+        if not sliced and asset.camera_samples is None:
+            # Not baked here (the FBX plug-in bakes it): written over the shot in scene time
+            with self.playback_range(start, end):
+                yield start, end
+            return
+
+        cm.undoInfo(openChunk=True, chunkName=f"ExportTool slice {asset.name}")
+        try:
+            curves = []
+            if sliced:
+                curves = cm.listConnections(
+                    asset.bake_targets, source=True, destination=False, type="animCurve"
+                ) or []
+            if curves:
+                # Key the shot boundaries first: reduced curves may have no key there, and cutting
+                # would lose the shot's in and out values
+                cm.setKeyframe(curves, time=[start, end], insert=True)
+                key_times = cm.keyframe(curves, query=True, timeChange=True) or []
+                if key_times and min(key_times) < start:
+                    cm.cutKey(curves, time=(min(key_times), start - 1), clear=True)
+                if key_times and max(key_times) > end:
+                    cm.cutKey(curves, time=(end + 1, max(key_times)), clear=True)
+                cm.keyframe(curves, edit=True, relative=True, timeChange=-start)
+            with self.playback_range(0, end - start):
+                yield 0, end - start
+        finally:
+            cm.undoInfo(closeChunk=True)
+            cm.undo()
+
+    @traced("ExportJob.plan_fbx_assets")
+    def plan_fbx_assets(self, export_dir, shot_name, camera_names=None):
+        """
+        Lists every FBX file of the shot: one per camera, one per character namespace.
+
+        Args:
+            export_dir (str): The output directory for FBX files.
+            shot_name (str): The shot name to use in filenames.
+            camera_names (list): Cameras to export, defaults to the settings' cameras.
+
+        Returns:
+            list: ``ExportAsset`` per output file, cameras first.
+        """
+        assets = []
+        if camera_names is None:
+            camera_names = self.settings.camera_names
+        for camera in camera_names:
+            cam_filename = f"{shot_name}_cam.fbx" if len(camera_names) == 1 else f"{camera}_cam.fbx"
+            cam_output_path = os.path.join(export_dir, cam_filename).replace(os.sep, '/')
+            assets.append(ExportAsset("camera", camera, camera, cam_output_path, preset=self.settings.fbx_camera_preset))
+
+        index = self.get_asset_index()
+        namespaces = self.collect_namespaces(self.settings.character_names)
+        for character in self.settings.character_names:
+            char_namespaces = namespaces[character]
+            if not char_namespaces:
+                logger.warning(f"No namespace found for character {character}. Skipping...")
+            for idx, char_ns in enumerate(char_namespaces):
+                filename = f"{shot_name}_{character}_anim.fbx" if len(
+                    char_namespaces) == 1 else f"{shot_name}_{character}_{idx + 1}_anim.fbx"
+                output_path = os.path.join(export_dir, filename).replace(os.sep, '/')
+
+                # Select and export: prioritize ExportGrp > DeformationSystem
+                selection = index.fbx_selection(char_ns)
+                if not selection:
+                    logger.warning(
+                        f"No valid group found for character {character} in namespace {char_ns}. Skipping...")
+                    continue
+                assets.append(ExportAsset(
+                    "character", character, char_ns, output_path, nodes=selection, preset=self.settings.fbx_preset
+                ))
+        return assets
+
+    @traced("ExportJob.create_camera_proxy")
+    def create_camera_proxy(self, asset):
+        """
+        Creates the export camera for a camera asset, driven by the source camera's world matrix
+        and focal length.
+
+        Args:
+            asset (ExportAsset): A camera asset; its ``proxy``, ``nodes`` and ``temp_nodes`` are filled in.
+        """
+        camera = asset.source
+        cam_shapes = cm.listRelatives(camera, shapes=True)
+        new_cam = cm.camera()
+        self.temp_nodes.register(asset, new_cam[0])
+        mult_matrix_node = cm.createNode("multMatrix", name="cam_multMatrix")
+        self.temp_nodes.register(asset, mult_matrix_node)
+        decompose_matrix_node = cm.createNode("decomposeMatrix", name="cam_decomposeMatrix")
+        self.temp_nodes.register(asset, decompose_matrix_node)
+        cm.connectAttr(f"{camera}.worldMatrix[0]", f"{mult_matrix_node}.matrixIn[0]")
+        cm.connectAttr(f"{mult_matrix_node}.matrixSum", f"{decompose_matrix_node}.inputMatrix")
+        cm.connectAttr(f"{decompose_matrix_node}.outputTranslate", f"{new_cam[0]}.translate")
+        cm.connectAttr(f"{decompose_matrix_node}.outputRotate", f"{new_cam[0]}.rotate")
+
+        # Connect focal length
+        cm.connectAttr(f"{cam_shapes[0]}.focalLength", f"{new_cam[1]}.focalLength", force=True)
+
+        asset.proxy = new_cam
+        asset.nodes = [new_cam[0]]
+
+    @traced("ExportJob.create_sampled_camera")
+    def create_sampled_camera(self, asset, min_time, max_time):
+        """
+        Creates the export camera for a camera asset, keyed on every frame from API samples of the
+        source camera (keys start at frame 0, as after a bake).
+
+        Args:
+            asset (ExportAsset): A camera asset; its ``proxy``, ``nodes`` and ``temp_nodes`` are filled in.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+        """
+        samples = sample_camera(asset.source, min_time, max_time)
+        asset.camera_samples = samples
+        new_cam = cm.camera()
+        self.temp_nodes.register(asset, new_cam[0])
+        asset.proxy = new_cam
+        asset.nodes = [new_cam[0]]
+        self.temp_nodes.register(asset, *key_camera(new_cam[0], new_cam[1], samples, -min_time))
+
+    def prepare_camera(self, asset, min_time, max_time):
+        """
+        Creates a camera asset's export camera, sampled through the API when enabled, otherwise (or
+        if sampling fails) driven by a matrix network that still has to be baked.
+
+        Returns:
+            bool: True if the export camera is already keyed.
+        """
+        if self.settings.sample_cameras:
+            start = time.perf_counter()
+            try:
+                self.create_sampled_camera(asset, min_time, max_time)
+                self.record_timing([asset], "bake", time.perf_counter() - start)
+                return True
+            except Exception as e:
+                logger.warning(f"Couldn't sample camera {asset.source} through the API, baking it instead: {e}")
+                self.cleanup_asset(asset)
+        self.create_camera_proxy(asset)
+        return False
+
+    @staticmethod
+    def camera_data_path(asset):
+        """
+        Returns:
+            str: The Unreal camera table of a camera asset, next to its FBX file.
+        """
+        return os.path.splitext(asset.output_path)[0] + ".camera.json"
+
+    @traced("ExportJob.write_camera_data")
+    def write_camera_data(self, asset, min_time, max_time):
+        """
+        Writes a camera asset's per-frame table for Unreal, sampling the source camera if that
+        wasn't done for the FBX file. Failures are reported without failing the FBX file.
+
+        Args:
+            asset (ExportAsset): A camera asset.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+        """
+        start = time.perf_counter()
+        path = self.camera_data_path(asset)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            samples = asset.camera_samples or sample_camera(asset.source, min_time, max_time)
+            data = unreal_camera_data(samples, -min_time, scene_frame_rate())
+            data["camera"] = asset.source
+            with open(temp_path, "w") as data_file:
+                json.dump(data, data_file, separators=(",", ":"))
+            os.replace(temp_path, path)
+            logger.info(f"Exported camera data of {asset.source} to {path}")
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.report_error(f"Error writing Unreal camera data for '{asset.source}'", e)
+            return
+        finally:
+            self.record_timing([asset], "write", time.perf_counter() - start)
+
+        if self.manifest is not None:
+            self.manifest.asset_entry(asset)["camera_data"] = path
+        if self.packager is not None:
+            self.packager.add(path)
+
+    def cleanup_asset(self, asset):
+        """
+        Deletes the temporary nodes created for an asset.
+        """
+        self.temp_nodes.release(asset)
+
+    @traced("ExportJob.export_camera")
+    def export_camera(self, asset, min_time, max_time):
+        """
+        Bakes and exports a single camera to its FBX file.
+
+        Args:
+            asset (ExportAsset): The camera asset.
+            min_time (int): Start frame to bake animations.
+            max_time (int): End frame to bake animations.
+
+        """
+        try:
+            sampled = self.prepare_camera(asset, min_time, max_time)
+
+            # Bake animation for translation, rotation, and focal length
+            if not sampled:
+                start = time.perf_counter()
+                self.bake_camera_animation(asset.proxy, min_time, max_time)
+                self.record_timing([asset], "bake", time.perf_counter() - start)
+
+            # Export FBX; sampled cameras are keyed on every frame already
+            start = time.perf_counter()
+            self.asset_started(asset)
+            cm.select(asset.nodes)
+            self.fbx_export_option(asset.write_path, min_time, max_time, asset.preset, False if sampled else None)
+            self.record_timing([asset], "write", time.perf_counter() - start)
+            logger.info(f"Exported camera {asset.source} to {asset.output_path}")
+            self.asset_written(asset, max_time - min_time + 1 if not sampled and self.settings.bake else None)
+            if self.settings.unreal_camera_data:
+                self.write_camera_data(asset, min_time, max_time)
+
+        except Exception as e:
+            self.report_error(f"Error exporting camera '{asset.source}'", e, asset)
+        finally:
+            # Clean up: delete temporary camera and nodes
+            self.cleanup_asset(asset)
+
+    @traced("ExportJob.bake_camera_animation")
+    def bake_camera_animation(self, new_cam, min_time, max_time):
+        """
+        Bakes animation for the camera's position and focal length.
+
+        Args:
+            new_cam (list): The new camera created for baking.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+
+        """
+        try:
+            # Bake translation and rotation data
+            cm.select(new_cam[0])
+            self.execute_mel_command(
+                f'bakeResults -simulation true -t "{min_time}:{max_time}" -sampleBy 1 -oversamplingRate 1 '
+                f'-disableImplicitControl true -preserveOutsideKeys true -sparseAnimCurveBake false '
+                f'-removeBakedAttributeFromLayer false -removeBakedAnimFromLayer false -bakeOnOverrideLayer false '
+                f'-minimizeRotation true -controlPoints false -shape false;'
+            )
+
+            # Bake focal length data
+            cm.select(f"{new_cam[1]}.focalLength")
+            self.execute_mel_command(
+                f'bakeResults -simulation true -t "{min_time}:{max_time}" -sampleBy 1 -oversamplingRate 1 '
+                f'-disableImplicitControl true -preserveOutsideKeys true -sparseAnimCurveBake false '
+                f'-removeBakedAttributeFromLayer false -removeBakedAnimFromLayer false -bakeOnOverrideLayer false '
+                f'-minimizeRotation true -controlPoints false -shape true;'
+            )
+
+            # Shift animation keys to start from frame 0
+            cm.keyframe(new_cam[0], edit=True, relative=True, timeChange=-min_time)
+        except Exception as e:
+            logger.error(f"Failed to bake camera animation: {e}")
+            raise
+
+    @staticmethod
+    def character_bake_targets(nodes):
+        """
+        Everything the FBX plug-in would bake for a character: the exported groups, their joints
+        and the blend shape weights deforming their meshes.
+
+        Args:
+            nodes (list): The character's export selection.
+
+        Returns:
+            list: Nodes and attributes to bake.
+        """
+        targets = list(nodes)
+        targets += cm.listRelatives(nodes, allDescendents=True, type="joint", fullPath=True) or []
+
+        meshes = cm.listRelatives(nodes, allDescendents=True, type="mesh", fullPath=True) or []
+        if meshes:
+            for blend_shape in cm.ls(cm.listHistory(meshes, pruneDagObjects=True) or [], type="blendShape"):
+                weights = cm.listAttr(f"{blend_shape}.weight", multi=True) or []
+                targets += [f"{blend_shape}.{weight}" for weight in weights]
+        return targets
+
+    @staticmethod
+    def detach_implicit_control(nodes):
+        """
+        Connects baked curves straight to their attributes.
+
+        Baking constrained channels leaves a pairBlend between the new curve and the attribute, which
+        the FBX plug-in only sees through its own bake. Bypassing the pairBlend lets the files be
+        written with baking turned off.
+
+        Args:
+            nodes (list): Baked nodes.
+        """
+        # node.translateX <- pairBlend.outTranslateX, for all nodes in one query
+        connections = cm.listConnections(
+            nodes, source=True, destination=False, type="pairBlend", plugs=True, connections=True
+        ) or []
+        # pairBlend.outTranslateX -> inTranslateX1: input 1 holds the keys, input 2 the constraint
+        destinations = {}
+        for destination, out_plug in zip(connections[::2], connections[1::2]):
+            pair_blend, _, out_attr = out_plug.partition(".")
+            destinations.setdefault(f"{pair_blend}.in{out_attr[len('out'):]}1", []).append(destination)
+        if not destinations:
+            return
+
+        inputs = cm.listConnections(
+            list(destinations), source=True, destination=False, plugs=True, connections=True
+        ) or []
+        for in_plug, curve in zip(inputs[::2], inputs[1::2]):
+            for destination in destinations.get(in_plug, []):
+                cm.connectAttr(curve, destination, force=True)
+
+    @traced("ExportJob.bake_assets")
+    def bake_assets(self, assets, min_time, max_time):
+        """
+        Bakes every camera proxy and character of the shot in a single timeline sweep.
+
+        Args:
+            assets (list): ``ExportAsset``s to bake; camera proxies must already exist.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+        """
+        targets = []
+        character_nodes = []
+        asset_targets = []
+        for asset in assets:
+            if asset.kind == "camera":
+                baked = [asset.proxy[0], f"{asset.proxy[1]}.focalLength"]
+            else:
+                baked = self.character_bake_targets(asset.nodes)
+                character_nodes += [target for target in baked if "." not in target]
+            asset.bake_targets = baked
+            targets += baked
+            asset_targets.append((asset, baked))
+        if not targets:
+            return
+
+        logger.info(f"Baking {len(assets)} assets ({len(targets)} nodes/attributes) from {min_time} to {max_time}")
+        start = time.perf_counter()
+        cm.bakeResults(
+            targets, simulation=True, time=(min_time, max_time), sampleBy=1, oversamplingRate=1,
+            disableImplicitControl=True, preserveOutsideKeys=True, sparseAnimCurveBake=False,
+            removeBakedAttributeFromLayer=False, removeBakedAnimFromLayer=False, bakeOnOverrideLayer=False,
+            minimizeRotation=True, controlPoints=False, shape=False
+        )
+        self.record_timing(assets, "bake", time.perf_counter() - start)
+
+        # Shift camera keys to start from frame 0, as the single camera export does; sequencer shot
+        # cameras are shifted when their shot is sliced
+        camera_channels = []
+        for asset in assets:
+            if asset.kind == "camera" and not asset.frame_range:
+                camera_channels += [asset.proxy[0], f"{asset.proxy[1]}.focalLength"]
+        if camera_channels:
+            cm.keyframe(camera_channels, edit=True, relative=True, timeChange=-min_time)
+
+        if character_nodes:
+            self.detach_implicit_control(character_nodes)
+
+        if self.settings.reduce_keys:
+            self.reduce_keys(asset_targets)
+
+    @traced("ExportJob.reduce_keys")
+    def reduce_keys(self, asset_targets):
+        """
+        Thins out freshly baked curves: static channels are deleted and the remaining curves are
+        simplified within the settings' translate/rotate tolerances. The deletes and filters run
+        once for all assets; key counts before and after are logged and added to the manifest.
+
+        Args:
+            asset_targets (list): (ExportAsset, baked nodes/attributes) pairs from ``bake_assets``.
+        """
+        start = time.perf_counter()
+        asset_curves = []
+        for asset, targets in asset_targets:
+            curves = sorted(set(
+                cm.listConnections(targets, source=True, destination=False, type="animCurve") or []
+            ))
+            keys_before = cm.keyframe(curves, query=True, keyframeCount=True) if curves else 0
+            asset_curves.append((asset, curves, keys_before))
+
+        all_curves = [curve for _, curves, _ in asset_curves for curve in curves]
+        if not all_curves:
+            return
+        baked_nodes = sorted({target.split(".")[0] for _, targets in asset_targets for target in targets})
+        cm.delete(baked_nodes, staticChannels=True)
+
+        remaining = set(cm.ls(all_curves) or [])
+        rotate_curves = cm.ls(list(remaining), type="animCurveTA") or []
+        other_curves = sorted(remaining.difference(rotate_curves))
+        if rotate_curves:
+            cm.filterCurve(rotate_curves, filter="simplify", tolerance=self.settings.rotate_tolerance)
+        if other_curves:
+            cm.filterCurve(other_curves, filter="simplify", tolerance=self.settings.translate_tolerance)
+
+        for asset, curves, keys_before in asset_curves:
+            kept = [curve for curve in curves if curve in remaining]
+            keys_after = cm.keyframe(kept, query=True, keyframeCount=True) if kept else 0
+            logger.info(
+                f"Reduced {asset.kind} {asset.source}: {keys_before} -> {keys_after} keys, "
+                f"{len(curves) - len(kept)} static channels removed"
+            )
+            if self.manifest is not None:
+                self.manifest.set_key_counts(asset, keys_before, keys_after)
+        self.record_timing([asset for asset, _ in asset_targets], "bake", time.perf_counter() - start)
+
+    @traced("ExportJob.write_fbx_asset")
+    def write_fbx_asset(self, asset, min_time, max_time, bake=None, scene_range=None):
+        """
+        Selects an asset and writes its FBX file.
+
+        Args:
+            asset (ExportAsset): The asset to write.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+            bake (bool): Let the FBX plug-in bake, defaults to the settings' bake.
+            scene_range (tuple): The asset's (start, end) in scene time when its keys were moved
+                to frame 0, for the camera data; defaults to (min_time, max_time).
+        """
+        start = time.perf_counter()
+        try:
+            self.asset_started(asset)
+            cm.select(asset.nodes)
+            self.fbx_export_option(asset.write_path, min_time, max_time, asset.preset, bake)
+            logger.info(f"Exported {asset.kind} {asset.source} to {asset.output_path}")
+            # The take only spans the range when the FBX plug-in bakes it
+            baked = self.settings.bake if bake is None else bake
+            self.asset_written(asset, max_time - min_time + 1 if baked else None)
+        except Exception as e:
+            self.report_error(f"Error exporting {asset.kind} '{asset.source}'", e, asset)
+            return
+        finally:
+            self.record_timing([asset], "write", time.perf_counter() - start)
+
+        if asset.kind == "camera" and self.settings.unreal_camera_data:
+            self.write_camera_data(asset, *(scene_range or (min_time, max_time)))
+
+    @traced("ExportJob.collect_namespaces")
+    def collect_namespaces(self, character_names):
+        """
+        Collects namespaces for the specified characters.
+
+        Args:
+            character_names (list): List of characters to look up namespaces.
+
+        Returns:
+            dict: {character: [namespaces]} for characters with an FBX export group.
+
+        """
+        index = self.get_asset_index()
+        return {character: index.namespaces_for(character, FBX_CHARACTER_GROUPS) for character in character_names}
+
+    @traced("ExportJob.export_characters")
+    def export_characters(self, assets, min_time, max_time):
+        """
+        Exports the character assets one by one, letting the FBX plug-in bake each of them.
+        Yields after each file.
+
+        Args:
+            assets (list): Character ``ExportAsset``s.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+
+        """
+        for asset in assets:
+            self.write_fbx_asset(asset, min_time, max_time)
+            yield self.step_done("write", f"Exported {asset.kind} {asset.source}", asset)
+
+    @traced("ExportJob.export_fbx_batch")
+    def export_fbx_batch(self, assets, min_time, max_time):
+        """
+        Bakes all cameras and characters in one timeline sweep, then writes every file with the FBX
+        plug-in's bake turned off. Yields after the bake and after each file.
+
+        When ``restore_scene`` is set, the bake runs inside an undo chunk that is undone afterwards so
+        the animator's rigs keep their constraints. If undo is disabled the scene can't be restored,
+        so characters are left to the FBX plug-in's own bake. Temporary nodes are removed and the
+        chunk undone even if the steps are abandoned half way.
+
+        Sequencer shots are all baked over the union of their ranges and written one by one inside
+        ``shot_slice``; the bake chunk is then closed before the first slice, so each slice can be
+        undone on its own, and undone at the end.
+
+        Args:
+            assets (list): ``ExportAsset``s from ``plan_fbx_assets``.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+        """
+        restore = self.settings.restore_scene
+        undo_enabled = cm.undoInfo(query=True, state=True)
+        sequencer = any(asset.frame_range for asset in assets)
+        if sequencer and not undo_enabled:
+            raise RuntimeError("Sequencer export needs undo enabled to cut the shots out of the bake")
+        bake_characters = self.settings.bake and (undo_enabled or not restore)
+        if not bake_characters and self.settings.bake:
+            logger.warning("Undo is disabled; characters will be baked by the FBX plug-in to keep the scene intact.")
+
+        bake_chunk = restore and undo_enabled
+        bake_chunk_closed = False
+        if bake_chunk:
+            cm.undoInfo(openChunk=True, chunkName="ExportTool batch bake")
+            self.undo_chunk_open = True
+        try:
+            cameras = []
+            unsampled_cameras = []
+            for asset in assets:
+                if asset.kind != "camera":
+                    continue
+                try:
+                    if not self.prepare_camera(asset, *self.asset_range(asset, min_time, max_time)):
+                        unsampled_cameras.append(asset)
+                    cameras.append(asset)
+                except Exception as e:
+                    self.report_error(f"Error exporting camera '{asset.source}'", e, asset)
+                    self.cleanup_asset(asset)
+
+            characters = [asset for asset in assets if asset.kind == "character"]
+            baked = unsampled_cameras + (characters if bake_characters else [])
+            self.bake_assets(baked, min_time, max_time)
+            if bake_chunk and sequencer:
+                cm.undoInfo(closeChunk=True)
+                bake_chunk_closed = True
+            yield self.step_done("bake", f"Baked {len(baked)} assets")
+
+            for asset in cameras:
+                with self.shot_slice(asset, min_time, max_time) as (start, end):
+                    self.write_fbx_asset(
+                        asset, start, end, bake=False, scene_range=self.asset_range(asset, min_time, max_time)
+                    )
+                yield self.step_done("write", f"Exported camera {asset.source}", asset)
+            for asset in characters:
+                with self.shot_slice(asset, min_time, max_time) as (start, end):
+                    self.write_fbx_asset(asset, start, end, bake=self.settings.bake and not bake_characters)
+                yield self.step_done("write", f"Exported character {asset.source}", asset)
+        finally:
+            if bake_chunk_closed:
+                # Undoes the bake and the temporary nodes created with it
+                cm.undo()
+            for asset in assets:
+                self.cleanup_asset(asset)
+            if bake_chunk and not bake_chunk_closed:
+                cm.undoInfo(closeChunk=True)
+                cm.undo()
+            self.undo_chunk_open = False
+
+    @traced("ExportJob.fbx_export_steps")
+    def fbx_export_steps(self):
+        """
+        FBX export as a sequence of steps (discover, bake, write per asset); yields an
+        ``ExportProgress`` after each step.
+        """
+        try:
+            export_dir = self.prepare_export_dir()
+            if not export_dir:
+                logger.error("File path or shot name is not provided.")
+                return
+
+            _, assets, (min_time, max_time) = self.plan_run_assets(export_dir, self.plan_fbx_assets)
+            self.stage_assets(assets)
+            if self.settings.batch_bake and assets:
+                self.steps_total += 1
+            self.steps_total += len(assets)
+            yield self.step_done("discover", f"Found {len(assets)} FBX assets to export")
+            if not assets:
+                logger.info("All FBX assets are up to date.")
+                return
+
+            if self.settings.batch_bake:
+                yield from self.export_fbx_batch(assets, min_time, max_time)
+                return
+
+            # Handle camera export
+            for asset in assets:
+                if asset.kind == "camera":
+                    self.export_camera(asset, min_time, max_time)
+                    yield self.step_done("write", f"Exported camera {asset.source}", asset)
+
+            # Handle character export
+            yield from self.export_characters(
+                [asset for asset in assets if asset.kind == "character"], min_time, max_time
+            )
+
+        except RuntimeError as e:
+            self.report_error("FBX export failed", e)
+        except Exception as e:
+            self.report_error("Unexpected error during FBX export", e)
+        finally:
+            self.save_cache()
+
+    def fbx_export(self):
+        """
+        Handles the FBX export process for selected characters, cameras, and namespaces.
+        Exports animation, baked data, or entire scenes into the specified directory.
+
+        Requirements:
+            - The target directory must exist and be writable.
+            - Object names should be properly formatted and namespaces correctly set up.
+
+        """
+        self.run("fbx")
+
+    @traced("ExportJob.plan_abc_assets")
+    def plan_abc_assets(self, export_dir, shot_name):
+        """
+        Lists every Alembic file of the shot, one per character namespace with an ABCExport group.
+
+        Args:
+            export_dir (str): The output directory for Alembic files.
+            shot_name (str): The shot name to use in filenames.
+
+        Returns:
+            list: ``ExportAsset`` per output file.
+        """
+        index = self.get_asset_index()
+        assets = []
+        for char_name in self.settings.abc_names:
+            char_namespaces = index.namespaces_for(char_name, ABC_GROUPS)
+            for idx, namespace in enumerate(char_namespaces):
+                # Prepare file name and path
+                file_name = f"{shot_name}_{char_name}_anim.abc" if len(
+                    char_namespaces) == 1 else f"{shot_name}_{char_name}_{idx + 1}_anim.abc"
+                file_path = os.path.join(export_dir, file_name).replace(os.sep, '/')
+                assets.append(ExportAsset("abc", char_name, namespace, file_path, nodes=[index.abc_root(namespace)]))
+        return assets
+
+    @staticmethod
+    def abc_job_string(asset, min_time, max_time, file_path=None):
+        """
+        Builds the AbcExport job for one asset.
+
+        Args:
+            asset (ExportAsset): The Alembic asset.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+            file_path (str): File to write, defaults to the asset's write path.
+
+        Returns:
+            str: The ``-j`` argument.
+        """
+        root = f"-root {asset.nodes[0]}"
+        return f"-frameRange {min_time} {max_time} {ABC_JOB_FLAGS} {root} -file {file_path or asset.write_path}"
+
+    @traced("ExportJob.write_abc_assets")
+    def write_abc_assets(self, assets, min_time, max_time):
+        """
+        Writes all Alembic assets with a single AbcExport call, which evaluates the timeline once for
+        every job. If the combined call fails, each asset is retried on its own so one broken rig
+        doesn't cost the others their files.
+
+        Args:
+            assets (list): Alembic ``ExportAsset``s.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+        """
+        # Sequencer shots are separate jobs of the same call, so the timeline is still evaluated once.
+        # They stay in scene time: AbcExport has no time offset, and re-basing the caches would
+        # mean shifting the rigs' animation before the write
+        jobs = [self.abc_job_string(asset, *self.asset_range(asset, min_time, max_time)) for asset in assets]
+        for asset in assets:
+            self.asset_started(asset)
+        start = time.perf_counter()
+        try:
+            cm.AbcExport(j=jobs)
+            self.record_timing(assets, "write", time.perf_counter() - start)
+            for asset in assets:
+                logger.info(f"Exported Alembic file: {asset.output_path}")
+                self.asset_written(asset, *self.abc_expected_frames(asset, min_time, max_time))
+            return
+        except RuntimeError as e:
+            self.record_timing(assets, "write", time.perf_counter() - start)
+            if len(assets) == 1:
+                self.report_error(f"Error exporting Alembic for '{assets[0].source}'", e, assets[0])
+                return
+            logger.warning(f"Combined Alembic export failed ({e}), exporting characters one by one")
+
+        for asset, job in zip(assets, jobs):
+            start = time.perf_counter()
+            try:
+                cm.AbcExport(j=job)
+                logger.info(f"Exported Alembic file: {asset.output_path}")
+                self.asset_written(asset, *self.abc_expected_frames(asset, min_time, max_time))
+            except RuntimeError as e:
+                self.report_error(f"Error exporting Alembic for '{asset.source}'", e, asset)
+            finally:
+                self.record_timing([asset], "write", time.perf_counter() - start)
+
+    def abc_expected_frames(self, asset, min_time, max_time):
+        """
+        Returns:
+            tuple: (frame count, first frame) an asset's Alembic file is written with, in scene
+                time: a sequencer shot's cache starts at the shot's first frame, not at frame 0 like
+                its FBX files.
+        """
+        start, end = self.asset_range(asset, min_time, max_time)
+        return end - start + 1, start
+
+    @traced("ExportJob.abc_export_steps")
+    def abc_export_steps(self):
+        """
+        Alembic export as a sequence of steps (discover, write all); yields an ``ExportProgress``
+        after each step.
+        """
+        try:
+            export_dir = self.prepare_export_dir()
+            if not export_dir:
+                logger.error("Export directory or shot name is invalid.")
+                return
+
+            planned, assets, (min_time, max_time) = self.plan_run_assets(
+                export_dir, lambda shot_dir, shot_name, _: self.plan_abc_assets(shot_dir, shot_name),
+                f"AbcExport {ABC_JOB_FLAGS}"
+            )
+
+            if not planned:
+                # Handle empty namespace list
+                logger.warning("No valid namespaces found for the specified characters.")
+                oMaya.MGlobal.displayWarning("No valid Alembic export groups found for the specified character names.")
+                yield self.step_done("discover", "No Alembic assets found")
+                return
+
+            self.stage_assets(assets)
+            if assets:
+                self.steps_total += 1
+            yield self.step_done("discover", f"Found {len(assets)} Alembic assets to export")
+
+            if assets:
+                self.write_abc_assets(assets, min_time, max_time)
+                yield self.step_done("write", f"Exported {len(assets)} Alembic files", assets=assets)
+            else:
+                logger.info("All Alembic assets are up to date.")
+            oMaya.MGlobal.displayInfo("Alembic export completed.")
+
+        except RuntimeError as e:
+            self.report_error("Alembic export failed", e)
+        except Exception as e:
+            self.report_error("Unexpected error during Alembic export", e)
+        finally:
+            self.save_cache()
+
+    def abc_export(self):
+        """
+        Exports Alembic (.abc) files for the characters based on selected Alembic export groups and
+        the provided input settings (time range, character names, and shot name).
+
+        The exported files are saved in the shot directory under the settings' file path.
+        """
+        self.run("abc")
+
+    def export_all_steps(self):
+        """
+        Combines the FBX and Alembic export processes.
+
+        Both exports run sequentially; an error in one does not prevent the other from running.
+        """
+        logger.info("Starting the export process for all elements.")
+
+        logger.info("Starting FBX export...")
+        yield from self.fbx_export_steps()
+        logger.info("FBX export finished.")
+
+        logger.info("Starting Alembic export...")
+        yield from self.abc_export_steps()
+        logger.info("Alembic export finished.")
+
+        oMaya.MGlobal.displayInfo("Export All process completed.")
+
+    def export_all(self):
+        self.run("all")
+
+    def step_done(self, stage, message, asset=None, assets=None):
+        """
+        Counts a finished step and records the process memory before and after it on the assets
+        it was about.
+
+        Args:
+            stage (str): "discover", "bake" or "write".
+            message (str): Status for the user.
+            asset (ExportAsset): The asset the step was about, if any.
+            assets (list): The assets of a step written for several assets at once.
+
+        Returns:
+            ExportProgress: Progress after this step.
+        """
+        self.steps_done += 1
+        memory_mb = get_process_memory_mb()
+        # Uploads and checks run in the background, the memory belongs to the asset's write
+        if self.manifest is not None and stage not in ("verify", "upload"):
+            for step_asset in assets or ([asset] if asset is not None else []):
+                self.manifest.set_memory(step_asset, self.memory_mb, memory_mb)
+        self.memory_mb = memory_mb
+        return ExportProgress(stage, message, self.steps_done, max(self.steps_total, self.steps_done), asset)
+
+    def end_step(self, progress):
+        """
+        Housekeeping between steps of a long session: after written assets, flushes the undo queue
+        (unless the batch bake's undo chunk is still open) and checks the memory ceiling. Checking
+        only after writes means a run continued on a fresh process always gets further.
+
+        Args:
+            progress (ExportProgress): The finished step.
+
+        Raises:
+            MemoryCeilingExceeded: The process uses more than ``memory_limit_mb``.
+        """
+        if progress.stage != "write":
+            return
+        if self.settings.flush_undo and not self.undo_chunk_open:
+            cm.flushUndo()
+        limit = self.settings.memory_limit_mb
+        if limit and self.memory_mb and self.memory_mb > limit:
+            raise MemoryCeilingExceeded(
+                f"Process memory {self.memory_mb:.0f} MB is above the {limit:.0f} MB limit "
+                f"after {self.steps_done}/{self.steps_total} steps"
+            )
+
+    def iter_steps(self, mode="all"):
+        """
+        Runs an export mode step by step, so a caller (the UI's event loop) can report progress and
+        stop between assets. Closing the generator cancels the export; temporary nodes are still
+        cleaned up and the scene restored.
+
+        Args:
+            mode (str): "fbx", "abc" or "all".
+
+        Yields:
+            ExportProgress: Progress after each discover, bake, write or upload step.
+        """
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown export mode '{mode}', expected one of {EXPORT_MODES}")
+
+        self.failures = []
+        self.asset_index = None
+        self.caches = {}
+        self.journals = {}
+        self.cache_hits = []
+        self.steps_done = 0
+        self.temp_nodes = TempNodeRegistry()
+        self.undo_chunk_open = False
+        self.memory_mb = get_process_memory_mb()
+        self.memory_exceeded = False
+        # One discovery step per part; planning adds the bake and write steps
+        self.steps_total = 2 if mode == "all" else 1
+        self.manifest = ExportManifest(
+            self.settings, mode, cm.file(query=True, sceneName=True), cm.about(version=True)
+        )
+
+        self.uploader = self.create_uploader()
+        self.verifier = self.create_verifier()
+        self.packager = self.create_packager()
+
+        tracer = None
+        if self.settings.profile:
+            tracer = Tracer(f"Export {self.settings.shot_name} ({mode})", self.settings.profile_python).start()
+
+        status = "completed"
+        try:
+            with ExitStack() as stack:
+                if tracer is not None:
+                    stack.enter_context(tracer.span(f"export {mode}", shot=self.settings.shot_name))
+                if self.settings.fast_bake:
+                    # A restorable batch bake is undone afterwards and sequencer shots are cut out of
+                    # the bake with undo, so both need undo recording
+                    keep_undo = (self.settings.restore_scene and self.settings.batch_bake) or self.settings.sequencer
+                    stack.enter_context(fast_bake_context(keep_undo))
+                steps = self.mode_steps(mode)
+                # Closing the steps runs their cleanup (temporary nodes, undoing the bake) first
+                stack.callback(steps.close)
+                for progress in steps:
+                    yield progress
+                    # Publish checks and uploads that finished while the asset was exported
+                    yield from self.verify_steps(wait=False)
+                    yield from self.upload_steps(wait=False)
+                    self.end_step(progress)
+                yield from self.verify_steps()
+                yield from self.upload_steps()
+        except GeneratorExit:
+            status = "cancelled"
+            raise
+        except MemoryCeilingExceeded as e:
+            status = "aborted"
+            self.memory_exceeded = True
+            self.report_error("Export stopped", e)
+        finally:
+            leaked = self.temp_nodes.release_all()
+            if leaked:
+                logger.warning(f"Deleted {leaked} temporary nodes left over by the export")
+            if self.settings.flush_undo and status != "cancelled":
+                cm.flushUndo()
+            if self.verifier is not None:
+                if status == "cancelled":
+                    self.verifier.cancel()
+                for _ in self.verify_steps():
+                    pass
+                self.verifier.close()
+            if self.uploader is not None:
+                if status == "cancelled":
+                    self.uploader.cancel()
+                for _ in self.upload_steps():
+                    pass
+                self.uploader.close()
+            if self.uploader is not None or self.verifier is not None:
+                self.save_cache()
+            self.close_journals()
+            if self.packager is not None:
+                self.finish_package(keep=status != "cancelled")
+            if status == "completed" and self.failures:
+                status = "failed"
+            self.write_manifest(status)
+            if tracer is not None:
+                tracer.stop()
+                self.write_profile(tracer, mode)
+
+    def create_uploader(self):
+        """
+        Returns:
+            StagingUploader: The uploader for the shot's staging directory, or None when not staging.
+        """
+        if not self.settings.staging_dir:
+            return None
+        staging_dir = os.path.join(self.settings.staging_dir, self.settings.shot_name).replace(os.sep, '/')
+        try:
+            return StagingUploader(staging_dir, self.settings.upload_workers)
+        except OSError as e:
+            logger.warning(f"Can't use staging directory {staging_dir}, writing to the shot directory: {e}")
+            return None
+
+    def create_verifier(self):
+        """
+        Returns:
+            OutputVerifier: The checker of written files, or None when verification is off.
+        """
+        if not self.settings.verify_outputs:
+            return None
+        self.frame_rate = scene_frame_rate()
+        return OutputVerifier()
+
+    def create_packager(self):
+        """
+        Returns:
+            ShotPackager: The packager of the shot's archive, or None when not packaging.
+        """
+        if not self.settings.package or self.settings.package not in PACKAGE_FORMATS:
+            return None
+        package_format = resolve_format(self.settings.package)
+        return ShotPackager(
+            package_path(self.settings.file_path, self.settings.shot_name, package_format), package_format
+        )
+
+    def finish_package(self, keep=True):
+        """
+        Completes the shot package once every file has been added.
+
+        Args:
+            keep (bool): False discards the archive, for cancelled exports.
+        """
+        for error in self.packager.close(keep):
+            self.report_error("Packaging failed", error)
+        if keep and self.manifest is not None and os.path.isfile(self.packager.archive_path):
+            self.manifest.package = self.packager.archive_path
+
+    def mode_steps(self, mode):
+        """
+        Returns:
+            generator: The steps of one export mode, see ``iter_steps``.
+        """
+        if mode == "fbx":
+            return self.fbx_export_steps()
+        if mode == "abc":
+            return self.abc_export_steps()
+        return self.export_all_steps()
+
+    def write_manifest(self, status):
+        """
+        Writes the run's manifest into the shot export directory, if there is one.
+
+        Args:
+            status (str): "completed", "failed", "cancelled" or "aborted" (memory ceiling).
+        """
+        if not self.settings.write_manifest or self.manifest is None:
+            return
+        export_dir = self.settings.export_dir
+        if os.path.isdir(export_dir):
+            self.manifest.write(export_dir, self.failures, status)
+
+    def write_profile(self, tracer, mode):
+        """
+        Writes a run's trace into ``<shot export dir>/.export_profiles``, next to the manifests.
+
+        Args:
+            tracer (ExportProfiler.Tracer): The run's stopped tracer.
+            mode (str): "fbx", "abc" or "all".
+        """
+        export_dir = self.settings.export_dir
+        if not os.path.isdir(export_dir):
+            return
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        trace_path = os.path.join(
+            export_dir, PROFILE_DIR_NAME, f"{self.settings.shot_name}_{stamp}_{mode}.trace.json"
+        ).replace(os.sep, '/')
+        tracer.write(trace_path)
+
+    def run(self, mode="all"):
+        """
+        Runs one of the export modes.
+
+        Args:
+            mode (str): "fbx", "abc" or "all".
+
+        Returns:
+            bool: True if nothing failed.
+        """
+        for _ in self.iter_steps(mode):
+            pass
+        return not self.failures
@@ -0,0 +1,449 @@
+"""
+Watch-folder daemon that re-exports shot scenes as they are published.
+
+Publish directories are watched with inotify on Linux (polling elsewhere, or with ``--poll`` for
+network shares, whose changes made on other hosts inotify doesn't see). A burst of saves to a
+scene is debounced into one export, and only scenes whose file changed since their last export are
+queued; the export cache then skips the assets whose inputs didn't change. Exports run headless on
+a ``WorkerPool`` of warm mayapy workers, through the same ``ExportJob`` as the tool.
+
+A mass re-publish can't fork a Maya per scene: at most ``--workers`` exports run at once, at most
+``--max-queue`` more wait in the queue, and further changes stay coalesced (one entry per scene)
+until the queue has room again.
+
+    python ExportDaemon.py daemon.json --workers 2 --max-queue 50
+
+where ``daemon.json`` lists the watched directories:
+
+    {"watch": [{"path": "/publish/shots", "pattern": "*.ma", "mode": "all",
+                "settings": {"file_path": "/export", "shot_name": "{scene}", "character_names": ["Bob"]}}]}
+
+``shot_name`` may use ``{scene}`` (scene file name without extension) and ``{dir}`` (name of the
+scene's directory). The daemon keeps the signature of every exported scene in a state file, so
+after a restart it only exports scenes changed in the meantime.
+"""
+import os
+import sys
+import json
+import time
+import errno
+import fnmatch
+import select
+import signal
+import struct
+import logging
+import argparse
+import collections
+from dataclasses import dataclass, field
+
+from ExportWorker import BatchJob, WorkerPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_SECONDS = 10.0
+DEFAULT_POLL_SECONDS = 5.0
+DEFAULT_MAX_QUEUE = 50
+DEFAULT_PATTERNS = ("*.ma", "*.mb")
+STATE_FILE_NAME = ".export_daemon_state.json"
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+@dataclass
+class WatchConfig:
+    """
+    One watched publish directory.
+
+    Attributes:
+        path (str): Directory watched, with its subdirectories.
+        settings (dict): ``ExportSettings`` fields of the exports; ``shot_name`` is a template.
+        mode (str): "fbx", "abc" or "all".
+        pattern (list): File name patterns of the scenes to export.
+    """
+    path: str
+    settings: dict = field(default_factory=dict)
+    mode: str = "all"
+    pattern: list = field(default_factory=lambda: list(DEFAULT_PATTERNS))
+
+    def __post_init__(self):
+        if isinstance(self.pattern, str):
+            self.pattern = [self.pattern]
+        self.path = os.path.abspath(self.path)
+
+    def matches(self, path):
+        return (
+            os.path.abspath(path).startswith(self.path + os.sep)
+            and any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in self.pattern)
+        )
+
+    def job(self, scene):
+        """
+        Returns:
+            BatchJob: The export of a scene of this directory.
+        """
+        settings = dict(self.settings)
+        settings["shot_name"] = settings.get("shot_name", "{scene}").format(
+            scene=os.path.splitext(os.path.basename(scene))[0],
+            dir=os.path.basename(os.path.dirname(scene)),
+        )
+        return BatchJob(scene=scene, settings=settings, mode=self.mode)
+
+
+def load_config(config_path):
+    with open(config_path) as config_file:
+        return [WatchConfig(**entry) for entry in json.load(config_file)["watch"]]
+
+
+def scene_signature(path):
+    """
+    Returns:
+        list: [mtime, size] of a file, None if it is gone.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime, stat.st_size]
+
+
+def scan_files(root):
+    """
+    Yields:
+        str: Every file below a directory.
+    """
+    for directory, _, names in os.walk(root):
+        for name in names:
+            yield os.path.join(directory, name)
+
+
+class PollingWatcher(object):
+    """
+    Finds changed files by comparing signatures every ``interval`` seconds. Works everywhere,
+    including network shares.
+    """
+
+    def __init__(self, roots, interval=DEFAULT_POLL_SECONDS):
+        self.roots = roots
+        self.interval = interval
+        self.last_scan = 0.0
+        self.snapshot = self.scan()
+
+    def scan(self):
+        return {path: scene_signature(path) for root in self.roots for path in scan_files(root)}
+
+    def poll(self, timeout):
+        """
+        Returns:
+            list: Files created or modified since the last scan.
+        """
+        wait = self.last_scan + self.interval - time.time()
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if self.last_scan + self.interval > time.time():
+                return []
+        self.last_scan = time.time()
+        snapshot = self.scan()
+        changed = [path for path, signature in snapshot.items() if self.snapshot.get(path) != signature]
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(object):
+    """
+    Linux inotify through ctypes, watching every directory below the roots. New directories are
+    added as they appear; if the kernel queue overflows, the roots are rescanned.
+    """
+
+    def __init__(self, roots):
+        import ctypes
+        import ctypes.util
+
+        self.roots = roots
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, root):
+        """
+        Watches a directory and its subdirectories.
+
+        Returns:
+            list: Files already in them, which may have been written before the watch was added.
+        """
+        import ctypes
+
+        files = []
+        for directory, _, names in os.walk(root):
+            descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+            if descriptor < 0:
+                logger.warning(f"Can't watch {directory}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self.directories[descriptor] = directory
+            files += [os.path.join(directory, name) for name in names]
+        return files
+
+    def poll(self, timeout):
+        """
+        Returns:
+            list: Files written, moved in or created within ``timeout`` seconds.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+
+        changed = []
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            descriptor, mask, _, name_size = INOTIFY_EVENT.unpack_from(data, offset)
+            name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + name_size].rstrip(b"\0")
+            offset += INOTIFY_EVENT.size + name_size
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("Watch events were dropped, rescanning the publish directories")
+                return [path for root in self.roots for path in scan_files(root)]
+            if mask & IN_IGNORED:
+                self.directories.pop(descriptor, None)
+                continue
+            directory = self.directories.get(descriptor)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed += self.add_tree(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.append(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(roots, poll=False, interval=DEFAULT_POLL_SECONDS):
+    """
+    Returns:
+        object: An ``InotifyWatcher`` where inotify is available and ``poll`` is off, otherwise a
+            ``PollingWatcher``.
+    """
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable ({e}), polling every {interval}s")
+    return PollingWatcher(roots, interval)
+
+
+class Debouncer(object):
+    """
+    Turns bursts of changes into one event per file once it has been quiet for ``delay`` seconds
+    and its size and modification time stopped changing.
+    """
+
+    def __init__(self, delay=DEFAULT_DEBOUNCE_SECONDS):
+        self.delay = delay
+        self.pending = collections.OrderedDict()
+
+    def touch(self, path, now=None):
+        self.pending.pop(path, None)
+        self.pending[path] = (time.time() if now is None else now, scene_signature(path))
+
+    def __len__(self):
+        return len(self.pending)
+
+    def ready(self, limit, now=None):
+        """
+        Takes up to ``limit`` settled files, oldest change first.
+
+        Returns:
+            list: The files.
+        """
+        now = time.time() if now is None else now
+        settled = []
+        for path, (touched, signature) in list(self.pending.items()):
+            if len(settled) >= limit or now - touched < self.delay:
+                break
+            del self.pending[path]
+            current = scene_signature(path)
+            if current is None:
+                continue
+            if current != signature:
+                # Still being written: wait another quiet period
+                self.touch(path, now)
+                continue
+            settled.append(path)
+        return settled
+
+
+class ExportDaemon(object):
+    """
+    Watches publish directories and exports changed scenes on a worker pool.
+
+    Args:
+        watches (list): ``WatchConfig``s.
+        pool (ExportWorker.WorkerPool): Started pool; its size is the concurrency limit.
+        state_path (str): File remembering the signature of every exported scene.
+        max_queue (int): Exports waiting for a worker before changes are held back.
+        debounce (float): Quiet seconds before a changed scene is exported.
+        poll (bool): Poll instead of using inotify.
+        poll_interval (float): Seconds between polls.
+    """
+
+    def __init__(self, watches, pool, state_path, max_queue=DEFAULT_MAX_QUEUE, debounce=DEFAULT_DEBOUNCE_SECONDS,
+                 poll=False, poll_interval=DEFAULT_POLL_SECONDS):
+        self.watches = watches
+        self.pool = pool
+        self.state_path = state_path
+        self.max_queue = max(1, max_queue)
+        self.debouncer = Debouncer(debounce)
+        self.watcher = create_watcher([watch.path for watch in watches], poll, poll_interval)
+        self.state = self.load_state()
+        self.queue = collections.deque()
+        self.running = {}
+        self.stopping = False
+
+    def load_state(self):
+        if not os.path.isfile(self.state_path):
+            return {}
+        try:
+            with open(self.state_path) as state_file:
+                return json.load(state_file)
+        except (IOError, OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable daemon state {self.state_path}: {e}")
+            return {}
+
+    def save_state(self):
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as state_file:
+                json.dump(self.state, state_file, indent=1)
+            os.replace(temp_path, self.state_path)
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to save daemon state {self.state_path}: {e}")
+
+    def watch_for(self, path):
+        return next((watch for watch in self.watches if watch.matches(path)), None)
+
+    def is_changed(self, scene):
+        signature = scene_signature(scene)
+        return signature is not None and self.state.get(scene) != signature
+
+    def catch_up(self):
+        """
+        Queues scenes changed while the daemon wasn't running.
+        """
+        for watch in self.watches:
+            for path in scan_files(watch.path):
+                if watch.matches(path) and self.is_changed(path):
+                    self.debouncer.touch(path, now=0)
+
+    def step(self, timeout=1.0):
+        """
+        One turn of the loop: take file events, collect finished exports, queue settled scenes
+        while there is room and hand queued exports to free workers.
+        """
+        for path in self.watcher.poll(timeout):
+            if self.watch_for(path) is not None:
+                self.debouncer.touch(os.path.abspath(path))
+
+        for scene, (future, signature) in list(self.running.items()):
+            if future.done():
+                del self.running[scene]
+                self.export_finished(scene, future.result(), signature)
+
+        room = self.max_queue - len(self.queue)
+        if room <= 0 and len(self.debouncer):
+            logger.debug(f"Export queue full, holding back {len(self.debouncer)} changed scenes")
+        for scene in self.debouncer.ready(max(0, room)):
+            if scene in self.queue or not self.is_changed(scene):
+                continue
+            if scene in self.running:
+                # Exported again once the running export is done, from the newer file
+                self.debouncer.touch(scene)
+                continue
+            self.queue.append(scene)
+            logger.info(f"Queued {scene} ({len(self.queue)} waiting, {len(self.running)} exporting)")
+
+        while self.queue and len(self.running) < self.pool.size:
+            scene = self.queue.popleft()
+            job = self.watch_for(scene).job(scene)
+            self.running[scene] = (self.pool.submit(job), scene_signature(scene))
+
+    def export_finished(self, scene, result, signature):
+        if not result.ok:
+            logger.error(f"Export of {scene} failed: {'; '.join(result.failures)}")
+            return
+        logger.info(f"Exported {scene} in {result.seconds:.0f}s")
+        self.state[scene] = signature
+        self.save_state()
+
+    def run(self):
+        """
+        Runs until SIGINT or SIGTERM, then lets running exports finish.
+        """
+        def stop(*_):
+            logger.info("Stopping after the running exports")
+            self.stopping = True
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        self.catch_up()
+        logger.info(f"Watching {', '.join(watch.path for watch in self.watches)}")
+        try:
+            while not self.stopping:
+                self.step()
+            for scene, (future, signature) in self.running.items():
+                self.export_finished(scene, future.result(), signature)
+        finally:
+            self.watcher.close()
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export shot scenes as they are published.")
+    parser.add_argument("config", help="JSON file with the watched directories.")
+    parser.add_argument("--workers", type=int, default=2, help="Exports running at once (default: 2).")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Exports waiting for a worker before changes are held back.")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE_SECONDS,
+                        help="Seconds a scene must be left alone before it is exported.")
+    parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify (network shares).")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_SECONDS, help="Seconds between polls.")
+    parser.add_argument("--state", help="State file of exported scenes (default: next to the config).")
+    parser.add_argument("--max-jobs", type=int, default=25, help="Recycle a worker after this many jobs.")
+    parser.add_argument("--max-memory", type=float, help="Recycle a worker above this many MB.")
+    parser.add_argument("--mayapy", help="mayapy executable used for workers.")
+    args = parser.parse_args(argv)
+
+    watches = load_config(args.config)
+    state_path = args.state or os.path.join(os.path.dirname(os.path.abspath(args.config)), STATE_FILE_NAME)
+    with WorkerPool(args.workers, args.max_jobs, args.max_memory, args.mayapy) as pool:
+        ExportDaemon(
+            watches, pool, state_path, args.max_queue, args.debounce, args.poll, args.poll_interval
+        ).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
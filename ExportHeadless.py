@@ -0,0 +1,297 @@
+"""
+Command-line entry point for exporting a shot without the ExportTool UI.
+
+Run it with Maya's interpreter, e.g.:
+
+    mayapy ExportHeadless.py D:/shots/sh010_anim.mb --file-path D:/export --shot-name sh010 \
+        --characters Bob,Alice --cameras shotCam --abc Bob --offset 5
+"""
+import os
+import sys
+import argparse
+import logging
+import dataclasses
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_PLUGINS = ("fbxmaya", "AbcExport")
+
+_maya_initialized = False
+
+
+def initialize_maya():
+    """
+    Starts Maya standalone (once per process) and loads the exporter plug-ins.
+    """
+    global _maya_initialized
+    if _maya_initialized:
+        return
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    import maya.cmds as cm
+    for plugin in REQUIRED_PLUGINS:
+        if not cm.pluginInfo(plugin, query=True, loaded=True):
+            cm.loadPlugin(plugin, quiet=True)
+
+    _maya_initialized = True
+
+
+def open_scene(scene_path, reference_names=None):
+    """
+    Opens a scene, discarding whatever is currently loaded.
+
+    Args:
+        scene_path (str): The Maya scene to open.
+        reference_names (list): Only load the references whose namespace matches one of these
+            names (see ``ExportNames.namespace_matches``); None loads every reference.
+    """
+    import maya.cmds as cm
+
+    if not os.path.isfile(scene_path):
+        raise IOError(f"Scene does not exist: {scene_path}")
+
+    logger.info(f"Opening scene {scene_path}")
+    if reference_names is None:
+        cm.file(scene_path, open=True, force=True, prompt=False)
+        return
+    cm.file(scene_path, open=True, force=True, prompt=False, loadReferenceDepth="none")
+    load_references(reference_names)
+
+
+def scene_references():
+    """
+    Lists the scene's top-level references, loaded or not, from their reference nodes.
+
+    Returns:
+        dict: {reference node: namespace without leading colon}.
+    """
+    import maya.cmds as cm
+
+    references = {}
+    for node in cm.ls(type="reference") or []:
+        if node == "sharedReferenceNode" or node.endswith("_UNKNOWN_REF_NODE_"):
+            continue
+        try:
+            references[node] = cm.referenceQuery(node, namespace=True).lstrip(":")
+        except RuntimeError:
+            # Reference nodes without a file (left over from removed references)
+            continue
+    return references
+
+
+def load_references(names):
+    """
+    Loads the references (with their nested references) belonging to the given names.
+
+    Args:
+        names (list): Character names, camera names or namespaces.
+
+    Returns:
+        list: Reference nodes that were loaded.
+    """
+    import maya.cmds as cm
+    from ExportNames import namespace_matches
+
+    references = scene_references()
+    selected = []
+    for name in names:
+        matching = [node for node, namespace in references.items() if namespace_matches(namespace, name)]
+        if not matching:
+            logger.warning(f"No reference found for {name}")
+        selected += [node for node in matching if node not in selected]
+
+    for node in selected:
+        cm.file(loadReference=node, loadReferenceDepth="all")
+    logger.info(f"Loaded {len(selected)} of {len(references)} references")
+    return selected
+
+
+def reference_names_for(settings):
+    """
+    Names whose references an export of these settings needs: the FBX and Alembic characters,
+    and the namespaces of referenced cameras. Cameras without namespace live in the shot scene.
+
+    Returns:
+        list: Names for ``load_references``, or None to load everything: the cameras of a
+            sequencer export are only known once the scene is open.
+    """
+    if settings.sequencer:
+        return None
+    names = list(settings.character_names) + list(settings.abc_names)
+    for camera in settings.camera_names:
+        if ":" in camera:
+            names.append(camera.rpartition(":")[0])
+    return [name for index, name in enumerate(names) if name not in names[:index]]
+
+
+def reset_scene():
+    """
+    Empties the session so the next scene starts clean.
+    """
+    import maya.cmds as cm
+    cm.file(new=True, force=True)
+
+
+def run_export_job(scene_path, settings, mode="all", selective_references=True):
+    """
+    Opens a scene and exports it with the given settings.
+
+    Args:
+        scene_path (str): The Maya scene to export.
+        settings (ExportCore.ExportSettings): What and where to export.
+        mode (str): "fbx", "abc" or "all".
+        selective_references (bool): Only load the references of the exported characters and
+            cameras; sets and props stay unloaded.
+
+    Returns:
+        ExportCore.ExportJob: The finished job.
+    """
+    initialize_maya()
+
+    from ExportCore import ExportJob
+
+    open_scene(scene_path, reference_names_for(settings) if selective_references else None)
+    # The scene is thrown away after the export, no need to undo the bake
+    job = ExportJob(dataclasses.replace(settings, restore_scene=False))
+    job.run(mode)
+    return job
+
+
+def run_export(scene_path, settings, mode="all", selective_references=True):
+    """
+    Same as ``run_export_job``.
+
+    Returns:
+        list: Failure messages, empty if the export succeeded.
+    """
+    return run_export_job(scene_path, settings, mode, selective_references).failures
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Export a Maya shot to FBX/Alembic without the UI.")
+    parser.add_argument("scene", help="Maya scene to export.")
+    parser.add_argument("--file-path", required=True, help="Export root; files go to <file-path>/<shot-name>.")
+    parser.add_argument("--shot-name", help="Shot name. Defaults to the scene file name.")
+    parser.add_argument("--characters", default="", help="Comma separated characters to export to FBX.")
+    parser.add_argument("--cameras", default="", help="Comma separated cameras to export to FBX.")
+    parser.add_argument("--abc", default="", help="Comma separated characters to export to Alembic.")
+    parser.add_argument("--start", type=int, help="Start frame. Defaults to the playback range.")
+    parser.add_argument("--end", type=int, help="End frame. Defaults to the playback range.")
+    parser.add_argument("--offset", type=int, default=0, help="Handle frames added on both sides of the range.")
+    parser.add_argument("--no-bake", action="store_true", help="Don't bake animation into the FBX files.")
+    parser.add_argument("--fbx-version", default="2019", help="FBX file version year (default: 2019).")
+    parser.add_argument("--fbx-preset", default="UE skeletal anim", help="FBX option preset for characters.")
+    parser.add_argument("--fbx-camera-preset", default="UE camera", help="FBX option preset for cameras.")
+    parser.add_argument("--no-batch-bake", action="store_true",
+                        help="Bake each file separately instead of all assets in one timeline sweep.")
+    parser.add_argument("--staging-dir", default="",
+                        help="Write files to this local directory first and copy them to the export path "
+                             "in the background.")
+    parser.add_argument("--upload-workers", type=int, default=4,
+                        help="Copies to the export path in flight at once when staging (default: 4).")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="Don't check the structure and frame count of written files before publishing them.")
+    parser.add_argument("--package", choices=("zip", "zstd"),
+                        help="Pack the shot's files into <file-path>/<shot-name>.zip (or .tar.zst) while exporting.")
+    parser.add_argument("--no-fast-bake", action="store_true",
+                        help="Keep refresh, evaluation mode and undo as they are while exporting.")
+    parser.add_argument("--no-camera-sampling", action="store_true",
+                        help="Bake cameras through a matrix network instead of sampling them with the API.")
+    parser.add_argument("--unreal-camera-data", action="store_true",
+                        help="Also write each camera as a per-frame JSON table for UnrealCameraImport.py.")
+    parser.add_argument("--reduce-keys", action="store_true",
+                        help="After the batch bake, remove static channels and simplify the baked curves.")
+    parser.add_argument("--translate-tolerance", type=float, default=0.01,
+                        help="Key reduction tolerance of translate and other curves (default: 0.01).")
+    parser.add_argument("--rotate-tolerance", type=float, default=0.05,
+                        help="Key reduction tolerance of rotate curves in degrees (default: 0.05).")
+    parser.add_argument("--no-cache", action="store_true", help="Don't skip assets that are unchanged.")
+    parser.add_argument("--force", action="store_true", help="Rewrite every asset even if it is cached.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Keep the files an interrupted earlier run of the shot completed and export the rest.")
+    parser.add_argument("--no-manifest", action="store_true", help="Don't write the JSON export manifest.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write a Chrome trace of the export into <export dir>/.export_profiles.")
+    parser.add_argument("--profile-python", action="store_true",
+                        help="With --profile, also capture a cProfile (.prof) of the Python side.")
+    parser.add_argument("--sequencer", action="store_true",
+                        help="Export every Camera Sequencer shot into <file-path>/<shot> from a single bake.")
+    parser.add_argument("--shots", default="", help="With --sequencer, comma separated shots to export (default: all).")
+    parser.add_argument("--flush-undo", action="store_true",
+                        help="Flush the undo queue after each asset (when --no-fast-bake keeps undo on).")
+    parser.add_argument("--memory-limit", type=float,
+                        help="Stop once Maya uses more than this many MB; rerunning continues from the cache.")
+    parser.add_argument("--load-all-references", action="store_true",
+                        help="Load every reference, e.g. when characters are constrained to props.")
+    parser.add_argument("--mode", choices=("fbx", "abc", "all"), default="all", help="What to export.")
+    return parser
+
+
+def settings_from_args(args):
+    """
+    Builds export settings from parsed command line arguments.
+
+    Args:
+        args (argparse.Namespace): Arguments from ``build_parser``.
+
+    Returns:
+        ExportCore.ExportSettings: The export settings.
+    """
+    from ExportCore import ExportSettings
+    from ExportNames import split_name_list
+
+    shot_name = args.shot_name or os.path.splitext(os.path.basename(args.scene))[0]
+    return ExportSettings(
+        file_path=args.file_path.replace("\\", "/"),
+        shot_name=shot_name,
+        character_names=split_name_list(args.characters),
+        camera_names=split_name_list(args.cameras),
+        abc_names=split_name_list(args.abc),
+        start_frame=args.start,
+        end_frame=args.end,
+        offset=args.offset,
+        bake=not args.no_bake,
+        fbx_version=args.fbx_version,
+        fbx_preset=args.fbx_preset,
+        fbx_camera_preset=args.fbx_camera_preset,
+        batch_bake=not args.no_batch_bake,
+        staging_dir=args.staging_dir.replace("\\", "/"),
+        upload_workers=args.upload_workers,
+        verify_outputs=not args.no_verify,
+        package=args.package or "",
+        sample_cameras=not args.no_camera_sampling,
+        unreal_camera_data=args.unreal_camera_data,
+        fast_bake=not args.no_fast_bake,
+        reduce_keys=args.reduce_keys,
+        translate_tolerance=args.translate_tolerance,
+        rotate_tolerance=args.rotate_tolerance,
+        use_cache=not args.no_cache,
+        force_rebuild=args.force,
+        resume=args.resume,
+        write_manifest=not args.no_manifest,
+        profile=args.profile or args.profile_python,
+        profile_python=args.profile_python,
+        sequencer=args.sequencer,
+        sequencer_shots=split_name_list(args.shots),
+        flush_undo=args.flush_undo,
+        memory_limit_mb=args.memory_limit,
+    )
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+
+    failures = run_export(args.scene, settings_from_args(args), args.mode, not args.load_all_references)
+    if failures:
+        for failure in failures:
+            logger.error(failure)
+        return 1
+    logger.info("Headless export completed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
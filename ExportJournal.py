@@ -0,0 +1,165 @@
+"""
+Append-only journal of export progress, so an interrupted run can be resumed.
+
+The export cache is saved when a run finishes; if Maya dies half way through a shot, a rerun has
+nothing to go on and exports everything again. The journal is a JSON-lines file in the shot's
+export directory that every run appends to as it goes, flushed to disk line by line: which assets
+were planned, when each one was started, and the size, modification time and checksum of each
+completed (verified and published) file. The checksum is taken by the verifier's thread; without
+verification only size and time are recorded. A resumed run keeps the files whose last journal
+entry says completed, with the same inputs and unchanged contents, and exports the rest.
+"""
+import os
+import json
+import time
+import logging
+
+from ExportVerify import file_checksum
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE_NAME = ".export_journal.jsonl"
+JOURNAL_VERSION = 1
+# The journal is compacted to the last entry per file when it grows past this
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+
+class ExportJournal(object):
+    """
+    The resume journal of one shot export directory.
+
+    Entries are keyed by output file name; the last entry of a file is its state. Several exports
+    may append to the same journal at once (the FBX and Alembic halves of a shot), each line is a
+    single append. An entry lost to compaction racing another process only means that file is
+    exported again on resume.
+
+    Args:
+        export_dir (str): The shot export directory.
+        run (str): Identifies the run in its entries.
+    """
+
+    def __init__(self, export_dir, run=None):
+        self.export_dir = export_dir
+        self.path = os.path.join(export_dir, JOURNAL_FILE_NAME).replace(os.sep, '/')
+        self.run = run or f"{os.getpid()}-{int(time.time())}"
+        self.entries = self.load()
+        if os.path.isfile(self.path) and os.path.getsize(self.path) > JOURNAL_COMPACT_BYTES:
+            self.compact()
+        self.file = None
+
+    def load(self):
+        """
+        Reads the last entry of every file. A line cut short by a crash is ignored.
+
+        Returns:
+            dict: {output file name: entry}.
+        """
+        entries = {}
+        if not os.path.isfile(self.path):
+            return entries
+        try:
+            with open(self.path) as journal_file:
+                for line in journal_file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("version") == JOURNAL_VERSION and entry.get("output"):
+                        entries[entry["output"]] = entry
+        except (IOError, OSError) as e:
+            logger.warning(f"Ignoring unreadable export journal {self.path}: {e}")
+        return entries
+
+    def compact(self):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as journal_file:
+                for entry in self.entries.values():
+                    journal_file.write(json.dumps(entry) + "\n")
+            os.replace(temp_path, self.path)
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to compact export journal {self.path}: {e}")
+
+    def record(self, event, asset, **fields):
+        """
+        Appends an entry and flushes it to disk.
+
+        Args:
+            event (str): "planned", "started", "completed" or "failed".
+            asset (ExportCore.ExportAsset): The asset.
+            fields: Extra values of the entry.
+        """
+        entry = dict(
+            version=JOURNAL_VERSION, run=self.run, time=round(time.time(), 3), event=event,
+            output=os.path.basename(asset.output_path), kind=asset.kind, source=asset.source,
+            key=asset.cache_key, **fields
+        )
+        self.entries[entry["output"]] = entry
+        try:
+            if self.file is None:
+                self.file = open(self.path, "a")
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to write export journal {self.path}: {e}")
+
+    def planned(self, asset):
+        self.record("planned", asset)
+
+    def started(self, asset):
+        self.record("started", asset)
+
+    def completed(self, asset, checksum=None):
+        """
+        Records a published file with its size and modification time. Files aren't read here:
+        the checksum, if any, was taken in the background when the file was verified.
+
+        Args:
+            asset (ExportCore.ExportAsset): The published asset.
+            checksum (str): ``file_checksum`` of the file.
+        """
+        try:
+            stat = os.stat(asset.output_path)
+            self.record("completed", asset, size=stat.st_size, mtime=stat.st_mtime, checksum=checksum)
+        except (IOError, OSError) as e:
+            logger.warning(f"Not journaling {asset.output_path}: {e}")
+
+    def failed(self, asset, error):
+        self.record("failed", asset, error=str(error))
+
+    def is_complete(self, asset, since=None):
+        """
+        Checks whether a previous run completed an asset's file from the same inputs and the file
+        is still the one it wrote: same checksum if one was recorded, else same size and time.
+        Only called when resuming, so hashing here doesn't slow down normal runs.
+
+        Args:
+            asset (ExportCore.ExportAsset): A planned asset, with its ``cache_key`` if caching is on.
+                Without the cache the inputs can't be compared, and the journal is trusted.
+            since (float): Ignore files completed before this time.
+
+        Returns:
+            bool: True if the file can be kept.
+        """
+        entry = self.entries.get(os.path.basename(asset.output_path))
+        if not entry or entry.get("event") != "completed":
+            return False
+        if since is not None and entry.get("time", 0) < since:
+            return False
+        if asset.cache_key is not None and entry.get("key") != asset.cache_key:
+            return False
+        try:
+            stat = os.stat(asset.output_path)
+            if stat.st_size != entry.get("size"):
+                return False
+            if entry.get("checksum"):
+                return file_checksum(asset.output_path) == entry["checksum"]
+            return stat.st_mtime == entry.get("mtime")
+        except (IOError, OSError):
+            return False
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,202 @@
+"""
+Machine-readable record of one export run.
+
+Every run writes a JSON manifest into ``<shot export dir>/.export_manifests`` listing each asset
+(source, frame range, options, output path, size, status) with its discovery/bake/write timings,
+plus run-level phase totals and failures. The manifests are what you look at to find slow rigs
+and to compare export throughput between releases.
+"""
+import os
+import json
+import time
+import socket
+import logging
+from datetime import datetime
+from dataclasses import asdict
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR_NAME = ".export_manifests"
+MANIFEST_VERSION = 1
+PHASES = ("discovery", "bake", "write")
+
+
+class ExportManifest(object):
+    """
+    Collects timings and results while an ``ExportJob`` runs, then writes them as JSON.
+    """
+
+    def __init__(self, settings, mode, scene=None, maya_version=None):
+        self.settings = settings
+        self.mode = mode
+        self.scene = scene
+        self.maya_version = maya_version
+        self.started = time.time()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.assets = {}
+        self.package = None
+
+    def asset_entry(self, asset):
+        """
+        Returns:
+            dict: The manifest entry of an asset, created on first use.
+        """
+        entry = self.assets.get(asset.output_path)
+        if entry is None:
+            entry = {
+                "kind": asset.kind,
+                "name": asset.name,
+                "source": asset.source,
+                "output_path": asset.output_path,
+                "frame_range": None,
+                "options": asset.preset,
+                "status": "planned",
+                "size": None,
+                "timings": dict.fromkeys(PHASES, 0.0),
+                "keys": None,
+                "memory_mb": None,
+                "error": None,
+            }
+            self.assets[asset.output_path] = entry
+        return entry
+
+    def add_assets(self, assets, min_time, max_time, options=None):
+        """
+        Registers planned assets.
+
+        Args:
+            assets (list): ``ExportAsset``s.
+            min_time (int): Start frame.
+            max_time (int): End frame.
+            options (str): Options description for assets without an FBX preset.
+        """
+        for asset in assets:
+            entry = self.asset_entry(asset)
+            entry["frame_range"] = [min_time, max_time]
+            if options and not entry["options"]:
+                entry["options"] = options
+
+    def add_timing(self, asset, phase, seconds, shared_with=1):
+        """
+        Adds time spent on an asset. Work done for several assets at once (the batch bake, the
+        combined Alembic export) is recorded in full on each of them with the batch size.
+        """
+        entry = self.asset_entry(asset)
+        entry["timings"][phase] += seconds
+        if shared_with > 1:
+            entry["timings"][f"{phase}_shared_with"] = shared_with
+
+    def set_key_counts(self, asset, before, after):
+        """
+        Records the key reduction of an asset.
+        """
+        self.asset_entry(asset)["keys"] = {"before": before, "after": after}
+
+    def set_memory(self, asset, before, after):
+        """
+        Records the process memory (MB) before and after an asset was written.
+        """
+        self.asset_entry(asset)["memory_mb"] = {
+            name: round(value, 1) if value is not None else None for name, value in (("before", before), ("after", after))
+        }
+
+    def mark_written(self, asset):
+        entry = self.asset_entry(asset)
+        entry["status"] = "written"
+        try:
+            entry["size"] = os.path.getsize(asset.output_path)
+        except OSError:
+            entry["size"] = None
+
+    def mark_cached(self, asset):
+        entry = self.asset_entry(asset)
+        entry["status"] = "cached"
+        try:
+            entry["size"] = os.path.getsize(asset.output_path)
+        except OSError:
+            entry["size"] = None
+
+    def mark_failed(self, asset, error):
+        entry = self.asset_entry(asset)
+        entry["status"] = "failed"
+        entry["error"] = str(error)
+
+    def to_dict(self, failures=(), status="completed"):
+        finished = time.time()
+        assets = []
+        for entry in self.assets.values():
+            entry = dict(entry)
+            entry["timings"] = {
+                name: round(value, 4) if isinstance(value, float) else value
+                for name, value in entry["timings"].items()
+            }
+            assets.append(entry)
+        return {
+            "version": MANIFEST_VERSION,
+            "shot": self.settings.shot_name,
+            "scene": self.scene,
+            "mode": self.mode,
+            "status": status,
+            "host": socket.gethostname(),
+            "maya_version": self.maya_version,
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "finished": datetime.fromtimestamp(finished).isoformat(timespec="seconds"),
+            "duration": round(finished - self.started, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "bytes_written": sum(entry["size"] or 0 for entry in assets if entry["status"] == "written"),
+            "package": self.package,
+            "settings": asdict(self.settings),
+            "assets": assets,
+            "failures": list(failures),
+        }
+
+    def write(self, export_dir, failures=(), status="completed"):
+        """
+        Writes the manifest into the shot export directory.
+
+        Args:
+            export_dir (str): The shot export directory.
+            failures (list): The run's failure messages.
+            status (str): "completed", "failed", "cancelled" or "aborted".
+
+        Returns:
+            str: Path of the manifest, or None if it couldn't be written.
+        """
+        manifest_dir = os.path.join(export_dir, MANIFEST_DIR_NAME)
+        stamp = datetime.fromtimestamp(self.started).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(manifest_dir, f"{self.settings.shot_name}_{stamp}_{self.mode}.json").replace(os.sep, '/')
+        try:
+            if not os.path.isdir(manifest_dir):
+                os.makedirs(manifest_dir)
+            with open(path, "w") as manifest_file:
+                json.dump(self.to_dict(failures, status), manifest_file, indent=2)
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to write export manifest {path}: {e}")
+            return None
+        logger.info(f"Export manifest written to {path}")
+        return path
+
+
+def load_manifests(export_dir):
+    """
+    Reads the manifests of previous runs of a shot, oldest first.
+
+    Args:
+        export_dir (str): The shot export directory.
+
+    Returns:
+        list: Manifest dicts.
+    """
+    manifest_dir = os.path.join(export_dir, MANIFEST_DIR_NAME)
+    if not os.path.isdir(manifest_dir):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(manifest_dir)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(manifest_dir, name)) as manifest_file:
+                manifests.append(json.load(manifest_file))
+        except (IOError, OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable manifest {name}: {e}")
+    return manifests
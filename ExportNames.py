@@ -0,0 +1,42 @@
+"""
+Character and name helpers shared by the export core and the Maya-free batch tooling.
+"""
+import re
+
+_NAMESPACE_COPY_SUFFIX = re.compile(r"_?\d+$")
+
+
+def split_name_list(raw_input):
+    """
+    Splits a comma separated name list as typed in the tool's line edits.
+
+    Args:
+        raw_input (str): Raw comma separated input.
+
+    Returns:
+        list: The stripped, non-empty names.
+    """
+    if not raw_input:
+        return []
+    return [name.strip() for name in raw_input.split(",") if name.strip()]
+
+
+def namespace_matches(namespace, character):
+    """
+    Checks whether a namespace belongs to a character.
+
+    Each ``:`` separated token of the namespace is compared to the character name, either exactly
+    or after dropping a copy number ("Bob1", "Bob_02"). "Bob" therefore matches "Bob", "Bob1" and
+    "shot:Bob_02" but not "Bobby".
+
+    Args:
+        namespace (str): Namespace without leading colon.
+        character (str): Character name as typed in the tool.
+
+    Returns:
+        bool: True if the namespace is an instance of the character.
+    """
+    for token in namespace.split(":"):
+        if token == character or _NAMESPACE_COPY_SUFFIX.sub("", token) == character:
+            return True
+    return False
@@ -0,0 +1,213 @@
+"""
+Compressed per-shot packages, built while the export runs.
+
+Each file is handed to a ``ShotPackager`` as soon as it is in the shot directory; a worker thread
+compresses it into the archive while Maya carries on with the next bake. Zip (deflate) works
+everywhere; zstd (a ``.tar.zst``) is used when the ``zstandard`` package is installed. The
+archive is written under a temporary name and renamed when complete.
+
+Unpack a package on the receiving machine with:
+
+    python ExportPackage.py D:/export/sh010.zip D:/unreal/import
+"""
+import os
+import sys
+import queue
+import tarfile
+import zipfile
+import logging
+import argparse
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_FORMATS = ("zip", "zstd")
+PACKAGE_EXTENSIONS = {"zip": ".zip", "zstd": ".tar.zst"}
+
+_STOP = object()
+
+
+def resolve_format(package_format):
+    """
+    Returns:
+        str: The format that will actually be used; zstd falls back to zip without ``zstandard``.
+    """
+    if package_format not in PACKAGE_FORMATS:
+        raise ValueError(f"Unknown package format '{package_format}', expected one of {PACKAGE_FORMATS}")
+    if package_format == "zstd" and zstandard is None:
+        logger.warning("zstandard is not installed, packaging as zip instead")
+        return "zip"
+    return package_format
+
+
+def package_path(file_path, shot_name, package_format):
+    """
+    Returns:
+        str: Archive path of a shot, next to (not inside) its export directory.
+    """
+    extension = PACKAGE_EXTENSIONS[resolve_format(package_format)]
+    return os.path.join(file_path, f"{shot_name}{extension}").replace(os.sep, '/')
+
+
+class ShotPackager(object):
+    """
+    Compresses files into one archive on a background thread.
+
+    Args:
+        archive_path (str): Archive to create, see ``package_path``.
+        package_format (str): "zip" or "zstd".
+    """
+
+    def __init__(self, archive_path, package_format="zip"):
+        self.archive_path = archive_path
+        self.format = resolve_format(package_format)
+        self.temp_path = f"{archive_path}.{os.getpid()}.partial"
+        self.queue = queue.Queue()
+        self.added = set()
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name="ExportPackage", daemon=True)
+        self.thread.start()
+
+    def add(self, path, arcname=None):
+        """
+        Queues a finished file; each archive name is only added once.
+
+        Args:
+            path (str): File to add.
+            arcname (str): Name inside the archive, defaults to the file name.
+        """
+        arcname = arcname or os.path.basename(path)
+        if arcname in self.added:
+            return
+        self.added.add(arcname)
+        self.queue.put((path, arcname))
+
+    def _files(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            yield item
+
+    def _run(self):
+        try:
+            if self.format == "zip":
+                with zipfile.ZipFile(self.temp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                    for path, arcname in self._files():
+                        self._add(archive.write, path, arcname)
+            else:
+                with open(self.temp_path, "wb") as raw_file:
+                    with zstandard.ZstdCompressor(threads=-1).stream_writer(raw_file) as compressed:
+                        with tarfile.open(fileobj=compressed, mode="w|") as archive:
+                            for path, arcname in self._files():
+                                self._add(archive.add, path, arcname)
+        except Exception as e:
+            self.errors.append(f"Packaging into {self.archive_path} failed: {e}")
+            # Keep draining so close() doesn't wait forever
+            for _ in self._files():
+                pass
+
+    def _add(self, add, path, arcname):
+        try:
+            add(path, arcname)
+        except (IOError, OSError) as e:
+            self.errors.append(f"Couldn't package {path}: {e}")
+
+    def close(self, keep=True):
+        """
+        Waits for the queued files and finishes the archive.
+
+        Args:
+            keep (bool): Move the archive into place; False throws it away (cancelled export).
+
+        Returns:
+            list: Error messages, empty if the package is complete.
+        """
+        self.queue.put(_STOP)
+        self.thread.join()
+        if keep and not self.errors and self.added:
+            os.replace(self.temp_path, self.archive_path)
+            logger.info(f"Packaged {len(self.added)} files into {self.archive_path}")
+        elif os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        return self.errors
+
+
+def _safe_target(destination, name):
+    target = os.path.realpath(os.path.join(destination, name))
+    if os.path.commonpath([target, os.path.realpath(destination)]) != os.path.realpath(destination):
+        raise ValueError(f"Refusing to extract {name} outside of {destination}")
+    return target
+
+
+def unpack(archive_path, destination):
+    """
+    Extracts a shot package.
+
+    Args:
+        archive_path (str): A ``.zip`` or ``.tar.zst`` package.
+        destination (str): Directory to extract into, created if needed.
+
+    Returns:
+        list: Extracted file names.
+    """
+    if not os.path.isdir(destination):
+        os.makedirs(destination)
+
+    if archive_path.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            names = archive.namelist()
+            for name in names:
+                _safe_target(destination, name)
+            archive.extractall(destination)
+        return names
+
+    if archive_path.endswith(".tar.zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to unpack .tar.zst packages")
+        names = []
+        with open(archive_path, "rb") as raw_file:
+            with zstandard.ZstdDecompressor().stream_reader(raw_file) as decompressed:
+                with tarfile.open(fileobj=decompressed, mode="r|") as archive:
+                    for member in archive:
+                        if not member.isfile():
+                            continue
+                        _safe_target(destination, member.name)
+                        archive.extract(member, destination)
+                        names.append(member.name)
+        return names
+
+    raise ValueError(f"Unknown package type: {archive_path}")
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Unpack a shot package created by the export.")
+    parser.add_argument("package", help="The .zip or .tar.zst package.")
+    parser.add_argument("destination", nargs="?", help="Directory to extract to (default: next to the package).")
+    args = parser.parse_args(argv)
+
+    destination = args.destination
+    if not destination:
+        name = os.path.basename(args.package)
+        for extension in PACKAGE_EXTENSIONS.values():
+            if name.endswith(extension):
+                name = name[:-len(extension)]
+        destination = os.path.join(os.path.dirname(os.path.abspath(args.package)), name)
+
+    try:
+        names = unpack(args.package, destination)
+    except (IOError, OSError, ValueError, RuntimeError, zipfile.BadZipFile, tarfile.TarError) as e:
+        logger.error(f"Failed to unpack {args.package}: {e}")
+        return 1
+    logger.info(f"Unpacked {len(names)} files into {destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Opt-in profiling of the export pipeline.
+
+While a ``Tracer`` is active, every function decorated with ``traced`` records a span with its
+start time, duration and process memory before/after. The spans are written as a Chrome
+trace-event JSON file that opens in chrome://tracing or https://ui.perfetto.dev. Optionally the
+Python side is captured with cProfile as well (a ``.prof`` file for pstats/snakeviz).
+
+When no tracer is active the decorators only cost one global lookup per call.
+"""
+import os
+import sys
+import json
+import time
+import cProfile
+import inspect
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_active_tracer = None
+
+
+def get_process_memory_mb():
+    """
+    Resident memory of the current process.
+
+    Returns:
+        float: Memory in MB, or None if it can't be determined on this platform.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+    except ImportError:
+        pass
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as statm:
+                pages = int(statm.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+        except (IOError, OSError, ValueError):
+            return None
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize / (1024.0 * 1024.0)
+        return None
+
+    try:
+        import resource
+        # Peak rather than current usage, but still a usable ceiling check (bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024.0 * 1024.0)
+    except ImportError:
+        return None
+
+
+def active_tracer():
+    """
+    Returns:
+        Tracer: The running tracer, or None when profiling is off.
+    """
+    return _active_tracer
+
+
+class Tracer(object):
+    """
+    Records nested spans and writes them as Chrome trace events.
+
+    Args:
+        name (str): Process name shown in the trace viewer.
+        capture_python (bool): Also run cProfile while the tracer is active.
+    """
+
+    def __init__(self, name="ExportTool", capture_python=False):
+        self.name = name
+        self.capture_python = capture_python
+        self.events = []
+        self.pid = os.getpid()
+        self.profiler = None
+        self._origin = None
+        self._lock = threading.Lock()
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def start(self):
+        global _active_tracer
+        if _active_tracer is not None:
+            logger.warning("A profiling session is already running; nesting it.")
+        self._origin = time.perf_counter()
+        self.events.append({
+            "name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": self.name},
+        })
+        if self.capture_python:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        _active_tracer = self
+        return self
+
+    def stop(self):
+        global _active_tracer
+        if self.profiler is not None:
+            self.profiler.disable()
+        if _active_tracer is self:
+            _active_tracer = None
+
+    @contextmanager
+    def span(self, name, **args):
+        """
+        Records a complete ("X") event around a block, with memory before and after.
+
+        Args:
+            name (str): Span name.
+            **args: Extra values shown in the trace viewer's details pane.
+        """
+        memory_before = get_process_memory_mb()
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            memory_after = get_process_memory_mb()
+            event_args = dict(args)
+            if memory_before is not None and memory_after is not None:
+                event_args["memory_before_mb"] = round(memory_before, 1)
+                event_args["memory_after_mb"] = round(memory_after, 1)
+            with self._lock:
+                self.events.append({
+                    "name": name, "cat": "export", "ph": "X", "ts": start, "dur": end - start,
+                    "pid": self.pid, "tid": threading.get_ident(), "args": event_args,
+                })
+                if memory_after is not None:
+                    self.events.append({
+                        "name": "memory", "ph": "C", "ts": end, "pid": self.pid,
+                        "args": {"rss_mb": round(memory_after, 1)},
+                    })
+
+    def write(self, trace_path):
+        """
+        Writes the trace (and the cProfile stats next to it when captured).
+
+        Args:
+            trace_path (str): Output ``.json`` path.
+
+        Returns:
+            str: The trace path, or None if it couldn't be written.
+        """
+        try:
+            trace_dir = os.path.dirname(trace_path)
+            if trace_dir and not os.path.isdir(trace_dir):
+                os.makedirs(trace_dir)
+            with open(trace_path, "w") as trace_file:
+                json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, trace_file)
+            if self.profiler is not None:
+                stats_path = trace_path[:-len(".trace.json")] if trace_path.endswith(".trace.json") else \
+                    os.path.splitext(trace_path)[0]
+                self.profiler.dump_stats(stats_path + ".prof")
+        except (IOError, OSError) as e:
+            logger.warning(f"Failed to write profile {trace_path}: {e}")
+            return None
+        logger.info(f"Export profile written to {trace_path}")
+        return trace_path
+
+
+def traced(name=None, args=()):
+    """
+    Decorator recording a span for every call while a tracer is active. Works on generator
+    functions too, in which case the span covers the whole iteration.
+
+    Args:
+        name (str): Span name, defaults to the function's qualified name.
+        args (tuple): Names of parameters whose values are recorded on the span.
+    """
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+        signature = inspect.signature(func) if args else None
+
+        def span_args(call_args, call_kwargs):
+            if not signature:
+                return {}
+            bound = signature.bind_partial(*call_args, **call_kwargs)
+            return {arg: str(bound.arguments[arg]) for arg in args if arg in bound.arguments}
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*call_args, **call_kwargs):
+                tracer = _active_tracer
+                if tracer is None:
+                    return (yield from func(*call_args, **call_kwargs))
+                with tracer.span(span_name, **span_args(call_args, call_kwargs)):
+                    return (yield from func(*call_args, **call_kwargs))
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*call_args, **call_kwargs):
+            tracer = _active_tracer
+            if tracer is None:
+                return func(*call_args, **call_kwargs)
+            with tracer.span(span_name, **span_args(call_args, call_kwargs)):
+                return func(*call_args, **call_kwargs)
+        return wrapper
+
+    return decorator
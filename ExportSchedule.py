@@ -0,0 +1,348 @@
+"""
+Cost model and scheduler for batch exports.
+
+Before a batch starts, every job gets an expected duration from cheap metadata: its frame range
+(the settings, or the playback range saved in the scene), the number of character namespaces and
+cameras it will export (the scene's references), and per-rig seconds per frame learnt from the
+manifests of previous runs of the same shots. Jobs are then handed to the worker pool longest
+expected first, and the FBX and Alembic halves of an "all" job become separate jobs when that
+shortens the batch.
+
+Nothing here needs Maya; the scene is read as a file:
+
+    python ExportWorker.py jobs.json --workers 4 --report schedule.json
+"""
+import os
+import re
+import heapq
+import logging
+from dataclasses import dataclass, field, replace
+
+from ExportManifest import load_manifests
+from ExportNames import namespace_matches
+
+logger = logging.getLogger(__name__)
+
+# Seconds per exported frame of one asset when no manifest of the rig exists yet
+DEFAULT_SECONDS_PER_FRAME = {"character": 0.05, "camera": 0.002, "abc": 0.03}
+# Scene open, plug-in work and reset that every job pays regardless of its assets
+DEFAULT_JOB_OVERHEAD = 30.0
+DEFAULT_FRAMES = 120
+# Number of previous runs averaged per rig
+HISTORY_RUNS = 5
+# How much of the end of a scene file is searched for the saved playback range
+SCENE_TAIL_BYTES = 256 * 1024
+
+# The header lists each reference twice: "file -rdi <depth> ..." for the reference and its nested
+# references, then "file -r ..." for the top-level ones that are loaded with the scene
+_REFERENCE_NAMESPACE = re.compile(r'^file\s+-r\s[^;]*?-ns\s+"([^"]+)"', re.MULTILINE)
+_PLAYBACK_RANGE = re.compile(rb"playbackOptions -min (-?[\d.]+) -max (-?[\d.]+)")
+
+
+@dataclass
+class SceneMetadata:
+    """
+    What can be read from a scene file without opening it in Maya.
+
+    Attributes:
+        namespaces (list): Namespaces of the scene's references, empty if unknown.
+        frame_range (tuple): Saved playback (start, end), None if not found.
+    """
+    namespaces: list = field(default_factory=list)
+    frame_range: tuple = None
+
+
+def reference_namespaces(header):
+    """
+    Lists the namespaces of the top-level references in a Maya ASCII header.
+
+    >>> reference_namespaces('''//Maya ASCII 2022 scene
+    ... file -rdi 1 -ns "Bob" -rfn "BobRN" -op "v=0;" -typ "mayaAscii" "/rigs/bob.ma";
+    ... file -rdi 2 -ns "face" -rfn "Bob:faceRN" -op "v=0;" -typ "mayaAscii" "/rigs/face.ma";
+    ... file -rdi 1 -ns "Alice" -rfn "AliceRN" -op "v=0;" -typ "mayaAscii"
+    ...      "/rigs/alice.ma";
+    ... file -r -ns "Bob" -dr 1 -rfn "BobRN" -op "v=0;" -typ "mayaAscii" "/rigs/bob.ma";
+    ... file -r -ns "Alice" -dr 1 -rfn "AliceRN" -op "v=0;" -typ "mayaAscii"
+    ...      "/rigs/alice.ma";
+    ... requires maya "2022";
+    ... ''')
+    ['Bob', 'Alice']
+
+    Args:
+        header (str): The scene file up to its first ``createNode``.
+
+    Returns:
+        list: Namespaces, in file order.
+    """
+    return _REFERENCE_NAMESPACE.findall(header)
+
+
+def scene_metadata(scene):
+    """
+    Reads reference namespaces and the playback range from a scene file.
+
+    Reference namespaces are only readable from Maya ASCII files, where the ``file -r`` commands
+    come before the first ``createNode``. The playback range is stored as a plain string in both
+    .ma and .mb files, near the end of the file.
+
+    Args:
+        scene (str): Path of the Maya scene.
+
+    Returns:
+        SceneMetadata: Empty if the scene can't be read.
+    """
+    metadata = SceneMetadata()
+    try:
+        if scene.lower().endswith(".ma"):
+            head = []
+            with open(scene, encoding="utf-8", errors="replace") as scene_file:
+                for line in scene_file:
+                    if line.startswith("createNode"):
+                        break
+                    head.append(line)
+            metadata.namespaces = reference_namespaces("".join(head))
+
+        with open(scene, "rb") as scene_file:
+            scene_file.seek(0, os.SEEK_END)
+            scene_file.seek(max(0, scene_file.tell() - SCENE_TAIL_BYTES))
+            matches = _PLAYBACK_RANGE.findall(scene_file.read())
+        if matches:
+            start, end = matches[-1]
+            metadata.frame_range = (int(float(start)), int(float(end)))
+    except (IOError, OSError) as e:
+        logger.warning(f"Can't read scene metadata from {scene}: {e}")
+    return metadata
+
+
+@dataclass
+class JobEstimate:
+    """
+    Expected cost of one batch job.
+
+    Attributes:
+        job (ExportWorker.BatchJob): The job.
+        seconds (float): Expected duration, including ``CostModel.job_overhead``.
+        frames (int): Frames the job is expected to export, handles included.
+        assets (dict): Expected asset count per kind.
+    """
+    job: object
+    seconds: float
+    frames: int
+    assets: dict = field(default_factory=dict)
+
+
+class CostModel(object):
+    """
+    Predicts job durations from scene metadata and the manifests of earlier runs.
+
+    Seconds per frame are learnt per (asset kind, rig name) from written assets of the last
+    ``HISTORY_RUNS`` runs of each shot; time spent on a batch bake or combined Alembic export is
+    divided by the number of assets that shared it. Rigs never exported before fall back to the
+    average of their kind over all loaded history, then to ``DEFAULT_SECONDS_PER_FRAME``.
+
+    Args:
+        job_overhead (float): Fixed seconds added to every job.
+    """
+
+    def __init__(self, job_overhead=DEFAULT_JOB_OVERHEAD):
+        self.job_overhead = job_overhead
+        self.rates = {}
+        self.shots = {}
+        self.scenes = {}
+        self._loaded = set()
+
+    def load_history(self, export_dir):
+        """
+        Learns from the manifests of one shot export directory, once per directory.
+
+        Returns:
+            list: The last ``HISTORY_RUNS`` manifests of the shot.
+        """
+        export_dir = os.path.normpath(export_dir)
+        if export_dir in self._loaded:
+            return self.shots.get(export_dir, [])
+        self._loaded.add(export_dir)
+        manifests = [manifest for manifest in load_manifests(export_dir) if manifest.get("assets")]
+        manifests = manifests[-HISTORY_RUNS:]
+        self.shots[export_dir] = manifests
+        for manifest in manifests:
+            for entry in manifest["assets"]:
+                rate = self.entry_rate(entry)
+                if rate is not None:
+                    self.rates.setdefault((entry["kind"], entry["name"]), []).append(rate)
+        return manifests
+
+    @staticmethod
+    def entry_rate(entry):
+        """
+        Returns:
+            float: Seconds per frame spent on a written manifest entry, None if unusable.
+        """
+        if entry.get("status") != "written" or not entry.get("frame_range"):
+            return None
+        start, end = entry["frame_range"]
+        frames = end - start + 1
+        if frames <= 0:
+            return None
+        timings = entry.get("timings", {})
+        seconds = sum(
+            timings.get(phase, 0.0) / max(1, timings.get(f"{phase}_shared_with", 1))
+            for phase in ("discovery", "bake", "write")
+        )
+        return seconds / frames
+
+    def seconds_per_frame(self, kind, name):
+        rates = self.rates.get((kind, name))
+        if rates:
+            return sum(rates) / len(rates)
+        kind_rates = [rate for (rate_kind, _), values in self.rates.items() if rate_kind == kind for rate in values]
+        if kind_rates:
+            return sum(kind_rates) / len(kind_rates)
+        return DEFAULT_SECONDS_PER_FRAME[kind]
+
+    def estimate(self, job):
+        """
+        Estimates a job's duration.
+
+        Args:
+            job (ExportWorker.BatchJob): The job.
+
+        Returns:
+            JobEstimate: The estimate.
+        """
+        settings = job.settings
+        history = self.load_history(job_export_dir(job))
+        metadata = self.scenes.get(job.scene)
+        if metadata is None:
+            metadata = self.scenes[job.scene] = scene_metadata(job.scene)
+
+        frames = self.job_frames(settings, metadata, history)
+        units = []
+        if job.mode in ("fbx", "all"):
+            units += [("camera", name, 1) for name in settings.get("camera_names", [])]
+            units += [
+                ("character", name, self.namespace_count("character", name, metadata, history))
+                for name in settings.get("character_names", [])
+            ]
+        if job.mode in ("abc", "all"):
+            units += [
+                ("abc", name, self.namespace_count("abc", name, metadata, history))
+                for name in settings.get("abc_names", [])
+            ]
+
+        seconds = self.job_overhead
+        assets = {}
+        for kind, name, count in units:
+            seconds += count * frames * self.seconds_per_frame(kind, name)
+            assets[kind] = assets.get(kind, 0) + count
+        return JobEstimate(job, seconds, frames, assets)
+
+    @staticmethod
+    def job_frames(settings, metadata, history):
+        """
+        Frames a job exports, resolved like ``ExportJob.get_time_range``: the settings' range,
+        else the scene's playback range, else the last run's, with handles on both ends.
+        """
+        offset = settings.get("offset", 0) or 0
+        start, end = settings.get("start_frame"), settings.get("end_frame")
+        if metadata.frame_range:
+            start = metadata.frame_range[0] if start is None else start
+            end = metadata.frame_range[1] if end is None else end
+        if start is not None and end is not None:
+            return max(1, end - start + 1 + 2 * offset)
+        for manifest in reversed(history):
+            ranges = [entry["frame_range"] for entry in manifest["assets"] if entry.get("frame_range")]
+            if ranges:
+                return max(1, max(last for _, last in ranges) - min(first for first, _ in ranges) + 1)
+        return DEFAULT_FRAMES + 2 * offset
+
+    @staticmethod
+    def namespace_count(kind, name, metadata, history):
+        """
+        Namespaces a character is expected to be exported for: the scene's matching references,
+        else the last run's asset count, else one.
+        """
+        if metadata.namespaces:
+            return sum(1 for namespace in metadata.namespaces if namespace_matches(namespace, name))
+        for manifest in reversed(history):
+            count = sum(1 for entry in manifest["assets"] if entry["kind"] == kind and entry["name"] == name)
+            if count:
+                return count
+        return 1
+
+
+def job_export_dir(job):
+    return os.path.join(job.settings.get("file_path", ""), job.settings.get("shot_name", ""))
+
+
+def split_job(job):
+    """
+    Splits an "all" job into its FBX and Alembic halves.
+
+    Returns:
+        list: Two jobs, or the job itself if it can't be split. Packaged jobs are never split,
+            since each half would write its own archive.
+    """
+    settings = job.settings
+    if job.mode != "all" or settings.get("package") or not settings.get("abc_names"):
+        return [job]
+    if not settings.get("character_names") and not settings.get("camera_names"):
+        return [job]
+    return [replace(job, mode="fbx"), replace(job, mode="abc")]
+
+
+def lpt_makespan(seconds, workers):
+    """
+    Simulates longest-processing-time-first list scheduling.
+
+    Args:
+        seconds (list): Job durations.
+        workers (int): Number of workers.
+
+    Returns:
+        float: Time until the last worker finishes.
+    """
+    loads = [0.0] * max(1, workers)
+    for duration in sorted(seconds, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+    return max(loads)
+
+
+def schedule(jobs, workers, model=None):
+    """
+    Orders jobs longest expected first and splits "all" jobs where that shortens the batch.
+
+    Jobs are tried longest first; a split is kept if the predicted makespan drops, which pays
+    for the second scene open only when a long job would otherwise finish last. Submitting the
+    result in order to a FIFO ``WorkerPool`` gives LPT scheduling.
+
+    Args:
+        jobs (list): ``ExportWorker.BatchJob``s.
+        workers (int): Number of workers.
+        model (CostModel): Cost model, a default one if None.
+
+    Returns:
+        list: ``JobEstimate``s, longest first.
+    """
+    model = model or CostModel()
+    # Learn from every shot's history before estimating, so unknown rigs get the batch-wide average
+    for job in jobs:
+        model.load_history(job_export_dir(job))
+    estimates = [model.estimate(job) for job in jobs]
+    planned = sorted(estimates, key=lambda estimate: estimate.seconds, reverse=True)
+    makespan = lpt_makespan([estimate.seconds for estimate in planned], workers)
+
+    for estimate in list(planned):
+        halves = split_job(estimate.job)
+        if len(halves) == 1:
+            continue
+        candidate = [other for other in planned if other is not estimate]
+        candidate += [model.estimate(half) for half in halves]
+        candidate_makespan = lpt_makespan([other.seconds for other in candidate], workers)
+        if candidate_makespan < makespan:
+            logger.info(f"Splitting {estimate.job.scene} into FBX and Alembic jobs")
+            planned, makespan = candidate, candidate_makespan
+
+    planned.sort(key=lambda estimate: estimate.seconds, reverse=True)
+    logger.info(f"Scheduled {len(planned)} jobs on {workers} workers, predicted makespan {makespan:.0f}s")
+    return planned
@@ -0,0 +1,77 @@
+"""
+Camera Sequencer shots of a layout scene.
+
+A sequence export bakes the union of all shot ranges once and then slices every shot's files out
+of that bake, instead of opening and baking the scene once per shot. This module only reads the
+shots; the slicing is done by ``ExportCore.ExportJob``.
+"""
+import logging
+from dataclasses import dataclass
+
+import maya.cmds as cm
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SequencerShot:
+    """
+    One Camera Sequencer shot.
+
+    Attributes:
+        name (str): Shot name, used for the export directory and file prefix.
+        node (str): The ``shot`` node.
+        camera (str): Camera transform the shot looks through, None if it has none.
+        start (int): First scene frame of the shot.
+        end (int): Last scene frame of the shot.
+        sequence_start (int): Where the shot starts in the sequence, used for ordering.
+    """
+    name: str
+    node: str
+    camera: str
+    start: int
+    end: int
+    sequence_start: int = 0
+
+
+def _shot_camera(node):
+    camera = cm.shot(node, query=True, currentCamera=True)
+    if camera and cm.objectType(camera) == "camera":
+        camera = (cm.listRelatives(camera, parent=True) or [camera])[0]
+    return camera or None
+
+
+def list_sequencer_shots(names=None):
+    """
+    Lists the scene's unmuted sequencer shots in sequence order.
+
+    Args:
+        names (list): Only return shots with these shot (or node) names; all shots if empty.
+
+    Returns:
+        list: ``SequencerShot``s.
+    """
+    shots = []
+    for node in cm.ls(type="shot") or []:
+        name = cm.getAttr(f"{node}.shotName") or node
+        if names and name not in names and node not in names:
+            continue
+        if cm.shot(node, query=True, mute=True):
+            logger.info(f"Skipping muted shot {name}")
+            continue
+        if abs(cm.getAttr(f"{node}.scale") - 1.0) > 1e-6:
+            logger.warning(f"Shot {name} is retimed in the sequence; it is exported in scene time")
+        shots.append(SequencerShot(
+            name=name,
+            node=node,
+            camera=_shot_camera(node),
+            start=int(round(cm.getAttr(f"{node}.startFrame"))),
+            end=int(round(cm.getAttr(f"{node}.endFrame"))),
+            sequence_start=int(round(cm.getAttr(f"{node}.sequenceStartFrame"))),
+        ))
+
+    if names:
+        missing = set(names).difference(name for shot in shots for name in (shot.name, shot.node))
+        for name in sorted(missing):
+            logger.warning(f"Sequencer shot {name} not found")
+    return sorted(shots, key=lambda shot: (shot.sequence_start, shot.name))
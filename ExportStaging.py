@@ -0,0 +1,121 @@
+"""
+Local staging of export files.
+
+Maya's FBX and Alembic writers do many small seeks and writes, which is slow on a network share
+and leaves half-written files there if Maya dies. With staging, files are written to a local
+directory and copied to the share by a thread pool while the next asset is being exported. Each
+copy goes to a hidden temporary file next to the destination and is renamed into place, so
+consumers of the share never see a partial file.
+"""
+import os
+import uuid
+import shutil
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_WORKERS = 4
+
+
+def default_staging_dir():
+    """
+    Returns:
+        str: Staging root on the local temp drive.
+    """
+    return os.path.join(tempfile.gettempdir(), "ExportToolStaging").replace(os.sep, '/')
+
+
+def copy_atomic(source, destination):
+    """
+    Copies a file so that ``destination`` only ever appears complete.
+
+    Args:
+        source (str): Local file.
+        destination (str): Final path, usually on a network share.
+    """
+    destination_dir, name = os.path.split(destination)
+    temp_path = os.path.join(destination_dir, f".{name}.{uuid.uuid4().hex[:8]}.partial")
+    try:
+        shutil.copyfile(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class StagingUploader(object):
+    """
+    Hands out local paths for output files and uploads them in the background.
+
+    Args:
+        staging_dir (str): Local directory the files are written to.
+        workers (int): Copies in flight at once.
+    """
+
+    def __init__(self, staging_dir, workers=DEFAULT_UPLOAD_WORKERS):
+        self.staging_dir = staging_dir
+        if not os.path.isdir(staging_dir):
+            os.makedirs(staging_dir)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ExportUpload")
+        self.pending = []
+
+    def staged_path(self, output_path):
+        """
+        Returns:
+            str: Where to write an output file locally.
+        """
+        return os.path.join(self.staging_dir, os.path.basename(output_path)).replace(os.sep, '/')
+
+    def upload(self, staged_path, output_path, item=None):
+        """
+        Queues the copy of a written file to its final location.
+
+        Args:
+            staged_path (str): The local file.
+            output_path (str): The final path.
+            item: Anything the caller wants back from ``completed`` (the export asset).
+        """
+        future = self.executor.submit(self._upload, staged_path, output_path)
+        self.pending.append((item, future))
+        return future
+
+    @staticmethod
+    def _upload(staged_path, output_path):
+        copy_atomic(staged_path, output_path)
+        os.remove(staged_path)
+        logger.info(f"Uploaded {output_path}")
+
+    def completed(self, wait=True):
+        """
+        Yields finished uploads in submission order, removing them from the pending list.
+
+        Args:
+            wait (bool): Block until each upload is done; otherwise stop at the first unfinished one.
+
+        Yields:
+            tuple: (item, error), error being None on success.
+        """
+        while self.pending:
+            item, future = self.pending[0]
+            if not wait and not future.done():
+                return
+            self.pending.pop(0)
+            error = None
+            try:
+                future.result()
+            except Exception as e:
+                error = e
+            yield item, error
+
+    def cancel(self):
+        """
+        Drops uploads that haven't started; copies in flight still finish.
+        """
+        for _, future in self.pending:
+            future.cancel()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
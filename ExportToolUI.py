@@ -0,0 +1,742 @@
+"""
+Qt widgets of the export tool. Imported by ``ExportTool`` when the window is first shown.
+"""
+from shiboken2 import wrapInstance
+
+import os
+import time
+import maya.cmds as cm
+# import pymel.core as pm
+import maya.OpenMaya as oMaya
+import maya.OpenMayaUI as oMayaUI
+
+from PySide2 import QtWidgets, QtCore, QtGui
+
+from ExportCore import FBX_VERSIONS, ExportSettings, ExportJob, FbxOptionProfile
+from ExportStaging import default_staging_dir
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# import sys
+
+
+class QHLine(QtWidgets.QFrame):
+
+    def __init__(self):
+        super(QHLine, self).__init__()
+        self.setFrameShape(self.HLine)
+        self.setFrameShadow(self.Sunken)
+
+
+class QVLine(QtWidgets.QFrame):
+
+    def __init__(self):
+        super(QVLine, self).__init__()
+        self.setFrameShape(self.VLine)
+        self.setFrameShadow(self.Sunken)
+
+
+class QHLineName(QtWidgets.QGridLayout):
+
+    def __init__(self, name):
+        super(QHLineName, self).__init__()
+        name_lb = QtWidgets.QLabel(name)
+        name_lb.setAlignment(QtCore.Qt.AlignCenter)
+        name_lb.setStyleSheet("font: italic 9pt;" "color: azure;")
+        self.addWidget(name_lb, 0, 0, 1, 1)
+        self.addWidget(QHLine(), 0, 1, 1, 2)
+
+
+class ExportRunner(QtCore.QObject):
+    """
+    Drives an ``ExportJob`` one step per Qt event loop iteration, so the UI stays responsive
+    between assets and the export can be cancelled.
+    """
+    progress = QtCore.Signal(object)
+    finished = QtCore.Signal(bool)
+
+    def __init__(self, job, mode, parent=None):
+        super(ExportRunner, self).__init__(parent)
+        self.job = job
+        self.steps = job.iter_steps(mode)
+        self.start_time = None
+        self.cancelled = False
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.run_next_step)
+
+    def start(self):
+        self.start_time = time.time()
+        self.timer.start()
+
+    def elapsed(self):
+        return time.time() - self.start_time if self.start_time else 0.0
+
+    def run_next_step(self):
+        try:
+            event = next(self.steps)
+        except StopIteration:
+            self.timer.stop()
+            self.finished.emit(not self.job.failures)
+            return
+        except Exception as e:
+            self.timer.stop()
+            self.job.report_error("Unexpected error during export", e)
+            self.finished.emit(False)
+            return
+        self.progress.emit(event)
+
+    def cancel(self):
+        """
+        Stops after the current step; closing the steps cleans up temporary nodes.
+        """
+        if not self.timer.isActive():
+            return
+        self.timer.stop()
+        self.cancelled = True
+        self.steps.close()
+        logger.warning("Export cancelled.")
+        self.finished.emit(False)
+
+
+# noinspection PyAttributeOutsideInit
+class ExportTool(QtWidgets.QWidget):
+    fbxVersions = FBX_VERSIONS
+
+    export_started = QtCore.Signal(object)
+
+    def __init__(self):
+        super(ExportTool, self).__init__()
+
+        self.runner = None
+
+        self.create_widgets()
+        self.create_layouts()
+        self.create_connections()
+
+    def create_widgets(self):
+        self.file_path_lb = QtWidgets.QLabel("File path: ")
+        self.file_path_le = QtWidgets.QLineEdit()
+
+        self.select_file_path_btn = QtWidgets.QPushButton('')
+        self.select_file_path_btn.setIcon(QtGui.QIcon(':fileOpen.png'))
+        self.select_file_path_btn.setToolTip('Select File')
+
+        self.shot_name_lb = QtWidgets.QLabel("Shot name: ")
+        self.shot_name_le = QtWidgets.QLineEdit()
+
+        self.object_name_lb = QtWidgets.QLabel("Object name: ")
+        self.object_name_le = QtWidgets.QLineEdit()
+
+        self.cam_name_lb = QtWidgets.QLabel("Cam name:")
+        self.cam_name_le = QtWidgets.QLineEdit()
+        self.cam_name_btn = QtWidgets.QPushButton("Assign")
+
+        self.star_time_lb = QtWidgets.QLabel("Start: ")
+        self.star_time_le = QtWidgets.QLineEdit()
+        self.end_time_lb = QtWidgets.QLabel("End: ")
+        self.end_time_le = QtWidgets.QLineEdit()
+
+        self.offset_lb = QtWidgets.QLabel("Time Offset:")
+        self.offset_spinbox = QtWidgets.QSpinBox()
+        self.offset_spinbox.setRange(0, 100)  # Allow up to 100 frames of offset
+        self.offset_spinbox.setValue(0)  # Default to 0
+
+        self.bake_cb = QtWidgets.QCheckBox("Bake Animation")
+        self.bake_cb.setChecked(True)
+
+        self.fast_bake_cb = QtWidgets.QCheckBox("Fast bake")
+        self.fast_bake_cb.setToolTip("Suspend viewport refresh and use parallel evaluation while exporting")
+
+        self.camera_data_cb = QtWidgets.QCheckBox("UE camera data")
+        self.camera_data_cb.setToolTip("Also write cameras as .camera.json tables for UnrealCameraImport.py")
+
+        self.reduce_keys_cb = QtWidgets.QCheckBox("Reduce keys")
+        self.reduce_keys_cb.setToolTip("After baking, remove static channels and redundant keys "
+                                       "(smaller FBX files, faster Unreal import)")
+
+        self.fbxVersion_combobox = QtWidgets.QComboBox()
+        for fbxVersion in sorted(self.fbxVersions):
+            self.fbxVersion_combobox.addItem(fbxVersion)
+            self.fbxVersion_combobox.setCurrentText("2019")
+
+        self.fbx_export_btn = QtWidgets.QPushButton("FBX Export")
+        self.fbx_export_btn.setStyleSheet(
+            'QPushButton {background-color: lightyellow; color: black;}'
+        )
+
+        self.abc_mesh_name_lb = QtWidgets.QLabel("Char name: ")
+        self.abc_mesh_name_le = QtWidgets.QLineEdit()
+
+        self.force_rebuild_cb = QtWidgets.QCheckBox("Force rebuild")
+        self.force_rebuild_cb.setToolTip("Re-export every asset, even the ones unchanged since the last export")
+
+        self.stage_locally_cb = QtWidgets.QCheckBox("Stage locally")
+        self.stage_locally_cb.setToolTip(f"Write files to {default_staging_dir()} first and copy them to the "
+                                         f"file path in the background")
+
+        self.package_cb = QtWidgets.QCheckBox("Package")
+        self.package_cb.setToolTip("Compress the shot's files into <file path>/<shot name>.zip while exporting")
+
+        self.sequencer_cb = QtWidgets.QCheckBox("Sequencer shots")
+        self.sequencer_cb.setToolTip("Export every Camera Sequencer shot into <file path>/<shot>, baking the "
+                                     "scene once; the shot name names the manifest and package")
+
+        self.profile_cb = QtWidgets.QCheckBox("Profile")
+        self.profile_cb.setToolTip("Write a Chrome trace of the export (chrome://tracing, Perfetto) "
+                                   "into the shot's .export_profiles folder")
+
+        self.export_all_btn = QtWidgets.QPushButton("Export All")
+        self.export_all_btn.setStyleSheet(
+            'QPushButton {background-color: lightyellow; color: black;}'
+        )
+
+        self.abc_export_btn = QtWidgets.QPushButton("ABC Export")
+        self.abc_export_btn.setStyleSheet(
+            'QPushButton {background-color: lightyellow; color: black;}'
+        )
+
+    def create_layouts(self):
+        file_option_layout = QtWidgets.QGridLayout()
+        file_option_layout.addWidget(self.file_path_lb, 0, 0)
+        file_option_layout.addWidget(self.file_path_le, 0, 1)
+        file_option_layout.addWidget(self.select_file_path_btn, 0, 2)
+
+        scene_option_layout = QtWidgets.QGridLayout()
+        scene_option_layout.addWidget(self.shot_name_lb, 0, 0, 1, 1)
+        scene_option_layout.addWidget(self.shot_name_le, 0, 1, 1, 2)
+
+        scene_option_layout.addWidget(self.object_name_lb, 1, 0, 1, 1)
+        scene_option_layout.addWidget(self.object_name_le, 1, 1, 1, 2)
+        scene_option_layout.addWidget(self.cam_name_lb, 2, 0, 1, 1)
+        scene_option_layout.addWidget(self.cam_name_le, 2, 1, 1, 1)
+        scene_option_layout.addWidget(self.cam_name_btn, 2, 2, 1, 1)
+
+        time_option_layout = QtWidgets.QVBoxLayout()
+        time_layout = QtWidgets.QHBoxLayout()
+        time_layout.addWidget(self.star_time_lb)
+        time_layout.addWidget(self.star_time_le)
+        time_layout.addWidget(self.end_time_lb)
+        time_layout.addWidget(self.end_time_le)
+        time_layout.addWidget(self.offset_lb)
+        time_layout.addWidget(self.offset_spinbox)
+
+        time_option_layout.addLayout(time_layout)
+
+        fbx_bake_layout = QtWidgets.QHBoxLayout()
+        fbx_bake_layout.addWidget(self.fast_bake_cb)
+        fbx_bake_layout.addWidget(self.reduce_keys_cb)
+        fbx_bake_layout.addWidget(self.camera_data_cb)
+
+        fbx_option_layout = QtWidgets.QHBoxLayout()
+        fbx_option_layout.addWidget(self.bake_cb)
+        fbx_option_layout.addWidget(self.fbxVersion_combobox)
+        fbx_option_layout.addWidget(self.fbx_export_btn)
+
+        abc_export_layout = QtWidgets.QHBoxLayout()
+        abc_export_layout.addWidget(self.abc_mesh_name_lb)
+        abc_export_layout.addWidget(self.abc_mesh_name_le)
+        abc_export_layout.addWidget(self.abc_export_btn)
+
+        export_all_layout = QtWidgets.QHBoxLayout()
+        export_all_layout.addWidget(self.force_rebuild_cb)
+        export_all_layout.addWidget(self.profile_cb)
+        export_all_layout.addWidget(self.export_all_btn)
+
+        delivery_layout = QtWidgets.QHBoxLayout()
+        delivery_layout.addWidget(self.stage_locally_cb)
+        delivery_layout.addWidget(self.package_cb)
+        delivery_layout.addWidget(self.sequencer_cb)
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addLayout(QHLineName("File option"))
+        main_layout.addLayout(file_option_layout)
+        main_layout.addLayout(QHLineName("Scene option"))
+        main_layout.addLayout(scene_option_layout)
+        main_layout.addLayout(QHLineName("Time option"))
+        main_layout.addLayout(time_option_layout)
+        main_layout.addLayout(QHLineName("Fbx option"))
+        main_layout.addLayout(fbx_bake_layout)
+        main_layout.addLayout(fbx_option_layout)
+        main_layout.addLayout(QHLineName("Abc option"))
+        main_layout.addLayout(abc_export_layout)
+        main_layout.addLayout(QHLineName("Export All"))
+        main_layout.addLayout(delivery_layout)
+        main_layout.addLayout(export_all_layout)
+
+    def create_connections(self):
+        self.select_file_path_btn.clicked.connect(self.show_file_select_dialog)
+        self.fbx_export_btn.clicked.connect(self.fbx_export)
+        self.cam_name_btn.clicked.connect(self.assign_cam_button)
+        self.abc_export_btn.clicked.connect(self.abc_export)
+        self.export_all_btn.clicked.connect(self.export_all)
+
+    def assign_cam_button(self):
+        """
+        Assigns selected cameras from the Maya scene to the tool's camera name field.
+
+        This function checks for selected objects in the Maya scene and filters out any non-camera objects.
+        If no cameras are found or if nothing is selected, appropriate errors are logged and displayed.
+        """
+        try:
+            # Get the currently selected objects in the Maya scene
+            selected_objects = cm.ls(selection=True)
+            if not selected_objects:
+                oMaya.MGlobal.displayError("Please select at least one camera.")
+                return
+
+            # Filter out cameras from the selected objects
+            selected_cameras = []
+            for obj in selected_objects:
+                # Check if the object or its children are cameras
+                obj_children = cm.listRelatives(obj, children=True, fullPath=True) or []
+                for child in obj_children or [obj]:
+                    if cm.objectType(child) == 'camera':
+                        selected_cameras.append(obj)
+                        break  # Only add the first valid camera per object
+
+            if not selected_cameras:
+                # Log and display an error if no cameras were found in the selection
+                logger.warning("No cameras selected or found in the selected objects.")
+                oMaya.MGlobal.displayError("No cameras detected in the selected objects.")
+                return
+
+            # Format the list of selected cameras as a comma-separated string
+            formatted_cameras = ", ".join(selected_cameras)
+            self.cam_name_le.setText(formatted_cameras)
+
+            # Log the successful assignment of cameras
+            logger.info(f"Assigned cameras: {formatted_cameras}")
+
+        except Exception as e:
+            logger.error(f"Unexpected error in assign_cam_button: {e}")
+            oMaya.MGlobal.displayError(f"Error occurred while assigning cameras: {e}")
+
+    def get_list_camera_name(self):
+        """
+        Fetches and returns a cleaned list of camera names from the input field.
+
+        Returns:
+            list: A list of camera names if valid input exists.
+                  An empty list if the input is empty or invalid.
+        """
+        # Get raw input from the camera name field
+        raw_input = self.cam_name_le.text().strip()
+
+        if raw_input:
+            # Clean the input by removing unnecessary spaces and splitting by commas
+            camera_names = [name.strip() for name in raw_input.split(",") if name.strip()]
+
+            # Log and return the cleaned list of camera names
+            if camera_names:
+                logger.info(f"Camera names extracted: {camera_names}")
+                return camera_names
+            else:
+                logger.warning("Input contains only whitespace or invalid camera names.")
+                return []
+        else:
+            logger.warning("Camera name input is empty.")
+            return []
+
+    def show_file_select_dialog(self):
+        self.file_path = QtWidgets.QFileDialog.getExistingDirectory(self, 'Select directory')
+
+        self.file_path_le.setText(self.file_path)
+
+    def get_convert_file_path(self):
+        """
+        Converts the input file path to a normalized format and validates its existence.
+
+        Returns:
+            str: The converted file path with forward slashes if it exists.
+            None: If the file path doesn't exist, displays an error and returns None.
+        """
+        # Get the raw file path from the input field
+        raw_path = self.file_path_le.text().strip()
+
+        if raw_path:
+            # Normalize the file path (replace backslashes with forward slashes)
+            normalized_path = raw_path.replace("\\", "/")
+
+            # Check if the directory exists
+            if os.path.isdir(normalized_path):
+                logger.info(f"Valid file path: {normalized_path}")
+                return normalized_path
+            else:
+                logger.error(f"File path does not exist: {normalized_path}")
+                oMaya.MGlobal.displayError("File path doesn't exist. Please select a valid directory.")
+                return None
+        else:
+            logger.warning("File path input is empty.")
+            oMaya.MGlobal.displayError("File path cannot be empty.")
+            return None
+
+    def get_shot_name(self):
+        """
+        Assign shot name for this scene
+
+        Returns:
+            Shot name(str)
+        """
+
+        shot_name = self.shot_name_le.text()
+        if len(shot_name) == 0:
+            logger.error("Shot name is empty")
+            return oMaya.MGlobal_displayError("Shot name can't be empty")
+        return shot_name
+
+    def get_list_character_name(self):
+        """
+        Fetches a cleaned list of character names from the input field.
+
+        Returns:
+            list: A list of character names (if input exists). An empty list if input is empty.
+        """
+        # Get raw input
+        raw_input = self.object_name_le.text()
+
+        if raw_input:
+            # Clean input by stripping unnecessary spaces and splitting by commas
+            character_names = [name.strip() for name in raw_input.split(",") if name.strip()]
+
+            # Return cleaned list
+            if character_names:
+                logger.info(f"Character names extracted: {character_names}")
+                return character_names
+            else:
+                logger.warning("Input contains only whitespace or invalid data.")
+                return []
+        else:
+            logger.warning("Character name input is empty.")
+            return []
+
+    def get_list_abc_mesh_name(self):
+        """
+        Fetches a cleaned list of Alembic mesh names from the input field.
+
+        Returns:
+            list: A list of mesh names (if input exists). An empty list if input is empty or contains only invalid data.
+        """
+        # Get raw input
+        raw_input = self.abc_mesh_name_le.text()
+
+        if raw_input:
+            # Clean input by stripping unnecessary spaces and splitting by commas
+            mesh_names = [name.strip() for name in raw_input.split(",") if name.strip()]
+
+            # Return cleaned list
+            if mesh_names:
+                logger.info(f"Alembic mesh names extracted: {mesh_names}")
+                return mesh_names
+            else:
+                logger.warning("Alembic mesh name input contains only whitespace or invalid data.")
+                return []
+        else:
+            logger.warning("Alembic mesh name input is empty.")
+            return []
+
+    def get_frame_override(self, line_edit, label):
+        """
+        Reads an optional frame number from one of the time fields.
+
+        Args:
+            line_edit (QLineEdit): The start or end time field.
+            label (str): "Start" or "End", used in error messages.
+
+        Returns:
+            int: The frame, or None if the field is empty.
+
+        Raises:
+            ValueError: If the field doesn't contain an integer.
+        """
+        text = line_edit.text().strip()
+        if not text:
+            return None
+        try:
+            return int(text)
+        except ValueError:
+            logger.error(f"Invalid {label} Frame value provided.")
+            oMaya.MGlobal.displayError(f"{label} time must be a valid integer.")
+            raise
+
+    def get_export_settings(self):
+        """
+        Collects the tool's fields into export settings for the export core.
+
+        Returns:
+            ExportSettings: The settings, or None if a required field is missing or invalid.
+        """
+        filepath = self.get_convert_file_path()
+        shot_name = self.get_shot_name()
+        if not filepath or not shot_name:
+            logger.error("File path or shot name is not provided.")
+            return None
+
+        try:
+            start_frame = self.get_frame_override(self.star_time_le, "Start")
+            end_frame = self.get_frame_override(self.end_time_le, "End")
+        except ValueError:
+            return None
+
+        return ExportSettings(
+            file_path=filepath,
+            shot_name=shot_name,
+            character_names=self.get_list_character_name(),
+            camera_names=self.get_list_camera_name(),
+            abc_names=self.get_list_abc_mesh_name(),
+            start_frame=start_frame,
+            end_frame=end_frame,
+            offset=self.offset_spinbox.value(),
+            bake=self.bake_cb.isChecked(),
+            fast_bake=self.fast_bake_cb.isChecked(),
+            reduce_keys=self.reduce_keys_cb.isChecked(),
+            unreal_camera_data=self.camera_data_cb.isChecked(),
+            fbx_version=self.fbxVersion_combobox.currentText(),
+            force_rebuild=self.force_rebuild_cb.isChecked(),
+            staging_dir=default_staging_dir() if self.stage_locally_cb.isChecked() else "",
+            package="zip" if self.package_cb.isChecked() else "",
+            sequencer=self.sequencer_cb.isChecked(),
+            profile=self.profile_cb.isChecked(),
+        )
+
+    def run_export_job(self, mode):
+        settings = self.get_export_settings()
+        if settings is None:
+            return
+        if self.runner is not None:
+            logger.warning("An export is already running.")
+            return
+        # Options may have been changed from Maya's FBX export dialog since the last run
+        FbxOptionProfile.reset_session()
+
+        self.runner = ExportRunner(ExportJob(settings), mode, self)
+        self.runner.finished.connect(self.on_export_finished)
+        self.set_export_buttons_enabled(False)
+        self.export_started.emit(self.runner)
+        self.runner.start()
+
+    def on_export_finished(self, success):
+        self.runner = None
+        self.set_export_buttons_enabled(True)
+
+    def set_export_buttons_enabled(self, enabled):
+        for button in (self.fbx_export_btn, self.abc_export_btn, self.export_all_btn):
+            button.setEnabled(enabled)
+
+    def fbx_export(self):
+        """
+        Exports the cameras and characters listed in the tool to FBX.
+        """
+        self.run_export_job("fbx")
+
+    def abc_export(self):
+        """
+        Exports the Alembic characters listed in the tool.
+        """
+        self.run_export_job("abc")
+
+    def export_all(self):
+        """
+        Runs the FBX export followed by the Alembic export.
+        """
+        self.run_export_job("all")
+
+
+# noinspection PyMethodMayBeStatic,PyAttributeOutsideInit,PyMethodOverriding
+class MainWindow(QtWidgets.QDialog):
+    """
+    Main Window for the Export Tool.
+
+    Handles the GUI display, geometry management, and interaction between the tool
+    and the main Maya window.
+    """
+    WINDOW_TITLE = "Export Tool"
+
+    dlg_instance = None
+
+    @staticmethod
+    def scripts_dir():
+        """
+        Returns:
+            str: The user script directory; queried when needed, not at import.
+        """
+        return cm.internalVar(userScriptDir=True)
+
+    @classmethod
+    def icon_dir(cls):
+        return os.path.join(cls.scripts_dir(), 'Thi/Icon')
+
+    @classmethod
+    def display(cls):
+        """
+        Displays the main dialog window. Reuses the single instance if it already exists.
+        """
+        if not cls.dlg_instance:
+            cls.dlg_instance = MainWindow()
+
+        if cls.dlg_instance.isHidden():
+            cls.dlg_instance.show()
+        else:
+            cls.dlg_instance.raise_()
+            cls.dlg_instance.activateWindow()
+
+    @classmethod
+    def maya_main_window(cls):
+        """
+        Retrieves the main Maya window widget.
+
+        Returns:
+            QWidget: The main Maya window as a Python object.
+        """
+        try:
+            main_window_ptr = oMayaUI.MQtUtil.mainWindow()
+            return wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
+        except Exception as e:
+            logger.error(f"Failed to retrieve Maya main window: {e}")
+            return None
+
+    def __init__(self):
+        """
+        Initializes the MainWindow instance.
+        """
+        super(MainWindow, self).__init__(self.maya_main_window())
+        self.setWindowTitle(self.WINDOW_TITLE)
+        self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
+
+        # Geometry management
+        self.geometry = None
+
+        # Set window size restrictions
+        self.setMinimumSize(400, 640)
+        self.setMaximumSize(400, 640)
+
+        # Create the UI elements
+        self.create_widgets()
+        self.create_layouts()
+        self.create_connections()
+
+    def create_widgets(self):
+        """
+        Initializes the widgets in the main window.
+        """
+        self.export_tool = ExportTool()  # Main export tool widget
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setValue(0)
+        self.status_lb = QtWidgets.QLabel("Idle")
+        self.time_lb = QtWidgets.QLabel("")
+        self.time_lb.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+
+        self.close_btn = QtWidgets.QPushButton("Close")
+
+    def create_layouts(self):
+        """
+        Arranges the widgets in the main window.
+        """
+        # Layout for the export progress
+        progress_layout = QtWidgets.QGridLayout()
+        progress_layout.addWidget(self.progress_bar, 0, 0, 1, 2)
+        progress_layout.addWidget(self.cancel_btn, 0, 2, 1, 1)
+        progress_layout.addWidget(self.status_lb, 1, 0, 1, 1)
+        progress_layout.addWidget(self.time_lb, 1, 1, 1, 2)
+
+        # Layout for the "Close" button
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.close_btn)
+
+        # Main layout for the window
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.addWidget(self.export_tool)
+        main_layout.addLayout(QHLineName("Progress"))
+        main_layout.addLayout(progress_layout)
+        main_layout.addLayout(button_layout)
+
+    def create_connections(self):
+        """
+        Connects signals and slots for the widgets.
+        """
+        self.close_btn.clicked.connect(self.close)
+        self.export_tool.export_started.connect(self.track_export)
+
+    def track_export(self, runner):
+        """
+        Shows the progress of an export that just started.
+
+        Args:
+            runner (ExportRunner): The running export.
+        """
+        self.progress_bar.setRange(0, 0)  # Busy until the first step reports a total
+        self.status_lb.setText("Discovering assets...")
+        self.time_lb.setText("")
+        self.cancel_btn.setEnabled(True)
+
+        runner.progress.connect(lambda event: self.update_progress(runner, event))
+        runner.finished.connect(lambda success: self.export_finished(runner, success))
+        self.cancel_btn.clicked.connect(runner.cancel)
+
+    def update_progress(self, runner, event):
+        """
+        Updates the progress bar, status and elapsed/remaining time after an export step.
+
+        Args:
+            runner (ExportRunner): The running export.
+            event (ExportProgress): The step that just finished.
+        """
+        self.progress_bar.setRange(0, event.total)
+        self.progress_bar.setValue(event.done)
+        self.status_lb.setText(event.message)
+
+        elapsed = runner.elapsed()
+        remaining = elapsed / event.done * (event.total - event.done) if event.done else 0
+        self.time_lb.setText(f"{self.format_seconds(elapsed)} elapsed, ~{self.format_seconds(remaining)} left")
+
+    def export_finished(self, runner, success):
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.disconnect(runner.cancel)
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1 if success else 0)
+
+        if runner.cancelled:
+            status = "Cancelled"
+        elif success:
+            status = "Done"
+        else:
+            status = f"Finished with {len(runner.job.failures)} error(s)"
+        if runner.job.cache_hits:
+            status += f", {len(runner.job.cache_hits)} unchanged"
+        self.status_lb.setText(status)
+        self.time_lb.setText(f"{self.format_seconds(runner.elapsed())} total")
+
+    @staticmethod
+    def format_seconds(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        return f"{minutes}:{seconds:02d}"
+
+    def showEvent(self, event):
+        """
+        Handles the "show" event for the window. Restores the saved geometry.
+
+        Args:
+            event (QShowEvent): The show event.
+        """
+        super(MainWindow, self).showEvent(event)
+        if self.geometry:
+            self.restoreGeometry(self.geometry)
+
+    def closeEvent(self, event):
+        """
+        Handles the "close" event for the window. Saves the current geometry.
+
+        Args:
+            event (QCloseEvent): The close event.
+        """
+        if self.export_tool.runner is not None:
+            self.export_tool.runner.cancel()
+        super(MainWindow, self).closeEvent(event)
+        self.geometry = self.saveGeometry()
\ No newline at end of file
@@ -0,0 +1,433 @@
+"""
+Structural checks of written FBX and Alembic files.
+
+``FBXExport`` and ``AbcExport`` returning doesn't prove the file on disk is whole: a full share or
+a dying process leaves truncated files that only fail when Unreal imports them. The checks here
+read the headers and walk the top-level structure of a file with a few small seeks, so they are
+cheap enough to run on every output while the next asset is exported:
+
+- binary FBX: magic, file version, the chain of top-level node records, the footer, and the
+  frame count of the take;
+- ASCII FBX: version line and closing brace;
+- Alembic: the Ogawa header (only marked complete once the archive is closed), the root group
+  and the archive's time samplings, for the frame count and first frame.
+"""
+import os
+import struct
+import hashlib
+import logging
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERIFY_WORKERS = 2
+
+FBX_BINARY_MAGIC = b"Kaydara FBX Binary  \x00\x1a\x00"
+FBX_ASCII_PREFIX = b"; FBX "
+FBX_FOOTER_MAGIC = bytes.fromhex("f85a8c6adef5d97eece90ce3758f290b")
+# Record headers grew from 32 to 64 bit offsets with 7.5
+FBX_WIDE_RECORDS_VERSION = 7500
+FBX_REQUIRED_RECORDS = ("FBXHeaderExtension", "Objects", "Connections")
+# File version written for each FBXExportFileVersion value; FBX 2019 and 2019.5 share FBX201900
+FBX_FILE_VERSIONS = {
+    "FBX201300": (7300,),
+    "FBX201400": (7400,),
+    "FBX201600": (7500,),
+    "FBX201700": (7500,),
+    "FBX201800": (7500,),
+    "FBX201900": (7600, 7700),
+}
+FBX_KTIME_PER_SECOND = 46186158000
+# Top-level records walked before giving up on a file
+MAX_TOP_LEVEL_RECORDS = 10000
+CHECKSUM_CHUNK_BYTES = 1024 * 1024
+
+OGAWA_MAGIC = b"Ogawa"
+OGAWA_FROZEN = 0xff
+OGAWA_DATA_FLAG = 0x8000000000000000
+# Children of the archive's root group
+ABC_ROOT_CHILDREN = 6
+ABC_TIME_SAMPLINGS_CHILD = 4
+
+
+class VerifyError(Exception):
+    """
+    A file doesn't have the structure of a complete FBX or Alembic file.
+    """
+
+
+@dataclass
+class OutputExpectation:
+    """
+    What a written file should contain. Unset fields aren't checked.
+
+    Attributes:
+        fbx_version (str): ``FBXExportFileVersion`` value the file was written with, e.g. "FBX201900".
+        frames (int): Number of frames written.
+        first_frame (int): First frame, checked for Alembic files (FBX takes start at any time).
+        frame_rate (float): Frames per second, needed for the FBX frame count.
+    """
+    fbx_version: str = None
+    frames: int = None
+    first_frame: int = None
+    frame_rate: float = None
+
+
+def read_exact(stream, offset, size, file_size):
+    """
+    Reads ``size`` bytes at ``offset``, failing if the file ends before.
+    """
+    if offset < 0 or offset + size > file_size:
+        raise VerifyError(f"truncated: needs {offset + size} bytes, file has {file_size}")
+    stream.seek(offset)
+    data = stream.read(size)
+    if len(data) != size:
+        raise VerifyError(f"short read at {offset}")
+    return data
+
+
+def file_checksum(path):
+    """
+    Hashes a file in chunks, without reading it into memory at once.
+
+    Returns:
+        str: BLAKE2b hex digest.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(CHECKSUM_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_output(path, expected=None):
+    """
+    Checks a written file by its extension.
+
+    Args:
+        path (str): An .fbx or .abc file.
+        expected (OutputExpectation): What the file should contain.
+
+    Returns:
+        list: Problems found, empty if the file looks complete.
+    """
+    expected = expected or OutputExpectation()
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".fbx":
+            return verify_fbx(path, expected)
+        if extension == ".abc":
+            return verify_alembic(path, expected)
+    except VerifyError as e:
+        return [f"{os.path.basename(path)}: {e}"]
+    except (IOError, OSError) as e:
+        return [f"{os.path.basename(path)}: can't read file: {e}"]
+    return []
+
+
+def verify_fbx(path, expected):
+    """
+    Checks an FBX file, binary or ASCII.
+
+    Returns:
+        list: Problems found.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as stream:
+        head = stream.read(len(FBX_BINARY_MAGIC) + 4)
+        if head.startswith(FBX_ASCII_PREFIX):
+            return _verify_fbx_ascii(stream, path, file_size, expected)
+        if not head.startswith(FBX_BINARY_MAGIC) or len(head) < len(FBX_BINARY_MAGIC) + 4:
+            raise VerifyError("not an FBX file")
+        version = struct.unpack("<I", head[len(FBX_BINARY_MAGIC):])[0]
+
+        problems = _check_fbx_version(path, version, expected)
+        records = FbxRecordReader(stream, version, file_size)
+        top_level = {}
+        position = records.first_record
+        for _ in range(MAX_TOP_LEVEL_RECORDS):
+            record = records.read(position)
+            if record is None:
+                break
+            top_level.setdefault(record.name, record)
+            position = record.end
+        else:
+            raise VerifyError("too many top-level records")
+
+        missing = [name for name in FBX_REQUIRED_RECORDS if name not in top_level]
+        if missing:
+            problems.append(f"{os.path.basename(path)}: missing {', '.join(missing)}")
+
+        footer = read_exact(stream, file_size - len(FBX_FOOTER_MAGIC), len(FBX_FOOTER_MAGIC), file_size)
+        if footer != FBX_FOOTER_MAGIC:
+            raise VerifyError("FBX footer is missing, the file is incomplete")
+        # The footer ends with the version, 120 zero bytes and the magic
+        footer_version = read_exact(stream, file_size - len(FBX_FOOTER_MAGIC) - 124, 4, file_size)
+        footer_version = struct.unpack("<I", footer_version)[0]
+        if footer_version != version:
+            problems.append(f"{os.path.basename(path)}: footer version {footer_version} doesn't match {version}")
+
+        if expected.frames and expected.frame_rate and "Takes" in top_level:
+            frames = _fbx_take_frames(records, top_level["Takes"], expected.frame_rate)
+            if frames is not None and frames != expected.frames:
+                problems.append(f"{os.path.basename(path)}: {frames} frames, expected {expected.frames}")
+    return problems
+
+
+def _check_fbx_version(path, version, expected):
+    if not expected.fbx_version:
+        return []
+    accepted = FBX_FILE_VERSIONS.get(expected.fbx_version)
+    if accepted and version not in accepted:
+        return [f"{os.path.basename(path)}: FBX file version {version}, expected {expected.fbx_version}"]
+    return []
+
+
+def _verify_fbx_ascii(stream, path, file_size, expected):
+    stream.seek(0)
+    header = stream.readline(256).decode("ascii", "replace").split()
+    # "; FBX 7.5.0 project file"
+    try:
+        major, minor = header[2].split(".")[:2]
+        version = int(major) * 1000 + int(minor) * 100
+    except (IndexError, ValueError):
+        raise VerifyError("unreadable ASCII FBX header")
+    problems = _check_fbx_version(path, version, expected)
+    tail_size = min(file_size, 4096)
+    tail = read_exact(stream, file_size - tail_size, tail_size, file_size).rstrip()
+    if not tail.endswith(b"}"):
+        raise VerifyError("ASCII FBX file doesn't end with a closing brace, the file is incomplete")
+    return problems
+
+
+@dataclass
+class FbxRecord:
+    """
+    Header of a binary FBX node record.
+
+    Attributes:
+        name (str): Node name.
+        end (int): Offset of the next sibling record.
+        property_count (int): Number of properties.
+        properties (int): Offset of the first property.
+        children (int): Offset of the first child record.
+    """
+    name: str
+    end: int
+    property_count: int
+    properties: int
+    children: int
+
+
+class FbxRecordReader(object):
+    """
+    Reads node record headers of a binary FBX file, one seek each, skipping their contents.
+    """
+
+    def __init__(self, stream, version, file_size):
+        self.stream = stream
+        self.file_size = file_size
+        self.header = struct.Struct("<QQQB" if version >= FBX_WIDE_RECORDS_VERSION else "<IIIB")
+        self.first_record = len(FBX_BINARY_MAGIC) + 4
+
+    def read(self, position):
+        """
+        Returns:
+            FbxRecord: The record at ``position``, None for the null record ending a list.
+        """
+        end, property_count, property_size, name_size = self.header.unpack(
+            read_exact(self.stream, position, self.header.size, self.file_size)
+        )
+        if end == 0:
+            return None
+        name_start = position + self.header.size
+        if end <= position or end > self.file_size:
+            raise VerifyError(f"record at {position} points outside the file, the file is incomplete")
+        name = read_exact(self.stream, name_start, name_size, self.file_size).decode("ascii", "replace")
+        properties = name_start + name_size
+        return FbxRecord(name, end, property_count, properties, properties + property_size)
+
+    def children(self, record):
+        """
+        Yields:
+            FbxRecord: The direct children of a record.
+        """
+        position = record.children
+        while position < record.end:
+            child = self.read(position)
+            if child is None:
+                return
+            yield child
+            position = child.end
+
+    def integer_properties(self, record):
+        """
+        Returns:
+            list: A record's leading 64 bit integer properties (KTime values).
+        """
+        values = []
+        position = record.properties
+        for _ in range(record.property_count):
+            type_code = read_exact(self.stream, position, 1, self.file_size)
+            if type_code != b"L":
+                break
+            values.append(struct.unpack("<q", read_exact(self.stream, position + 1, 8, self.file_size))[0])
+            position += 9
+        return values
+
+
+def _fbx_take_frames(records, takes, frame_rate):
+    """
+    Returns:
+        int: Frames in the first take's local time span, None if the file has no take.
+    """
+    for take in records.children(takes):
+        if take.name != "Take":
+            continue
+        for child in records.children(take):
+            if child.name == "LocalTime":
+                values = records.integer_properties(child)
+                if len(values) == 2:
+                    return int(round((values[1] - values[0]) * frame_rate / FBX_KTIME_PER_SECOND)) + 1
+        return None
+    return None
+
+
+def verify_alembic(path, expected):
+    """
+    Checks an Ogawa Alembic archive.
+
+    Returns:
+        list: Problems found.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as stream:
+        head = read_exact(stream, 0, 16, file_size)
+        if head[:5] != OGAWA_MAGIC:
+            raise VerifyError("not an Ogawa Alembic archive")
+        if head[5] != OGAWA_FROZEN:
+            raise VerifyError("archive was never closed, the file is incomplete")
+        root = struct.unpack("<Q", head[8:16])[0]
+
+        child_count = struct.unpack("<Q", read_exact(stream, root, 8, file_size))[0]
+        if child_count < ABC_ROOT_CHILDREN:
+            raise VerifyError(f"root group has {child_count} children, expected {ABC_ROOT_CHILDREN}")
+        children = struct.unpack(f"<{child_count}Q", read_exact(stream, root + 8, 8 * child_count, file_size))
+        for child in children:
+            offset = child & ~OGAWA_DATA_FLAG
+            if offset and offset >= file_size:
+                raise VerifyError("root group points outside the file, the file is incomplete")
+
+        samplings_child = children[ABC_TIME_SAMPLINGS_CHILD]
+        if not samplings_child & OGAWA_DATA_FLAG:
+            raise VerifyError("time samplings are missing")
+        samplings = _alembic_time_samplings(stream, samplings_child & ~OGAWA_DATA_FLAG, file_size)
+
+    problems = []
+    # Sampling 0 is the archive's default identity sampling; AbcExport's frame range is the next one
+    animated = samplings[1:]
+    if expected.frames and animated:
+        max_samples, time_per_cycle, times = max(animated, key=lambda sampling: sampling[0])
+        if max_samples != expected.frames:
+            problems.append(f"{os.path.basename(path)}: {max_samples} frames, expected {expected.frames}")
+        if expected.first_frame is not None and times and time_per_cycle > 0:
+            first_frame = int(round(times[0] / time_per_cycle))
+            if first_frame != expected.first_frame:
+                problems.append(f"{os.path.basename(path)}: starts at frame {first_frame}, expected {expected.first_frame}")
+    elif expected.frames and expected.frames > 1:
+        problems.append(f"{os.path.basename(path)}: no animated time sampling")
+    return problems
+
+
+def _alembic_time_samplings(stream, offset, file_size):
+    """
+    Returns:
+        list: (max sample count, time per cycle, stored times) per time sampling of the archive.
+    """
+    if not offset:
+        return []
+    size = struct.unpack("<Q", read_exact(stream, offset, 8, file_size))[0]
+    data = read_exact(stream, offset + 8, size, file_size)
+    samplings = []
+    position = 0
+    while position < len(data):
+        if position + 16 > len(data):
+            raise VerifyError("time samplings are truncated")
+        max_samples, time_per_cycle, count = struct.unpack_from("<IdI", data, position)
+        position += 16
+        if position + 8 * count > len(data):
+            raise VerifyError("time samplings are truncated")
+        times = struct.unpack_from(f"<{count}d", data, position)
+        position += 8 * count
+        samplings.append((max_samples, time_per_cycle, times))
+    return samplings
+
+
+class OutputVerifier(object):
+    """
+    Verifies written files on a thread pool while the next asset is exported.
+
+    Args:
+        workers (int): Files verified at once.
+    """
+
+    def __init__(self, workers=DEFAULT_VERIFY_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ExportVerify")
+        self.pending = []
+
+    def verify(self, path, expected=None, item=None, checksum=False):
+        """
+        Queues the check of a written file.
+
+        Args:
+            path (str): The file.
+            expected (OutputExpectation): What it should contain.
+            item: Anything the caller wants back from ``completed`` (the export asset).
+            checksum (bool): Also hash complete files, on the same thread.
+        """
+        future = self.executor.submit(self._verify, path, expected, checksum)
+        self.pending.append((item, future))
+        return future
+
+    @staticmethod
+    def _verify(path, expected, checksum):
+        problems = verify_output(path, expected)
+        if problems or not checksum:
+            return problems, None
+        try:
+            return problems, file_checksum(path)
+        except (IOError, OSError) as e:
+            logger.warning(f"Couldn't hash {path}: {e}")
+            return problems, None
+
+    def completed(self, wait=True):
+        """
+        Yields finished checks in submission order, removing them from the pending list.
+
+        Args:
+            wait (bool): Block until each check is done; otherwise stop at the first unfinished one.
+
+        Yields:
+            tuple: (item, problems, checksum), problems being empty for a complete file and
+                checksum None unless requested. Cancelled checks are dropped.
+        """
+        while self.pending:
+            item, future = self.pending[0]
+            if not wait and not future.done():
+                return
+            self.pending.pop(0)
+            if future.cancelled():
+                continue
+            try:
+                problems, checksum = future.result()
+            except Exception as e:
+                problems, checksum = [f"Verification failed: {e}"], None
+            yield item, problems, checksum
+
+    def cancel(self):
+        for _, future in self.pending:
+            future.cancel()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,436 @@
+"""
+Pool of long-lived mayapy workers for batch exports.
+
+Each worker starts Maya standalone and loads the exporter plug-ins once, then takes export jobs over
+a local authenticated socket: open the scene, run the same ``ExportJob`` the UI uses, reset with
+``file -new`` and wait for the next job. Workers are recycled after a number of jobs or when their
+memory grows past a ceiling, so leaks from heavy scenes don't accumulate. A job that crosses the
+ceiling half way stops after its current asset and continues on a fresh worker, resumed from the
+shot's journal so the assets completed since the job started are kept, cache or not. Jobs are started longest expected first, see ``ExportSchedule``.
+
+The controller side is plain Python and doesn't need Maya:
+
+    python ExportWorker.py jobs.json --workers 4 --max-jobs 20 --max-memory 24000
+
+where ``jobs.json`` is a list of ``{"scene": ..., "mode": ..., "settings": {...}}`` objects using
+the ``ExportSettings`` field names.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+import subprocess
+from dataclasses import dataclass, field, asdict, replace
+from concurrent.futures import Future
+from multiprocessing.connection import Listener, Client
+
+from ExportProfiler import get_process_memory_mb
+from ExportSchedule import CostModel, DEFAULT_JOB_OVERHEAD, schedule
+
+logger = logging.getLogger(__name__)
+
+AUTHKEY_ENV = "EXPORT_WORKER_AUTHKEY"
+WORKER_CONNECT_TIMEOUT = 300
+# Times a job stopped at the memory ceiling is continued on a fresh worker
+MEMORY_RESTARTS = 2
+
+
+def default_worker_count():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def default_mayapy():
+    """
+    Finds the interpreter used to start workers: ``MAYAPY`` if set, the current interpreter when
+    already running inside mayapy, otherwise ``mayapy`` from PATH.
+    """
+    if os.environ.get("MAYAPY"):
+        return os.environ["MAYAPY"]
+    if os.path.basename(sys.executable).lower().startswith("mayapy"):
+        return sys.executable
+    return "mayapy"
+
+
+@dataclass
+class BatchJob:
+    """
+    One scene to export.
+
+    Attributes:
+        scene (str): Maya scene to open.
+        settings (dict): ``ExportSettings`` fields.
+        mode (str): "fbx", "abc" or "all".
+    """
+    scene: str
+    settings: dict = field(default_factory=dict)
+    mode: str = "all"
+
+    @classmethod
+    def from_settings(cls, scene, settings, mode="all"):
+        return cls(scene=scene, settings=asdict(settings), mode=mode)
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a ``BatchJob``.
+
+    Attributes:
+        job (BatchJob): The job that ran.
+        failures (list): Failure messages, empty on success.
+        worker_pid (int): Process that ran the job.
+        memory_mb (float): Worker memory after the job.
+        seconds (float): Time from the job being picked up to its result, worker starts included.
+    """
+    job: BatchJob
+    failures: list = field(default_factory=list)
+    worker_pid: int = None
+    memory_mb: float = None
+    seconds: float = None
+
+    @property
+    def ok(self):
+        return not self.failures
+
+
+class WorkerProcess(object):
+    """
+    Controller-side handle on one mayapy worker.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.jobs_done = 0
+        self.listener = Listener(("127.0.0.1", 0), authkey=pool.authkey)
+        host, port = self.listener.address
+        self.process = subprocess.Popen(
+            [pool.mayapy, os.path.abspath(__file__), "--worker", "--address", f"{host}:{port}"],
+            env=dict(os.environ, **{AUTHKEY_ENV: pool.authkey.hex()}),
+        )
+        self.pid = self.process.pid
+        self.connection = self.accept()
+        logger.info(f"Started export worker {self.pid}")
+
+    def accept(self):
+        """
+        Waits for the worker to connect back, giving up if it dies or takes too long to start Maya.
+        """
+        accepted = []
+
+        def accept_connection():
+            try:
+                accepted.append(self.listener.accept())
+            except (OSError, EOFError):
+                pass
+
+        acceptor = threading.Thread(target=accept_connection, daemon=True)
+        acceptor.start()
+        waited = 0
+        while not accepted:
+            acceptor.join(timeout=1)
+            waited += 1
+            if accepted:
+                break
+            if self.process.poll() is not None or waited >= WORKER_CONNECT_TIMEOUT:
+                self.process.kill()
+                self.listener.close()
+                raise RuntimeError(f"Export worker {self.pid} didn't connect back")
+        self.listener.close()
+        return accepted[0]
+
+    def run(self, job):
+        """
+        Sends a job and waits for its result.
+
+        Returns:
+            dict: The worker's reply.
+        """
+        self.connection.send({"command": "export", "job": asdict(job), "max_memory_mb": self.pool.max_memory_mb})
+        reply = self.connection.recv()
+        self.jobs_done += 1
+        return reply
+
+    def needs_recycle(self, reply):
+        if self.pool.max_jobs and self.jobs_done >= self.pool.max_jobs:
+            logger.info(f"Recycling worker {self.pid} after {self.jobs_done} jobs")
+            return True
+        memory_mb = reply.get("memory_mb")
+        if self.pool.max_memory_mb and memory_mb and memory_mb > self.pool.max_memory_mb:
+            logger.info(f"Recycling worker {self.pid} at {memory_mb:.0f} MB")
+            return True
+        return False
+
+    def stop(self):
+        try:
+            self.connection.send({"command": "quit"})
+            self.connection.close()
+        except (OSError, EOFError):
+            pass
+        try:
+            self.process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class WorkerPool(object):
+    """
+    Runs ``BatchJob``s on a fixed number of warm mayapy workers.
+
+    Args:
+        workers (int): Number of worker processes. Defaults to one less than the CPU count.
+        max_jobs (int): Recycle a worker after this many jobs, 0 to never recycle on count.
+        max_memory_mb (float): Recycle a worker once it uses more memory than this.
+        mayapy (str): Interpreter used to start workers.
+    """
+
+    def __init__(self, workers=None, max_jobs=25, max_memory_mb=None, mayapy=None):
+        self.size = workers or default_worker_count()
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.mayapy = mayapy or default_mayapy()
+        self.authkey = os.urandom(16)
+
+        self._queue = queue.Queue()
+        self._threads = []
+        self._closed = False
+
+    def start(self):
+        for index in range(self.size):
+            thread = threading.Thread(target=self._slot_loop, name=f"export-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, job):
+        """
+        Queues a job.
+
+        Returns:
+            Future: Resolves to a ``BatchResult``.
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        future = Future()
+        self._queue.put((job, future))
+        return future
+
+    def run_all(self, jobs):
+        """
+        Runs jobs and waits for all of them.
+
+        Returns:
+            list: ``BatchResult`` per job, in job order.
+        """
+        futures = [self.submit(job) for job in jobs]
+        return [future.result() for future in futures]
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _slot_loop(self):
+        worker = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            restarts = 0
+            started = time.perf_counter()
+            started_at = time.time()
+            run_job = job
+            try:
+                while True:
+                    if worker is None:
+                        worker = WorkerProcess(self)
+                    reply = worker.run(run_job)
+                    if not reply.get("memory_exceeded") or restarts >= MEMORY_RESTARTS:
+                        break
+                    restarts += 1
+                    logger.warning(f"Worker {worker.pid} hit the memory ceiling on {job.scene}, continuing on a new worker")
+                    worker.stop()
+                    worker = None
+                    # Keep what this job wrote before the ceiling, even without the cache or when rebuilding
+                    run_job = replace(job, settings=dict(job.settings, resume=True, resume_since=started_at))
+            except (OSError, EOFError, RuntimeError) as e:
+                logger.error(f"Export worker failed on {job.scene}: {e}")
+                future.set_result(BatchResult(
+                    job, failures=[f"Worker failed: {e}"], seconds=time.perf_counter() - started
+                ))
+                if worker is not None:
+                    worker.process.kill()
+                worker = None
+                continue
+
+            future.set_result(BatchResult(
+                job,
+                failures=reply.get("failures", []),
+                worker_pid=worker.pid,
+                memory_mb=reply.get("memory_mb"),
+                seconds=time.perf_counter() - started,
+            ))
+
+            if worker.needs_recycle(reply):
+                worker.stop()
+                worker = None
+
+        if worker is not None:
+            worker.stop()
+
+
+def serve(address):
+    """
+    Worker side: initialise Maya once and run jobs until told to quit.
+
+    Args:
+        address (tuple): Controller (host, port).
+    """
+    import ExportHeadless
+    from ExportCore import ExportSettings
+
+    ExportHeadless.initialize_maya()
+
+    authkey = bytes.fromhex(os.environ[AUTHKEY_ENV])
+    connection = Client(address, authkey=authkey)
+    logger.info(f"Export worker {os.getpid()} ready")
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message.get("command") != "export":
+            break
+
+        job = message["job"]
+        memory_exceeded = False
+        try:
+            # Fast bake and undo flushing are the defaults for unattended exports; the pool's memory
+            # ceiling also stops a job between assets
+            defaults = {"fast_bake": True, "flush_undo": True, "memory_limit_mb": message.get("max_memory_mb")}
+            settings = ExportSettings(**dict(defaults, **job["settings"]))
+            export_job = ExportHeadless.run_export_job(job["scene"], settings, job["mode"])
+            failures = export_job.failures
+            memory_exceeded = export_job.memory_exceeded
+        except Exception as e:
+            logger.error(f"Export of {job['scene']} failed: {e}")
+            failures = [str(e)]
+        finally:
+            ExportHeadless.reset_scene()
+
+        connection.send({
+            "failures": failures, "memory_mb": get_process_memory_mb(), "memory_exceeded": memory_exceeded
+        })
+
+    connection.close()
+
+
+def load_jobs(jobs_path):
+    with open(jobs_path) as jobs_file:
+        return [BatchJob(**entry) for entry in json.load(jobs_file)]
+
+
+def write_report(path, estimates, results, wall_seconds):
+    """
+    Logs predicted against actual job durations and optionally writes them as JSON, for tuning
+    the cost model.
+
+    Args:
+        path (str): JSON report path, None to only log.
+        estimates (list): ``ExportSchedule.JobEstimate`` per job, None if jobs weren't scheduled.
+        results (list): ``BatchResult`` per job, in the same order.
+        wall_seconds (float): Duration of the whole batch.
+    """
+    rows = []
+    for estimate, result in zip(estimates or [None] * len(results), results):
+        predicted = estimate.seconds if estimate else None
+        rows.append({
+            "scene": result.job.scene,
+            "shot": result.job.settings.get("shot_name"),
+            "mode": result.job.mode,
+            "predicted": round(predicted, 1) if predicted is not None else None,
+            "actual": round(result.seconds, 1) if result.seconds is not None else None,
+            "frames": estimate.frames if estimate else None,
+            "assets": estimate.assets if estimate else None,
+            "ok": result.ok,
+        })
+        if predicted is not None and result.seconds:
+            logger.info(
+                f"{result.job.scene} ({result.job.mode}): predicted {predicted:.0f}s, actual {result.seconds:.0f}s"
+            )
+
+    errors = [abs(row["predicted"] - row["actual"]) / row["actual"] for row in rows if row["predicted"] and row["actual"]]
+    if errors:
+        logger.info(f"Mean prediction error {100 * sum(errors) / len(errors):.0f}% over {len(errors)} jobs")
+    logger.info(f"Batch took {wall_seconds:.0f}s")
+
+    if path:
+        with open(path, "w") as report_file:
+            json.dump({"wall_seconds": round(wall_seconds, 1), "jobs": rows}, report_file, indent=2)
+        logger.info(f"Schedule report written to {path}")
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run batch exports on a pool of warm mayapy workers.")
+    parser.add_argument("jobs", nargs="?", help="JSON file with the list of jobs.")
+    parser.add_argument("--workers", type=int, help="Number of workers (default: CPU count - 1).")
+    parser.add_argument("--max-jobs", type=int, default=25, help="Recycle a worker after this many jobs.")
+    parser.add_argument("--max-memory", type=float, help="Recycle a worker above this many MB.")
+    parser.add_argument("--mayapy", help="mayapy executable used for workers.")
+    parser.add_argument("--no-schedule", action="store_true", help="Run jobs in file order, without splitting.")
+    parser.add_argument(
+        "--job-overhead", type=float, default=DEFAULT_JOB_OVERHEAD, help="Expected fixed seconds per job."
+    )
+    parser.add_argument("--report", help="Write predicted and actual job durations to this JSON file.")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--address", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        host, port = args.address.rsplit(":", 1)
+        serve((host, int(port)))
+        return 0
+
+    if not args.jobs:
+        parser.error("a jobs file is required")
+
+    jobs = load_jobs(args.jobs)
+    estimates = None
+    pool = WorkerPool(args.workers, args.max_jobs, args.max_memory, args.mayapy)
+    if not args.no_schedule:
+        estimates = schedule(jobs, pool.size, CostModel(args.job_overhead))
+        jobs = [estimate.job for estimate in estimates]
+
+    started = time.perf_counter()
+    with pool:
+        results = pool.run_all(jobs)
+    write_report(args.report, estimates, results, time.perf_counter() - started)
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        logger.error(f"{result.job.scene}: {'; '.join(result.failures)}")
+    logger.info(f"{len(results) - len(failed)}/{len(results)} scenes exported.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
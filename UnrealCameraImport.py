@@ -0,0 +1,178 @@
+"""
+Unreal Editor side of the camera data export.
+
+Keys the ``.camera.json`` tables written by the ExportTool (``--unreal-camera-data`` or the
+"UE camera data" checkbox) onto a CineCameraActor in a Level Sequence. Values are already in
+Unreal's axis convention (centimetres, Z up, degrees), so they are keyed as they are.
+
+Run it from the Unreal Editor's Python console:
+
+    import UnrealCameraImport
+    UnrealCameraImport.import_camera_data("D:/export/sh010/sh010_cam.camera.json", "/Game/Cinematics/sh010")
+"""
+import json
+import logging
+
+import unreal
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_VERSION = 1
+
+# Camera component properties keyed from the table: {column: (property name, property path)}
+CAMERA_PROPERTIES = {
+    "focal_length": ("CurrentFocalLength", "CurrentFocalLength"),
+    "aperture": ("CurrentAperture", "CurrentAperture"),
+    "sensor_width": ("SensorWidth", "Filmback.SensorWidth"),
+    "sensor_height": ("SensorHeight", "Filmback.SensorHeight"),
+    "focus_distance": ("ManualFocusDistance", "FocusSettings.ManualFocusDistance"),
+}
+
+
+def load_camera_data(path):
+    """
+    Reads a camera table.
+
+    Args:
+        path (str): A ``.camera.json`` file.
+
+    Returns:
+        dict: The camera data.
+    """
+    with open(path) as data_file:
+        data = json.load(data_file)
+    if data.get("version") != SUPPORTED_VERSION:
+        raise ValueError(f"Unsupported camera data version {data.get('version')} in {path}")
+    return data
+
+
+def frame_rate_fraction(data):
+    """
+    Returns:
+        tuple: (numerator, denominator) of the table's frame rate. Tables written before the
+            fraction was stored only have the rounded rate.
+    """
+    if "frame_rate_numerator" in data:
+        return data["frame_rate_numerator"], data.get("frame_rate_denominator", 1)
+    return int(round(data["frame_rate"])), 1
+
+
+def column_values(data, column):
+    """
+    Returns:
+        list: Per-frame values of a column; constant columns are stored as a single value.
+    """
+    values = data.get(column)
+    if isinstance(values, list):
+        return values
+    return [values] * data["frame_count"] if values is not None else []
+
+
+def key_channel(channel, first_frame, values):
+    """
+    Keys one Sequencer channel with a value per frame, linearly interpolated.
+    """
+    for index, value in enumerate(values):
+        channel.add_key(
+            unreal.FrameNumber(first_frame + index), value,
+            interpolation=unreal.MovieSceneKeyInterpolation.LINEAR
+        )
+
+
+def import_camera_data(path, sequence_path, actor_label=None):
+    """
+    Creates a CineCameraActor bound to a Level Sequence and keys the camera table onto it.
+
+    Args:
+        path (str): A ``.camera.json`` file.
+        sequence_path (str): Content path of the Level Sequence, e.g. "/Game/Cinematics/sh010".
+        actor_label (str): Label of the new camera actor, defaults to the Maya camera name.
+
+    Returns:
+        unreal.CineCameraActor: The keyed camera.
+    """
+    data = load_camera_data(path)
+    sequence = unreal.load_asset(sequence_path)
+    if sequence is None:
+        raise ValueError(f"Level Sequence not found: {sequence_path}")
+
+    first_frame = data["first_frame"]
+    last_frame = first_frame + data["frame_count"]
+    with unreal.ScopedEditorTransaction(f"Import camera {data.get('camera', '')}"):
+        sequence.set_display_rate(unreal.FrameRate(*frame_rate_fraction(data)))
+        sequence.set_playback_start(first_frame)
+        sequence.set_playback_end(last_frame)
+
+        camera_actor = unreal.EditorLevelLibrary.spawn_actor_from_class(
+            unreal.CineCameraActor, unreal.Vector(0, 0, 0), unreal.Rotator(0, 0, 0)
+        )
+        camera_actor.set_actor_label(actor_label or data.get("camera") or "ExportCamera")
+        camera_component = camera_actor.get_cine_camera_component()
+
+        # Transform: location X/Y/Z, rotation roll/pitch/yaw, scale
+        actor_binding = sequence.add_possessable(camera_actor)
+        transform_section = actor_binding.add_track(unreal.MovieScene3DTransformTrack).add_section()
+        transform_section.set_range(first_frame, last_frame)
+        channels = transform_section.get_all_channels()
+        locations = list(zip(*data["location"]))
+        rotations = list(zip(*data["rotation"]))
+        for channel, values in zip(channels[:6], locations + rotations):
+            key_channel(channel, first_frame, values)
+
+        component_binding = sequence.add_possessable(camera_component)
+        if column_values(data, "focus_distance"):
+            focus_settings = camera_component.get_editor_property("focus_settings")
+            focus_settings.set_editor_property("focus_method", unreal.CameraFocusMethod.MANUAL)
+            camera_component.set_editor_property("focus_settings", focus_settings)
+        for column, (name, property_path) in CAMERA_PROPERTIES.items():
+            values = column_values(data, column)
+            if not values:
+                continue
+            if len(set(values)) == 1:
+                set_camera_property(camera_component, property_path, values[0])
+                continue
+            track = component_binding.add_track(unreal.MovieSceneFloatTrack)
+            track.set_property_name_and_path(name, property_path)
+            section = track.add_section()
+            section.set_range(first_frame, last_frame)
+            key_channel(section.get_all_channels()[0], first_frame, values)
+
+        # add_master_track was renamed add_track in UE 5.2
+        add_sequence_track = getattr(sequence, "add_track", None) or sequence.add_master_track
+        camera_cut_track = add_sequence_track(unreal.MovieSceneCameraCutTrack)
+        camera_cut_section = camera_cut_track.add_section()
+        camera_cut_section.set_range(first_frame, last_frame)
+        binding_id = unreal.MovieSceneObjectBindingID()
+        binding_id.set_editor_property("guid", actor_binding.get_id())
+        camera_cut_section.set_camera_binding_id(binding_id)
+
+    logger.info(f"Imported {data['frame_count']} frames of {data.get('camera')} into {sequence_path}")
+    return camera_actor
+
+
+def set_camera_property(component, property_path, value):
+    """
+    Sets a camera component property, given by its C++ path (e.g. "Filmback.SensorWidth").
+    Struct properties are read, changed and written back as a whole.
+    """
+    names = [_snake_case(part) for part in property_path.split(".")]
+    if len(names) == 1:
+        component.set_editor_property(names[0], value)
+        return
+    struct = component.get_editor_property(names[0])
+    struct.set_editor_property(names[1], value)
+    component.set_editor_property(names[0], struct)
+
+
+def _snake_case(name):
+    return "".join(f"_{char.lower()}" if char.isupper() and index else char.lower() for index, char in enumerate(name))
+
+
+def import_camera_files(paths, sequence_path):
+    """
+    Imports several camera tables into one Level Sequence.
+
+    Returns:
+        list: The camera actors.
+    """
+    return [import_camera_data(path, sequence_path) for path in paths]